@@ -0,0 +1,102 @@
+"""
+Throughput of an async endpoint using the sync Session vs the AsyncSession.
+
+Before the async DB stack, the async picklist endpoints ran sync queries on the
+event loop, so concurrent requests were served one query at a time. Both
+variants here fetch a picklist by ID like those endpoints do, under the same
+number of concurrent clients. Runs against the configured database
+(WMS_DATABASE_URL / WMS_ASYNC_DATABASE_URL), use a real MySQL server to see
+the effect of network round trips.
+
+    python -m benchmarks.bench_async_db [--clients 100] [--requests 2000] [--picklist-id 1]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core import async_db_utils, db_utils
+from database import async_engine, engine, get_async_db, get_db
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/{picklist_id}")
+    async def with_sync_session(picklist_id: int, db: Session = Depends(get_db)):
+        picklist = db_utils.get_picklist_by_id(db, picklist_id)
+        status = picklist.picklist_status if picklist else None
+        # End the transaction like the endpoints do, get_db only closes the
+        # session after the response, on a threadpool thread
+        db.commit()
+        return {"status": status}
+
+    @app.get("/async/{picklist_id}")
+    async def with_async_session(
+        picklist_id: int, db: AsyncSession = Depends(get_async_db)
+    ):
+        picklist = await async_db_utils.get_picklist_by_id(db, picklist_id)
+        status = picklist.picklist_status if picklist else None
+        await db.commit()
+        return {"status": status}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, clients: int, requests: int) -> dict:
+    timings = []
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(path)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+
+        async def client():
+            while not queue.empty():
+                url = queue.get_nowait()
+                started_at = time.perf_counter()
+                response = await c.get(url)
+                response.raise_for_status()
+                timings.append(time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.perf_counter() - started_at
+
+    timings.sort()
+    return {
+        "throughput": len(timings) / elapsed,
+        "p50_ms": timings[len(timings) // 2] * 1000,
+        "p99_ms": timings[int(len(timings) * 0.99)] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--picklist-id", type=int, default=1)
+    args = parser.parse_args()
+
+    app = build_app()
+    for name in ("sync", "async"):
+        path = f"/{name}/{args.picklist_id}"
+        await run(app, path, args.clients, args.clients)  # Warm up the pools
+        result = await run(app, path, args.clients, args.requests)
+        print(
+            f"{name + ' session':<14} {result['throughput']:8.0f} req/s   "
+            f"p50 {result['p50_ms']:7.1f} ms   p99 {result['p99_ms']:7.1f} ms"
+        )
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
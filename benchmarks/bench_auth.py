@@ -0,0 +1,79 @@
+"""
+Per-request auth overhead of AuthJWT vs CachedAuthJWT.
+
+Simulates what every protected endpoint does with one token reused by a polling
+client: `jwt_required()` then `get_raw_jwt()`. Needs no database.
+
+    python -m benchmarks.bench_auth [--requests 20000]
+"""
+
+import argparse
+import statistics
+import time
+from datetime import timedelta
+
+from fastapi_jwt_auth import AuthJWT
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from core.jwt_cache import CachedAuthJWT, claims_cache
+
+
+class Settings(BaseModel):
+    authjwt_secret_key: str = "benchmark-secret"
+
+
+@AuthJWT.load_config
+def get_config():
+    return Settings()
+
+
+def make_request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+
+
+def measure(auth_class, request: Request, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        Authorize = auth_class(request)
+        Authorize.jwt_required()
+        Authorize.get_raw_jwt()
+        timings.append(time.perf_counter() - started_at)
+    return timings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    mean = statistics.fmean(timings) * 1e6
+    print(f"{name:<15} mean {mean:8.1f} us   p50 {p50:8.1f} us   p99 {p99:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = AuthJWT().create_access_token(
+        subject="picker01",
+        user_claims={"role_id": 4, "user_id": 42},
+        expires_time=timedelta(minutes=120),
+    )
+    request = make_request(token)
+
+    claims_cache.clear()
+    report("AuthJWT", measure(AuthJWT, request, args.requests))
+    report("CachedAuthJWT", measure(CachedAuthJWT, request, args.requests))
+
+
+if __name__ == "__main__":
+    main()
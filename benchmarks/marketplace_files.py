@@ -0,0 +1,181 @@
+"""
+Synthetic marketplace order exports in the layouts of `constant.XLS`.
+
+Each file has the header row and first data row at the configured offsets and
+the expected headers at the configured columns, so it passes
+`validate_picklist_file` and parses with `extract_picklist_item`. Products are
+named from a stock catalog with `listing_fields`, the same names the seeder
+maps to stocks; a share of the rows uses unknown names and stays unmapped.
+
+    python -m benchmarks.marketplace_files [--orders 500] [--out bench_files]
+"""
+
+import argparse
+import os
+import random
+from io import BytesIO
+
+from constant import ECOM_CODES, XLS
+
+# Product titles as sellers write them, by stock type
+TITLE_TEMPLATES = {
+    "TIK": "{type} Premium Cotton Combed 30s Unisex",
+    "TOK": "{type} Distro Original",
+    "SHO": "{type} Pria Wanita Bahan Adem",
+    "LAZ": "{type} Basic Fit Lokal",
+}
+
+
+def listing_fields(ecom_code: str, type_name: str, color_name: str, size_name: str):
+    """
+    Returns (field1, ..., field5) of a stock as it is listed on a marketplace.
+
+    These are the values `extract_picklist_item` reads for the picklist item,
+    and the key of its product mapping.
+    """
+    title = TITLE_TEMPLATES[ecom_code].format(type=type_name.title())
+    variant = f"{color_name.title()}, {size_name}"
+
+    # Tokopedia exports have no variant column, it is part of the product name
+    if ecom_code == "TOK":
+        return (f"{title} - {variant}", None, None, None, None)
+    return (title, variant, None, None, None)
+
+
+def _width(ecom_code: str) -> int:
+    return max(field["INDEX"] for field in XLS[ecom_code]["fields"].values()) + 1
+
+
+def _header_row(ecom_code: str) -> list:
+    row = [f"Column {i + 1}" for i in range(_width(ecom_code))]
+    for field in XLS[ecom_code]["fields"].values():
+        row[field["INDEX"]] = field["NAME"]
+    return row
+
+
+def _order_rows(ecom_code: str, order_id: str, lines: list) -> list:
+    """Rows of one order, `lines` being (field1, field2, quantity) tuples."""
+    fields = XLS[ecom_code]["fields"]
+
+    def row(values: dict) -> list:
+        cells = [None] * _width(ecom_code)
+        for name, value in values.items():
+            cells[fields[name]["INDEX"]] = value
+        return cells
+
+    if ecom_code == "SHO":
+        # One row per order, every product on its own line of product_info
+        product_info = "\n".join(
+            f"[{i}] Nama Produk:{name}; Nama Variasi:{variant}; Harga: Rp 79.000; "
+            f"Jumlah: {quantity}; Nomor Referensi SKU: ; SKU Induk: "
+            for i, (name, variant, quantity) in enumerate(lines, start=1)
+        )
+        return [row({"ORDERID": order_id, "PRODUCT": product_info})]
+
+    if ecom_code == "LAZ":
+        # One row per unit, each with its own order item ID
+        return [
+            row({"ORDERID": f"{order_id}{i:02d}", "PRODUCT": name, "VARIANT": variant})
+            for name, variant, quantity in lines
+            for i in range(quantity)
+        ]
+
+    if ecom_code == "TOK":
+        return [
+            row({"ORDERID": order_id, "PRODUCT": name, "QUANTITY": quantity})
+            for name, _, quantity in lines
+        ]
+
+    return [
+        row(
+            {
+                "ORDERID": order_id,
+                "PRODUCT": name,
+                "VARIANT": variant,
+                "QUANTITY": quantity,
+            }
+        )
+        for name, variant, quantity in lines
+    ]
+
+
+def build_marketplace_file(
+    ecom_code: str,
+    catalog: list,
+    orders: int,
+    rng: random.Random,
+    unmapped_ratio: float = 0.05,
+) -> bytes:
+    """
+    Builds an order export of one marketplace.
+
+    Args:
+        ecom_code (str): One of `ECOM_CODES`.
+        catalog (list): (type_name, color_name, size_name) of the listed stocks.
+        orders (int): Number of orders, each of 1 to 3 products.
+        rng (random.Random): Seeded generator, the same seed gives the same file.
+        unmapped_ratio (float): Share of products without a stock mapping.
+
+    Returns:
+        bytes: The XLSX file.
+    """
+    from openpyxl import Workbook
+
+    config = XLS[ecom_code]
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Orders")
+
+    for i in range(config["y_offset"]["data"]):
+        if i == config["y_offset"]["header"]:
+            sheet.append(_header_row(ecom_code))
+        else:
+            # Title and instruction lines of the real exports
+            sheet.append([f"{ecom_code} order export"])
+
+    for order_no in range(orders):
+        lines = []
+        for _ in range(rng.choice((1, 1, 1, 2, 2, 3))):
+            if rng.random() < unmapped_ratio:
+                name = f"Produk Baru {rng.randrange(10000)}"
+                variant = "Random, All Size"
+            else:
+                name, variant, *_ = listing_fields(ecom_code, *rng.choice(catalog))
+            lines.append((name, variant, rng.choice((1, 1, 1, 1, 2, 3))))
+
+        order_id = f"{rng.randrange(10**11, 10**12)}{order_no:05d}"
+        for row in _order_rows(ecom_code, order_id, lines):
+            sheet.append(row)
+
+    file = BytesIO()
+    workbook.save(file)
+    return file.getvalue()
+
+
+def main():
+    # Imported here, the seeder imports `listing_fields` from this module
+    from benchmarks.seed import DEFAULT_SCALE, build_catalog
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=DEFAULT_SCALE["orders"])
+    parser.add_argument("--types", type=int, default=DEFAULT_SCALE["types"])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="bench_files")
+    args = parser.parse_args()
+
+    catalog = [
+        (stock_type[0], color[0], size[0])
+        for stock_type, color, size in build_catalog(
+            args.types, DEFAULT_SCALE["colors"], DEFAULT_SCALE["sizes"]
+        )
+    ]
+    rng = random.Random(args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    for ecom_code in ECOM_CODES:
+        path = os.path.join(args.out, f"{ecom_code}_orders.xlsx")
+        with open(path, "wb") as f:
+            f.write(build_marketplace_file(ecom_code, catalog, args.orders, rng))
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""
+Creates the schema and synthetic data of a benchmark database.
+
+The schema comes from the schema cache (`python -m database` against a dev
+database writes it), so no dump or running app is needed. It targets a local
+MySQL container (e.g. `docker run -e MYSQL_ROOT_PASSWORD=bench
+-e MYSQL_DATABASE=wms_bench -p 3306:3306 mysql:8`) or a SQLite file; MySQL
+column types and defaults are converted for other databases.
+
+The database is dropped and recreated on every run.
+
+    python -m benchmarks.seed --db-url sqlite:///bench.db [--types 20]
+"""
+
+import argparse
+import itertools
+import pickle
+import random
+import re
+from datetime import datetime, timedelta
+
+import bcrypt
+from sqlalchemy import (
+    DefaultClause,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    create_engine,
+    insert,
+    select,
+    text,
+)
+
+from constant import ECOM_CODES, PASSWORD_HASH, SCHEMA_CACHE_PATH
+from core.db_enums import (
+    InboundTMStatus,
+    PicklistItemTRIsExcluded,
+    PicklistTMStatus,
+    RoleTMRoleId,
+    StockTMIsActive,
+    UserTMStatus,
+)
+from core.utils import transform_color_name, transform_size_names, transform_type_name
+from benchmarks.marketplace_files import listing_fields
+
+TYPE_NAMES = [
+    "Kaos Polos",
+    "Kaos Oversize",
+    "Kemeja Flanel",
+    "Kemeja Oxford",
+    "Hoodie Zipper",
+    "Hoodie Jumper",
+    "Sweater Rajut",
+    "Crewneck",
+    "Polo Shirt",
+    "Jaket Bomber",
+    "Jaket Denim",
+    "Celana Chino",
+    "Celana Cargo",
+    "Jogger Pants",
+    "Kaos Raglan",
+    "Tank Top",
+]
+COLORS = [
+    ("Hitam", "000000"),
+    ("Putih", "FFFFFF"),
+    ("Navy", "1F2A44"),
+    ("Maroon", "800000"),
+    ("Abu Misty", "B8B8B8"),
+    ("Army", "4B5320"),
+    ("Mustard", "E1AD01"),
+    ("Sage", "9CAF88"),
+    ("Coklat", "6F4E37"),
+    ("Cream", "FFFDD0"),
+    ("Biru Denim", "1560BD"),
+    ("Merah", "C1121F"),
+]
+SIZES = ["S", "M", "L", "XL", "XXL", "3XL", "4XL", "5XL"]
+
+BENCH_PASSWORD = "Bench-password-1"
+
+
+# Size of the seeded data, every key is also a command line option
+DEFAULT_SCALE = {
+    "types": 20,  # Stock types, each in every color and size
+    "colors": 10,
+    "sizes": 6,
+    "orders": 500,  # Orders per marketplace file, items of the dashboard picklist
+    "picking_items": 50,  # Items of each picklist completed by complete_draft
+    "inbound_items": 20,  # Items of each inbound submitted by submit_inbound
+    "users": 50,
+    "unmapped_ratio": 0.05,  # Share of marketplace products without a mapping
+}
+
+
+def build_catalog(types: int, colors: int = 10, sizes: int = 6) -> list:
+    """
+    Returns every (type, color, size) combination as (name, value) tuples.
+
+    Names go through the same transforms as the bulk stock creation.
+    """
+    # Past the list, names repeat with a number, e.g. "KAOS POLOS 2"
+    type_names = [
+        TYPE_NAMES[i % len(TYPE_NAMES)]
+        + (f" {i // len(TYPE_NAMES) + 1}" if i >= len(TYPE_NAMES) else "")
+        for i in range(types)
+    ]
+    return list(
+        itertools.product(
+            [transform_type_name(name) for name in type_names],
+            [transform_color_name(*color) for color in COLORS[:colors]],
+            [transform_size_names(size) for size in SIZES[:sizes]],
+        )
+    )
+
+
+def load_schema(path: str = SCHEMA_CACHE_PATH) -> MetaData:
+    """Reads the metadata from the schema cache written by `python -m database`."""
+    with open(path, "rb") as f:
+        _, metadata = pickle.load(f)
+    return metadata
+
+
+def _portable(metadata: MetaData) -> MetaData:
+    """Copy of MySQL reflected metadata that other databases can create."""
+    portable = MetaData()
+    for table in metadata.sorted_tables:
+        table = table.to_metadata(portable)
+        for column in table.columns:
+            try:
+                column.type = column.type.as_generic()
+            except NotImplementedError:
+                # No generic counterpart, e.g. LONGBLOB or SET
+                is_binary = column.type.python_type is bytes
+                column.type = LargeBinary() if is_binary else String()
+            if getattr(column.type, "collation", None):
+                column.type.collation = None
+            # SQLite only autoincrements INTEGER PRIMARY KEY, not BIGINT
+            if column.primary_key and column.autoincrement is not False:
+                if isinstance(column.type, Integer) and len(table.primary_key) == 1:
+                    column.type = Integer()
+            if column.server_default is not None:
+                default = str(getattr(column.server_default.arg, "text", ""))
+                # MySQL only, e.g. "CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+                default = re.sub(r"\s+ON UPDATE .*$", "", default, flags=re.I)
+                column.server_default = (
+                    DefaultClause(text(default)) if default else None
+                )
+    return portable
+
+
+def create_schema(engine, metadata: MetaData) -> MetaData:
+    """Drops and creates every table of the metadata. Returns the metadata used."""
+    if engine.dialect.name != "mysql":
+        metadata = _portable(metadata)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    return metadata
+
+
+def _insert(conn, table, rows: list):
+    """Inserts in one executemany, dropping keys the table doesn't have."""
+    if rows:
+        conn.execute(
+            insert(table),
+            [{k: v for k, v in row.items() if k in table.c} for row in rows],
+        )
+
+
+def _ids(conn, table) -> list:
+    return list(conn.execute(select(table.c.id).order_by(table.c.id)).scalars())
+
+
+def seed(engine, metadata: MetaData, scale: dict, runs: int, seed: int = 1) -> dict:
+    """
+    Inserts users, stocks, product mappings, picklists and inbounds.
+
+    Args:
+        scale (dict): Keys of `DEFAULT_SCALE`.
+        runs (int): Picklists ready to complete and inbounds ready to submit,
+            one per request of those scenarios.
+
+    Returns:
+        dict: Names and IDs of the seeded rows the benchmark scenarios use.
+    """
+    rng = random.Random(seed)
+    t = metadata.tables
+    now = datetime.now()
+    catalog = build_catalog(scale["types"], scale["colors"], scale["sizes"])
+
+    with engine.begin() as conn:
+        # region Users
+        _insert(
+            conn,
+            t["role_tm"],
+            [{"id": role.value, "role_name": role.name} for role in RoleTMRoleId],
+        )
+        # One hash for all, at the configured cost so login does the real work
+        hashed = bcrypt.hashpw(
+            BENCH_PASSWORD.encode("utf-8"),
+            bcrypt.gensalt(rounds=PASSWORD_HASH["rounds"]),
+        ).decode("utf-8")
+        usernames = [f"bench{i:04d}" for i in range(scale["users"])]
+        _insert(
+            conn,
+            t["user_tm"],
+            [
+                {
+                    "username": username,
+                    "password": hashed,
+                    "role_id": RoleTMRoleId.OWNER if i == 0 else RoleTMRoleId.PACKER,
+                    "is_active": UserTMStatus.ACTIVE,
+                    "created_dt": now - timedelta(days=i),
+                }
+                for i, username in enumerate(usernames)
+            ],
+        )
+        owner_id = _ids(conn, t["user_tm"])[0]
+        # endregion
+
+        # region Stocks and mappings
+        types = sorted({stock_type for stock_type, _, _ in catalog})
+        colors = sorted({color for _, color, _ in catalog})
+        sizes = sorted({size for _, _, size in catalog})
+        _insert(
+            conn,
+            t["stocktype_tr"],
+            [{"type_name": name, "type_value": value} for name, value in types],
+        )
+        _insert(
+            conn,
+            t["stockcolor_tr"],
+            [{"color_name": name, "color_hex": hex_} for name, hex_ in colors],
+        )
+        _insert(
+            conn,
+            t["stocksize_tr"],
+            [{"size_name": name, "size_value": value} for name, value in sizes],
+        )
+        type_ids = dict(zip(types, _ids(conn, t["stocktype_tr"])))
+        color_ids = dict(zip(colors, _ids(conn, t["stockcolor_tr"])))
+        size_ids = dict(zip(sizes, _ids(conn, t["stocksize_tr"])))
+
+        _insert(
+            conn,
+            t["stock_tm"],
+            [
+                {
+                    "stock_type_id": type_ids[stock_type],
+                    "stock_color_id": color_ids[color],
+                    "stock_size_id": size_ids[size],
+                    "quantity": rng.randrange(1000, 100000),
+                    "reserved_quantity": 0,
+                    "is_active": StockTMIsActive.ACTIVE,
+                }
+                for stock_type, color, size in catalog
+            ],
+        )
+        stock_ids = _ids(conn, t["stock_tm"])
+        names = [(ty[0], co[0], si[0]) for ty, co, si in catalog]
+
+        mapping_rows = []
+        for ecom_code in ECOM_CODES:
+            for stock_id, stock_names in zip(stock_ids, names):
+                fields = listing_fields(ecom_code, *stock_names)
+                mapping_rows.append(
+                    {"ecom_code": ecom_code, "stock_id": stock_id}
+                    | {f"field{i}": value for i, value in enumerate(fields, start=1)}
+                )
+        _insert(conn, t["productmapping_tr"], mapping_rows)
+        # endregion
+
+        # region Picklists
+        def picklist_items(picklist_id: int, count: int) -> list:
+            items = []
+            for n in range(count):
+                ecom_code = rng.choice(ECOM_CODES)
+                position = rng.randrange(len(stock_ids))
+                fields = listing_fields(ecom_code, *names[position])
+                mapped = rng.random() >= scale["unmapped_ratio"]
+                items.append(
+                    {
+                        "picklist_id": picklist_id,
+                        "ecom_code": ecom_code,
+                        "ecom_order_id": f"{picklist_id}{n:06d}",
+                        "product_name": " - ".join(v for v in fields[:2] if v),
+                        "stock_id": stock_ids[position] if mapped else None,
+                        "is_excluded": PicklistItemTRIsExcluded.INCLUDED,
+                    }
+                    | {f"field{i}": value for i, value in enumerate(fields, start=1)}
+                )
+            return items
+
+        _insert(
+            conn,
+            t["picklist_tm"],
+            [
+                {"picklist_status": PicklistTMStatus.ON_DRAFT, "draft_create_dt": now},
+                {"picklist_status": PicklistTMStatus.ON_DRAFT, "draft_create_dt": now},
+            ]
+            + [
+                {
+                    "picklist_status": PicklistTMStatus.ON_PICKING,
+                    "draft_create_dt": now,
+                    "creation_dt": now,
+                    "pick_start_dt": now,
+                }
+                for _ in range(runs)
+            ],
+        )
+        dashboard_id, upload_id, *picking_ids = _ids(conn, t["picklist_tm"])
+        _insert(
+            conn, t["picklistitem_tr"], picklist_items(dashboard_id, scale["orders"])
+        )
+
+        # Picklists on picking have every item mapped and their stock reserved
+        picking_items = []
+        for picklist_id in picking_ids:
+            for item in picklist_items(picklist_id, scale["picking_items"]):
+                item["stock_id"] = item["stock_id"] or stock_ids[0]
+                picking_items.append(item)
+        _insert(conn, t["picklistitem_tr"], picking_items)
+
+        reservations = {}
+        for item in picking_items:
+            key = (item["picklist_id"], item["stock_id"])
+            reservations[key] = reservations.get(key, 0) + 1
+        _insert(
+            conn,
+            t["stockreservation_tr"],
+            [
+                {"picklist_id": picklist_id, "stock_id": stock_id, "quantity": quantity}
+                for (picklist_id, stock_id), quantity in reservations.items()
+            ],
+        )
+        reserved = {}
+        for (_, stock_id), quantity in reservations.items():
+            reserved[stock_id] = reserved.get(stock_id, 0) + quantity
+        stock = t["stock_tm"]
+        for stock_id, quantity in reserved.items():
+            conn.execute(
+                stock.update()
+                .where(stock.c.id == stock_id)
+                .values(reserved_quantity=quantity)
+            )
+        # endregion
+
+        # region Inbounds
+        _insert(
+            conn,
+            t["inbound_tm"],
+            [
+                {
+                    "status": InboundTMStatus.PENDING,
+                    "supplier_name": f"Konveksi {rng.choice(TYPE_NAMES)}",
+                    "notes": "Benchmark inbound",
+                    "user_id": owner_id,
+                    "item_count": scale["inbound_items"],
+                    "total_quantity": scale["inbound_items"] * 50,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for _ in range(runs)
+            ],
+        )
+        inbound_ids = _ids(conn, t["inbound_tm"])
+        _insert(
+            conn,
+            t["inbounditems_tr"],
+            [
+                {
+                    "inbound_id": inbound_id,
+                    "stock_id": stock_id,
+                    "add_quantity": 50,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for inbound_id in inbound_ids
+                for stock_id in rng.sample(stock_ids, scale["inbound_items"])
+            ],
+        )
+        # endregion
+
+    return {
+        "catalog": names,
+        "owner_id": owner_id,
+        "usernames": usernames,
+        "dashboard_picklist_id": dashboard_id,
+        "upload_picklist_id": upload_id,
+        "picking_picklist_ids": picking_ids,
+        "inbound_ids": inbound_ids,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--schema-cache", default=SCHEMA_CACHE_PATH)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    for name, default in DEFAULT_SCALE.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(default), default=default
+        )
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    metadata = create_schema(engine, load_schema(args.schema_cache))
+    scale = {name: getattr(args, name) for name in DEFAULT_SCALE}
+    dataset = seed(engine, metadata, scale, args.runs, args.seed)
+    print(
+        f"Seeded {len(dataset['catalog'])} stocks, {len(dataset['usernames'])} "
+        f"users, {len(dataset['picking_picklist_ids'])} picklists on picking and "
+        f"{len(dataset['inbound_ids'])} pending inbounds"
+    )
+
+
+if __name__ == "__main__":
+    main()
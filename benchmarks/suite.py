@@ -0,0 +1,289 @@
+"""
+End-to-end benchmark of the main API flows on a seeded database.
+
+Creates and seeds the database given by --db-url (see benchmarks/seed.py, the
+database is wiped), builds marketplace files (see benchmarks/marketplace_files.py)
+and runs each scenario through the whole app in-process, with --clients
+concurrent clients. Reports throughput and p50/p99 latency per scenario.
+
+    python -m benchmarks.suite --db-url sqlite:///bench.db --save-baseline baseline.json
+    python -m benchmarks.suite --db-url sqlite:///bench.db --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+import constant
+from constant import ECOM_CODES, SCHEMA_CACHE_PATH, XLS_FILE_FORMAT
+from benchmarks.marketplace_files import build_marketplace_file
+from benchmarks.seed import BENCH_PASSWORD, DEFAULT_SCALE, create_schema, load_schema
+from benchmarks.seed import seed as seed_database
+
+API = "/api_v1"
+
+ASYNC_DRIVERS = {"mysql": "mysql+asyncmy", "sqlite": "sqlite+aiosqlite"}
+
+
+# region Scenarios
+# Each returns `count` requests as (method, url, httpx keyword arguments). The
+# stateful ones use a different seeded picklist or inbound per request.
+def upload_requests(dataset: dict, files: dict, count: int) -> list:
+    picklist_id = dataset["upload_picklist_id"]
+    return [
+        (
+            "POST",
+            f"{API}/picklist/{picklist_id}/upload/{ecom_code}",
+            {
+                "files": {
+                    "file": (f"{ecom_code}.xlsx", files[ecom_code], XLS_FILE_FORMAT)
+                }
+            },
+        )
+        for ecom_code in itertools.islice(itertools.cycle(ECOM_CODES), count)
+    ]
+
+
+def dashboard_requests(dataset: dict, files: dict, count: int) -> list:
+    url = f"{API}/picklist/{dataset['dashboard_picklist_id']}/dashboard"
+    return [("GET", url, {})] * count
+
+
+def repeat_item_mapping_requests(dataset: dict, files: dict, count: int) -> list:
+    url = f"{API}/picklist/{dataset['dashboard_picklist_id']}/repeat-item-mapping"
+    return [("POST", url, {"json": {"mapped_picklistitem_id": None}})] * count
+
+
+def complete_draft_requests(dataset: dict, files: dict, count: int) -> list:
+    return [
+        ("POST", f"{API}/picklist/{picklist_id}/update/complete-draft", {})
+        for picklist_id in dataset["picking_picklist_ids"][:count]
+    ]
+
+
+def submit_inbound_requests(dataset: dict, files: dict, count: int) -> list:
+    return [
+        ("POST", f"{API}/inbound/{inbound_id}/submit", {})
+        for inbound_id in dataset["inbound_ids"][:count]
+    ]
+
+
+def login_requests(dataset: dict, files: dict, count: int) -> list:
+    return [
+        (
+            "POST",
+            f"{API}/auth/login",
+            {"json": {"username": username, "password": BENCH_PASSWORD}},
+        )
+        for username in itertools.islice(itertools.cycle(dataset["usernames"]), count)
+    ]
+
+
+SCENARIOS = {
+    "upload": upload_requests,
+    "dashboard": dashboard_requests,
+    "repeat_item_mapping": repeat_item_mapping_requests,
+    "complete_draft": complete_draft_requests,
+    "submit_inbound": submit_inbound_requests,
+    "login": login_requests,
+}
+# endregion
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    return sorted_values[
+        min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    ]
+
+
+async def run(client: httpx.AsyncClient, requests: list, clients: int) -> dict:
+    timings = []
+    errors = 0
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            method, url, kwargs = queue.get_nowait()
+            started_at = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            timings.append(time.perf_counter() - started_at)
+            if response.status_code >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started_at
+
+    timings.sort()
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "throughput": round(len(timings) / elapsed, 2),
+        "p50_ms": round(percentile(timings, 0.5) * 1000, 2),
+        "p99_ms": round(percentile(timings, 0.99) * 1000, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Prints the change against a baseline. Returns True if nothing regressed."""
+    ok = True
+    print(f"\nAgainst baseline of {baseline['created']} (tolerance {tolerance:.0%}):")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        changes = {
+            key: result[key] / before[key] - 1 if before[key] else 0
+            for key in ("throughput", "p50_ms", "p99_ms")
+        }
+        regressed = (
+            changes["throughput"] < -tolerance
+            or changes["p50_ms"] > tolerance
+            or changes["p99_ms"] > tolerance
+        )
+        ok = ok and not regressed
+        print(
+            f"{name:<20} throughput {changes['throughput']:+7.1%}   "
+            f"p50 {changes['p50_ms']:+7.1%}   p99 {changes['p99_ms']:+7.1%}"
+            + ("   REGRESSED" if regressed else "")
+        )
+    return ok
+
+
+async def benchmark(args, dataset: dict, files: dict) -> dict:
+    # Imported once the environment points the app at the benchmark database
+    from main import app
+    from core import throttle
+    from fastapi_jwt_auth import AuthJWT
+
+    # Measure login itself, not the throttle rejecting the benchmark's burst
+    throttle.ip_limiter = throttle.TokenBucketLimiter(1e9, 1e9, 1)
+    throttle.username_limiter = throttle.TokenBucketLimiter(1e9, 1e9, 1)
+
+    token = AuthJWT().create_access_token(
+        subject=dataset["usernames"][0],
+        user_claims={"user_id": dataset["owner_id"], "role_id": 1},
+        expires_time=timedelta(hours=1),
+    )
+
+    results = {}
+    await app.router.startup()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=None,
+    ) as client:
+        for name in args.scenarios:
+            requests = SCENARIOS[name](dataset, files, args.warmup + args.requests)
+            await run(client, requests[: args.warmup], args.clients)
+            result = await run(client, requests[args.warmup :], args.clients)
+            results[name] = result
+            print(
+                f"{name:<20} {result['throughput']:8.1f} req/s   "
+                f"p50 {result['p50_ms']:8.1f} ms   p99 {result['p99_ms']:8.1f} ms"
+                + (f"   {result['errors']} errors" if result["errors"] else "")
+            )
+    await app.router.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--schema-cache", default=SCHEMA_CACHE_PATH)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    for name, default in DEFAULT_SCALE.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(default), default=default
+        )
+    args = parser.parse_args()
+    scale = {name: getattr(args, name) for name in DEFAULT_SCALE}
+
+    engine = create_engine(args.db_url)
+    metadata = create_schema(engine, load_schema(args.schema_cache))
+    dataset = seed_database(
+        engine, metadata, scale, args.warmup + args.requests, args.seed
+    )
+    engine.dispose()
+
+    rng = random.Random(args.seed)
+    files = {
+        ecom_code: build_marketplace_file(
+            ecom_code,
+            dataset["catalog"],
+            scale["orders"],
+            rng,
+            scale["unmapped_ratio"],
+        )
+        for ecom_code in ECOM_CODES
+    }
+
+    # The app reflects the seeded database into a cache of its own
+    url = make_url(args.db_url)
+    async_url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+    os.environ["WMS_DATABASE_URL"] = url.render_as_string(hide_password=False)
+    os.environ["WMS_ASYNC_DATABASE_URL"] = async_url.render_as_string(
+        hide_password=False
+    )
+    # Already read from the environment when `constant` was imported
+    constant.SCHEMA_CACHE_PATH = os.path.join(
+        tempfile.mkdtemp(prefix="wms-bench-"), "schema_cache.pickle"
+    )
+
+    results = asyncio.run(benchmark(args, dataset, files))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(
+                {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "dialect": url.get_backend_name(),
+                    "python": platform.python_version(),
+                    "settings": {
+                        "requests": args.requests,
+                        "clients": args.clients,
+                        "seed": args.seed,
+                        "scale": scale,
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,23 @@
+import os
+
+# Default location of the files the app writes, whatever directory it starts in
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Connection pool of each worker (see database.py). Recycle connections before
+# MySQL's wait_timeout closes them, and ping them on checkout.
+DB_POOL = {
+    "pool_size": int(os.getenv("WMS_DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("WMS_DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("WMS_DB_POOL_TIMEOUT_SEC", "30")),
+    "pool_recycle": int(os.getenv("WMS_DB_POOL_RECYCLE_SEC", "3600")),
+    "pool_pre_ping": os.getenv("WMS_DB_POOL_PRE_PING", "1") == "1",
+}
+
+# Reflected DB schema, read at startup instead of reflecting (see database.py)
+SCHEMA_CACHE_PATH = os.getenv(
+    "WMS_SCHEMA_CACHE_PATH", os.path.join(PROJECT_DIR, "schema_cache.pickle")
+)
+
 XLS_FILE_FORMAT = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 XLS = {
@@ -48,3 +68,118 @@ XLS = {
 }
 
 ECOM_CODES = ["TIK", "TOK", "SHO", "LAZ"]
+
+# Bulk stock creation sheet, each column lists the variant names to combine
+STOCK_BULK_XLS = {
+    "y_offset": {
+        "header": 0,
+        "data": 1,
+    },
+    "fields": {
+        "TYPE": {"INDEX": 0, "NAME": "Type"},
+        "SIZE": {"INDEX": 1, "NAME": "Size"},
+        "COLOR": {"INDEX": 2, "NAME": "Color"},
+    },
+}
+
+STOCK_BULK_MAX_COMBINATIONS = 5000
+
+# Supplier delivery sheets for inbound import, keyed by layout code
+INBOUND_XLS = {
+    "DEFAULT": {
+        "y_offset": {
+            "header": 0,
+            "data": 1,
+        },
+        "fields": {
+            "TYPE": {"INDEX": 0, "NAME": "Type"},
+            "COLOR": {"INDEX": 1, "NAME": "Color"},
+            "SIZE": {"INDEX": 2, "NAME": "Size"},
+            "QUANTITY": {"INDEX": 3, "NAME": "Quantity"},
+        },
+    },
+}
+
+INBOUND_IMPORT_CHUNK_SIZE = 500
+
+# Reorder suggestions (see core/analytics.py)
+REORDER = {
+    "history_days": 90,  # Days of outbound history loaded into the matrix
+    "velocity_window_days": 28,  # Trailing window for the moving-average velocity
+    "lead_time_days": 7,  # Supplier lead time
+    "review_period_days": 7,  # Days between two inbound orders
+    "service_level_z": 1.65,  # ~95% service level for the safety stock
+}
+
+# Shared by the nightly job and the API workers, which may start in other directories
+REORDER_SNAPSHOT_PATH = os.getenv(
+    "WMS_REORDER_SNAPSHOT_PATH", os.path.join(PROJECT_DIR, "reorder_snapshot.json")
+)
+
+# Streaming exports (see core/export.py)
+EXPORT = {
+    "batch_size": 1000,  # Rows fetched per server-side cursor batch
+    "chunk_bytes": 64 * 1024,  # Size of the chunks sent for XLSX files
+    "spool_max_bytes": 8 * 1024 * 1024,  # XLSX files above this go to disk
+}
+
+# How often each worker polls cacheversion_tm, i.e. the longest a change made by
+# another worker can go unnoticed by the in-memory caches (see core/cache_sync.py)
+CACHE_STALENESS_SEC = float(os.getenv("WMS_CACHE_STALENESS_SEC", "5"))
+
+# Password hashing (see core/password.py). Existing hashes made with another
+# cost are rehashed on the next successful login.
+PASSWORD_HASH = {
+    "rounds": int(os.getenv("WMS_BCRYPT_ROUNDS", "12")),  # bcrypt cost factor
+    "max_workers": int(os.getenv("WMS_PASSWORD_HASH_WORKERS", "2")),  # Hash threads
+}
+
+# Seconds between two writes of the buffered last-login timestamps (see
+# core/last_login.py). Pending timestamps are also written at shutdown.
+LAST_LOGIN_FLUSH_SEC = float(os.getenv("WMS_LAST_LOGIN_FLUSH_SEC", "10"))
+
+# Verified JWT claims kept per worker (see core/jwt_cache.py)
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv("WMS_JWT_CLAIMS_CACHE_SIZE", "4096"))
+
+# Login and signup throttling (see core/throttle.py). The limits are per
+# deployment; each of the WMS_WORKERS workers enforces its share of them. The IP
+# limit must allow a whole shift logging in from the warehouse network at once;
+# behind a reverse proxy run uvicorn with --proxy-headers to see client IPs.
+AUTH_THROTTLE = {
+    "ip": {"rate_per_min": 120, "burst": 60},
+    "username": {"rate_per_min": 6, "burst": 5},
+    "max_keys": 10000,  # Buckets kept per limiter, least recently used evicted
+    "workers": int(os.getenv("WMS_WORKERS", "1")),
+}
+
+# Event loop lag monitor (see core/loop_monitor.py), off unless
+# WMS_LOOP_MONITOR=1. Stalls longer than the threshold are logged with the
+# request and a stack of the blocking call.
+LOOP_MONITOR = {
+    "enabled": os.getenv("WMS_LOOP_MONITOR", "0") == "1",
+    "interval_sec": float(os.getenv("WMS_LOOP_MONITOR_INTERVAL_SEC", "0.1")),
+    "block_threshold_sec": float(os.getenv("WMS_LOOP_BLOCK_THRESHOLD_SEC", "0.25")),
+}
+
+# Slow query log (see core/slow_query.py), off unless WMS_SLOW_QUERY_LOG=1.
+# Statements over the threshold are written with their EXPLAIN plan to a
+# rotating JSON lines file; sample below 1 on busy servers.
+SLOW_QUERY = {
+    "enabled": os.getenv("WMS_SLOW_QUERY_LOG", "0") == "1",
+    "threshold_sec": float(os.getenv("WMS_SLOW_QUERY_THRESHOLD_SEC", "0.5")),
+    "sample_rate": float(os.getenv("WMS_SLOW_QUERY_SAMPLE_RATE", "1")),
+    "explain": os.getenv("WMS_SLOW_QUERY_EXPLAIN", "1") == "1",
+    "max_pending": 100,  # Records waiting for EXPLAIN, newer ones are dropped
+    "path": os.getenv(
+        "WMS_SLOW_QUERY_LOG_PATH", os.path.join(PROJECT_DIR, "slow_queries.log")
+    ),
+    "max_bytes": 10 * 1024 * 1024,  # Size of a log file before it rotates
+    "backup_count": 5,  # Rotated files kept
+}
+
+# Client networks allowed to read GET /api_v1/metrics (see core/metrics.py), which
+# has no JWT so that Prometheus can scrape it. Comma separated; behind a reverse
+# proxy run uvicorn with --proxy-headers so the check sees the real client IP.
+METRICS_ALLOWED_NETWORKS = os.getenv(
+    "WMS_METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128"
+).split(",")
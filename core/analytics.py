@@ -0,0 +1,217 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from constant import REORDER, REORDER_SNAPSHOT_PATH
+from core.reorder_snapshot import write_reorder_snapshot
+from core.db_enums import PicklistTMStatus, PicklistItemTRIsExcluded, StockTMIsActive
+from database import (
+    Picklist_TM,
+    PicklistItem_TR,
+    Stock_TM,
+    StockType_TR,
+    StockSize_TR,
+    StockColor_TR,
+)
+
+
+def get_active_stocks(db: Session):
+    """
+    Fetches every active stock ordered by ID, with its variant names and
+    available (on hand minus reserved) quantity.
+    """
+    return (
+        db.query(
+            Stock_TM.id.label("stock_id"),
+            StockType_TR.type_name,
+            StockColor_TR.color_name,
+            StockSize_TR.size_name,
+            (Stock_TM.quantity - Stock_TM.reserved_quantity).label(
+                "available_quantity"
+            ),
+        )
+        .join(StockType_TR, Stock_TM.stock_type_id == StockType_TR.id)
+        .join(StockSize_TR, Stock_TM.stock_size_id == StockSize_TR.id)
+        .join(StockColor_TR, Stock_TM.stock_color_id == StockColor_TR.id)
+        .filter(Stock_TM.is_active == StockTMIsActive.ACTIVE)
+        .order_by(Stock_TM.id.asc())
+        .all()
+    )
+
+
+def build_outbound_matrix(
+    db: Session, stock_ids: np.ndarray, end_date: date, days: int
+) -> np.ndarray:
+    """
+    Builds the daily outbound matrix from completed picklists.
+
+    Args:
+        db (Session): Database session.
+        stock_ids (np.ndarray): Sorted stock IDs, one matrix row per stock.
+        end_date (date): Last day (inclusive) of the history.
+        days (int): Number of days of history, one matrix column per day.
+
+    Returns:
+        np.ndarray: Matrix of shape (len(stock_ids), days) where cell [i, d]
+            holds the units of stock_ids[i] picked on day d (oldest first).
+    """
+    start_date = end_date - timedelta(days=days - 1)
+    day_col = func.date(Picklist_TM.completion_dt)
+
+    # Aggregate in SQL, so only one row per (stock, day) reaches Python
+    rows = (
+        db.query(
+            PicklistItem_TR.stock_id,
+            day_col.label("day"),
+            func.count(PicklistItem_TR.id).label("quantity"),
+        )
+        .join(Picklist_TM, PicklistItem_TR.picklist_id == Picklist_TM.id)
+        .filter(
+            Picklist_TM.picklist_status == PicklistTMStatus.COMPLETED,
+            Picklist_TM.completion_dt >= start_date,
+            Picklist_TM.completion_dt < end_date + timedelta(days=1),
+            PicklistItem_TR.is_excluded == PicklistItemTRIsExcluded.INCLUDED,
+            PicklistItem_TR.stock_id.isnot(None),
+        )
+        .group_by(PicklistItem_TR.stock_id, day_col)
+        .all()
+    )
+
+    matrix = np.zeros((len(stock_ids), days), dtype=np.float64)
+    if not rows or not len(stock_ids):
+        return matrix
+
+    row_stock = np.fromiter((row.stock_id for row in rows), np.int64, len(rows))
+    row_day = np.fromiter(
+        ((_as_date(row.day) - start_date).days for row in rows), np.int64, len(rows)
+    )
+    row_qty = np.fromiter((row.quantity for row in rows), np.float64, len(rows))
+
+    # Map stock IDs to matrix rows; drop stocks that are no longer active
+    row_idx = np.searchsorted(stock_ids, row_stock)
+    row_idx_clipped = np.minimum(row_idx, len(stock_ids) - 1)
+    valid = (stock_ids[row_idx_clipped] == row_stock) & (row_day >= 0)
+
+    np.add.at(matrix, (row_idx_clipped[valid], row_day[valid]), row_qty[valid])
+    return matrix
+
+
+def compute_reorder_metrics(
+    matrix: np.ndarray,
+    available: np.ndarray,
+    window_days: int,
+    lead_time_days: int,
+    review_period_days: int,
+    service_level_z: float,
+) -> dict:
+    """
+    Computes velocity, days of cover and reorder suggestions for all stocks at once.
+
+    Velocity is the moving average of daily outbound over the trailing window.
+    The reorder point covers the lead time demand plus a safety stock derived from
+    the daily demand deviation. Stocks at or below their reorder point get a
+    suggested quantity that tops them up for the lead time and review period.
+
+    Returns:
+        dict: Arrays keyed by metric name, aligned with the matrix rows.
+    """
+    recent = matrix[:, -window_days:]
+    velocity = recent.mean(axis=1)
+    deviation = recent.std(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(velocity > 0, available / velocity, np.inf)
+
+    safety_stock = service_level_z * deviation * np.sqrt(lead_time_days)
+    reorder_point = velocity * lead_time_days + safety_stock
+    target_level = reorder_point + velocity * review_period_days
+    suggested_quantity = np.where(
+        (velocity > 0) & (available <= reorder_point),
+        np.ceil(np.maximum(target_level - available, 0)),
+        0,
+    )
+
+    return {
+        "velocity": velocity,
+        "days_of_cover": days_of_cover,
+        "safety_stock": safety_stock,
+        "reorder_point": reorder_point,
+        "suggested_quantity": suggested_quantity,
+    }
+
+
+def refresh_reorder_snapshot(db: Session, end_date: date = None) -> dict:
+    """
+    Recomputes the reorder suggestions and writes them to `REORDER_SNAPSHOT_PATH`.
+    Meant to run nightly (see README), the endpoint only reads the snapshot.
+    """
+    end_date = end_date or date.today() - timedelta(days=1)
+
+    stocks = get_active_stocks(db)
+    stock_ids = np.fromiter((s.stock_id for s in stocks), np.int64, len(stocks))
+    available = np.fromiter(
+        (s.available_quantity for s in stocks), np.float64, len(stocks)
+    )
+
+    matrix = build_outbound_matrix(db, stock_ids, end_date, REORDER["history_days"])
+    metrics = compute_reorder_metrics(
+        matrix,
+        available,
+        REORDER["velocity_window_days"],
+        REORDER["lead_time_days"],
+        REORDER["review_period_days"],
+        REORDER["service_level_z"],
+    )
+
+    # Most urgent first: lowest days of cover, then biggest suggestion
+    order = np.lexsort((-metrics["suggested_quantity"], metrics["days_of_cover"]))
+
+    items = []
+    for i in order.tolist():
+        cover = metrics["days_of_cover"][i]
+        items.append(
+            {
+                "stock_id": stocks[i].stock_id,
+                "type_name": stocks[i].type_name,
+                "color_name": stocks[i].color_name,
+                "size_name": stocks[i].size_name,
+                "available_quantity": int(available[i]),
+                "velocity": round(float(metrics["velocity"][i]), 3),
+                "days_of_cover": round(float(cover), 1) if np.isfinite(cover) else None,
+                "reorder_point": round(float(metrics["reorder_point"][i]), 1),
+                "suggested_quantity": int(metrics["suggested_quantity"][i]),
+            }
+        )
+
+    snapshot = {
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "history_end_date": end_date.strftime("%Y-%m-%d"),
+        "parameters": REORDER,
+        "items": items,
+    }
+
+    write_reorder_snapshot(snapshot)
+
+    return snapshot
+
+
+def _as_date(value) -> date:
+    # DATE() comes back as a date on MySQL, but as a string on some drivers
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = refresh_reorder_snapshot(db)
+        suggested = sum(1 for item in result["items"] if item["suggested_quantity"])
+        print(
+            f"Reorder snapshot written to {REORDER_SNAPSHOT_PATH}: "
+            f"{len(result['items'])} stocks, {suggested} with suggestions"
+        )
+    finally:
+        db.close()
@@ -0,0 +1,244 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import db_utils
+from core.db_enums import PicklistTMStatus
+from database import (
+    Picklist_TM,
+    PicklistFile_TR,
+    PicklistItem_TR,
+    Stock_TM,
+    StockType_TR,
+    StockSize_TR,
+    StockColor_TR,
+    ProductMapping_TR,
+)
+
+# Async counterparts of core/db_utils.py for the async endpoints. They behave
+# like the helpers of the same name there, including which ones commit.
+
+
+# region PicklistTM
+async def get_picklist_by_id(db: AsyncSession, picklist_id: int):
+    return await db.get(Picklist_TM, picklist_id)
+
+
+async def set_picklist_status(
+    db: AsyncSession, picklist, new_picklist_status: PicklistTMStatus
+):
+    picklist.picklist_status = new_picklist_status
+
+    match new_picklist_status:
+        case PicklistTMStatus.CANCELLED:
+            picklist.draft_cancel_dt = datetime.now()
+
+        case PicklistTMStatus.CREATED:
+            picklist.creation_dt = datetime.now()
+
+        case PicklistTMStatus.ON_PICKING:
+            picklist.pick_start_dt = datetime.now()
+
+        case PicklistTMStatus.COMPLETED:
+            picklist.completion_dt = datetime.now()
+
+    await db.commit()
+
+
+# endregion
+
+
+# region PicklistFileTR
+async def create_picklistfile(
+    db: AsyncSession, picklist_id: int, ecom_code: str, file_name: str, file_data
+):
+    new_picklistfile = PicklistFile_TR(
+        ecom_code=ecom_code,
+        file_data=file_data,
+        file_name=file_name,
+        picklist_id=picklist_id,
+        upload_dt=datetime.now(),
+    )
+
+    db.add(new_picklistfile)
+    await db.commit()
+
+    return new_picklistfile
+
+
+# endregion
+
+
+# region PicklistItemTR
+async def get_picklistitems_by_picklist_id(db: AsyncSession, picklist_id: int):
+    result = await db.scalars(
+        select(PicklistItem_TR).where(PicklistItem_TR.picklist_id == picklist_id)
+    )
+    return result.all()
+
+
+async def get_picklistitem_by_id(db: AsyncSession, picklistitem_id: int):
+    return await db.get(PicklistItem_TR, picklistitem_id)
+
+
+async def create_picklistitems_bulk(db: AsyncSession, items: list):
+    """Inserts the item dicts in one executemany and commits."""
+    await db.execute(insert(PicklistItem_TR), items)
+    await db.commit()
+
+
+async def copy_stock_id_by_picklistitem_object(
+    db: AsyncSession, picklistitem: PicklistItem_TR
+):
+    # Set-based, the matching items don't need to be loaded
+    await db.execute(
+        update(PicklistItem_TR)
+        .where(
+            PicklistItem_TR.ecom_code == picklistitem.ecom_code,
+            PicklistItem_TR.field1 == picklistitem.field1,
+            PicklistItem_TR.field2 == picklistitem.field2,
+            PicklistItem_TR.field3 == picklistitem.field3,
+            PicklistItem_TR.field4 == picklistitem.field4,
+            PicklistItem_TR.field5 == picklistitem.field5,
+            PicklistItem_TR.picklist_id == picklistitem.picklist_id,
+            PicklistItem_TR.id != picklistitem.id,
+        )
+        .values(stock_id=picklistitem.stock_id)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+# endregion
+
+
+# region StockTM
+async def get_stock_by_variant_ids(
+    db: AsyncSession, type_id: int, size_id: int, color_id: int
+):
+    result = await db.scalars(
+        select(Stock_TM)
+        .where(
+            Stock_TM.stock_type_id == type_id,
+            Stock_TM.stock_size_id == size_id,
+            Stock_TM.stock_color_id == color_id,
+        )
+        .limit(1)
+    )
+    return result.first()
+
+
+async def update_stock_quantities(db: AsyncSession, stock_counts: dict):
+    """
+    Subtracts the picked count from each stock. Does not commit.
+
+    Args:
+        stock_counts (dict): Count to subtract by stock ID.
+    """
+    for stock_id, count in stock_counts.items():
+        await db.execute(
+            update(Stock_TM)
+            .where(Stock_TM.id == stock_id)
+            .values(quantity=Stock_TM.quantity - count)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def create_stock(db: AsyncSession, type_id: int, size_id: int, color_id: int):
+    new_stock = Stock_TM(
+        stock_type_id=type_id,
+        stock_size_id=size_id,
+        stock_color_id=color_id,
+    )
+
+    db.add(new_stock)
+    await db.commit()
+
+    return new_stock
+
+
+# endregion
+
+
+# region StockReservationTR
+async def reserve_stock_by_picklist_id(db: AsyncSession, picklist_id: int):
+    """See `db_utils.reserve_stock_by_picklist_id`. Does not commit."""
+    # Same statements as the sync helper, run on the async connection
+    await db.run_sync(db_utils.reserve_stock_by_picklist_id, picklist_id)
+
+
+async def release_stock_reservation_by_picklist_id(db: AsyncSession, picklist_id: int):
+    """See `db_utils.release_stock_reservation_by_picklist_id`. Does not commit."""
+    await db.run_sync(db_utils.release_stock_reservation_by_picklist_id, picklist_id)
+
+
+# endregion
+
+
+# region StockTypeTR / StockSizeTR / StockColorTR
+async def get_stocktype_by_value(db: AsyncSession, type_value: str):
+    result = await db.scalars(
+        select(StockType_TR).where(StockType_TR.type_value == type_value).limit(1)
+    )
+    return result.first()
+
+
+async def get_stocksize_by_value(db: AsyncSession, size_value: str):
+    result = await db.scalars(
+        select(StockSize_TR).where(StockSize_TR.size_value == size_value).limit(1)
+    )
+    return result.first()
+
+
+async def get_stockcolor_by_name(db: AsyncSession, color_name: str):
+    result = await db.scalars(
+        select(StockColor_TR).where(StockColor_TR.color_name == color_name).limit(1)
+    )
+    return result.first()
+
+
+# endregion
+
+
+# region ProductMappingTR
+async def get_product_mapping_lookup(db: AsyncSession, ecom_code: str = None) -> dict:
+    """Returns stock IDs keyed by (field1, ..., field5), optionally for one ecom."""
+    query = select(
+        ProductMapping_TR.field1,
+        ProductMapping_TR.field2,
+        ProductMapping_TR.field3,
+        ProductMapping_TR.field4,
+        ProductMapping_TR.field5,
+        ProductMapping_TR.stock_id,
+    )
+    if ecom_code:
+        query = query.where(ProductMapping_TR.ecom_code == ecom_code)
+
+    result = await db.execute(query)
+    return {
+        (row.field1, row.field2, row.field3, row.field4, row.field5): row.stock_id
+        for row in result
+    }
+
+
+async def create_product_mapping(
+    db: AsyncSession, item: PicklistItem_TR, stock_id: int
+):
+    new_mapping = ProductMapping_TR(
+        ecom_code=item.ecom_code,
+        field1=item.field1,
+        field2=item.field2,
+        field3=item.field3,
+        field4=item.field4,
+        field5=item.field5,
+        stock_id=stock_id,
+    )
+
+    db.add(new_mapping)
+    await db.commit()
+
+    return new_mapping
+
+
+# endregion
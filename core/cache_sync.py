@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal, CacheVersion_TM
+
+logger = logging.getLogger(__name__)
+
+
+class CacheVersionWatcher:
+    """
+    Keeps in-memory caches of all workers in sync through cacheversion_tm.
+
+    A mutating endpoint calls `bump` in its transaction. Every worker polls the
+    version counters once per staleness window and calls the reload callback of
+    each cache whose version changed, so hot-path reads never hit the DB.
+    """
+
+    def __init__(self):
+        self._reloaders = {}
+        self._versions = {}
+
+    def register(self, cache_name: str, reload: Callable[[Session], None]):
+        self._reloaders.setdefault(cache_name, []).append(reload)
+
+    def bump(self, db: Session, cache_name: str):
+        """Increments the version of a cache. Does not commit."""
+        if db.get_bind().dialect.name == "mysql":
+            upsert = "ON DUPLICATE KEY UPDATE version = version + 1"
+        else:
+            # SQLite and PostgreSQL, e.g. for tests
+            upsert = "ON CONFLICT (cache_name) DO UPDATE SET version = version + 1"
+        db.execute(
+            text(
+                f"""
+                INSERT INTO cacheversion_tm (cache_name, version)
+                VALUES (:cache_name, 1)
+                {upsert}
+            """
+            ),
+            {"cache_name": cache_name},
+        )
+
+    def poll(self, db: Session):
+        """Reloads every registered cache whose version changed since the last poll."""
+        rows = (
+            db.query(CacheVersion_TM.cache_name, CacheVersion_TM.version)
+            .filter(CacheVersion_TM.cache_name.in_(list(self._reloaders)))
+            .all()
+        )
+        for cache_name, version in rows:
+            if self._versions.get(cache_name) == version:
+                continue
+            self._versions[cache_name] = version
+            for reload in self._reloaders[cache_name]:
+                reload(db)
+
+    def poll_once(self):
+        db = SessionLocal()
+        try:
+            self.poll(db)
+        finally:
+            db.close()
+
+    async def run(self, interval_sec: float):
+        """Reloads the changed caches every `interval_sec` until cancelled."""
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                await run_in_threadpool(self.poll_once)
+            except Exception:
+                logger.exception("Cache version poll failed")
+
+
+cache_versions = CacheVersionWatcher()
@@ -31,6 +31,18 @@ class PicklistItemTRIsExcluded(IntEnum):
     EXCLUDED = 1
 
 
+class InboundTMStatus(StrEnum):
+    PENDING = "PENDING"
+    COMPLETED = "COMPLETED"
+
+
+class CacheVersionTMName(StrEnum):
+    MASTER_PARAMETER = "MASTER_PARAMETER"
+    INBOUND_SCHEDULE = "INBOUND_SCHEDULE"
+    USER_STATUS = "USER_STATUS"
+    STOCK_INDEX = "STOCK_INDEX"
+
+
 class AuditLog:
     class Menu(StrEnum):
         PICKLIST = "PICKLIST"
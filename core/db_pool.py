@@ -0,0 +1,70 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from core.metrics import registry
+
+checkout_seconds = registry.histogram(
+    "wms_db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waiting for a free one.",
+    ("engine",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+checkout_timeouts = registry.counter(
+    "wms_db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after the pool timeout (QueuePool limit reached).",
+    ("engine",),
+)
+pool_size = registry.gauge("wms_db_pool_size", "Configured pool size.", ("engine",))
+pool_checked_out = registry.gauge(
+    "wms_db_pool_checked_out", "Connections currently checked out.", ("engine",)
+)
+pool_overflow = registry.gauge(
+    "wms_db_pool_overflow", "Connections open beyond the pool size.", ("engine",)
+)
+pool_idle = registry.gauge(
+    "wms_db_pool_idle", "Idle connections in the pool.", ("engine",)
+)
+
+
+class _CheckoutTimingMixin:
+    """Records checkout latency and timeouts, labelled with `engine_label`."""
+
+    engine_label = None
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            checkout_timeouts.inc(engine=self.engine_label)
+            raise
+        finally:
+            checkout_seconds.observe(
+                time.perf_counter() - started_at, engine=self.engine_label
+            )
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    engine_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+def observe_pool(engine, label: str):
+    """Publishes the pool gauges of an engine on every metrics scrape."""
+
+    def collect():
+        # Read engine.pool each time, dispose() replaces it
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            return
+        pool_size.set(pool.size(), engine=label)
+        pool_checked_out.set(pool.checkedout(), engine=label)
+        pool_overflow.set(max(pool.overflow(), 0), engine=label)
+        pool_idle.set(pool.checkedin(), engine=label)
+
+    registry.add_collector(collect)
@@ -1,6 +1,14 @@
 from sqlalchemy.orm import Session
-from core.db_enums import PicklistTMStatus, StockTMIsActive
+from core.db_enums import (
+    PicklistTMStatus,
+    StockTMIsActive,
+    PicklistItemTRIsExcluded,
+    InboundTMStatus,
+    UserTMStatus,
+)
 from database import (
+    User_TM,
+    Role_TM,
     Picklist_TM,
     PicklistFile_TR,
     PicklistItem_TR,
@@ -9,10 +17,48 @@ from database import (
     StockSize_TR,
     StockColor_TR,
     ProductMapping_TR,
+    StockReservation_TR,
+    Inbound_TM,
+    InboundItems_TR,
+    InboundSchedule_TM,
 )
 
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import func, text, insert, select, tuple_, update
+from core.sql_functions import format_datetime
+from core.user_status import user_status
+
+
+# region UserTM
+def get_user_by_id(db: Session, user_id: int):
+    return db.query(User_TM).filter(User_TM.id == user_id).first()
+
+
+def get_user_by_username(db: Session, username: str):
+    return db.query(User_TM).filter(User_TM.username == username).first()
+
+
+def get_role_by_name(db: Session, role_name: str):
+    return db.query(Role_TM).filter(Role_TM.role_name == role_name).first()
+
+
+def create_user(db: Session, username: str, hashed_password: bytes, role_id: int):
+    new_user = User_TM(
+        username=username,
+        password=hashed_password,
+        role_id=role_id,
+        created_dt=datetime.now(),
+        is_active=UserTMStatus.ACTIVE,
+    )
+    db.add(new_user)
+    user_status.notify_changed(db)
+    db.commit()
+    db.refresh(new_user)
+    user_status.put_user(new_user)
+    return new_user
+
+
+# endregion
 
 
 # region PicklistTM
@@ -299,6 +345,104 @@ def create_stock(db: Session, type_id: int, size_id: int, color_id: int):
     return new_stock
 
 
+def get_existing_stock_variant_keys(
+    db: Session, type_ids: list, size_ids: list, color_ids: list
+) -> set:
+    """Returns the (type_id, size_id, color_id) keys that already have a stock."""
+    rows = (
+        db.query(
+            Stock_TM.stock_type_id, Stock_TM.stock_size_id, Stock_TM.stock_color_id
+        )
+        .filter(
+            Stock_TM.stock_type_id.in_(type_ids),
+            Stock_TM.stock_size_id.in_(size_ids),
+            Stock_TM.stock_color_id.in_(color_ids),
+        )
+        .all()
+    )
+    return {tuple(row) for row in rows}
+
+
+def get_stock_ids_by_variant_keys(db: Session, variant_keys: list) -> dict:
+    """
+    Resolves (type_id, color_id, size_id) keys to stock IDs in one query.
+
+    Returns:
+        dict: Stock ID per key, keys without a stock are left out.
+    """
+    if not variant_keys:
+        return {}
+
+    rows = (
+        db.query(
+            Stock_TM.id,
+            Stock_TM.stock_type_id,
+            Stock_TM.stock_color_id,
+            Stock_TM.stock_size_id,
+        )
+        .filter(
+            tuple_(
+                Stock_TM.stock_type_id, Stock_TM.stock_color_id, Stock_TM.stock_size_id
+            ).in_(variant_keys)
+        )
+        .all()
+    )
+    return {
+        (row.stock_type_id, row.stock_color_id, row.stock_size_id): row.id
+        for row in rows
+    }
+
+
+def create_stocks_bulk(db: Session, variant_keys: list):
+    """Inserts one stock per (type_id, size_id, color_id) key in a single batch."""
+    if not variant_keys:
+        return
+
+    db.execute(
+        insert(Stock_TM),
+        [
+            {
+                "stock_type_id": type_id,
+                "stock_size_id": size_id,
+                "stock_color_id": color_id,
+            }
+            for type_id, size_id, color_id in variant_keys
+        ],
+    )
+    db.commit()
+
+
+def get_stock_availability_by_stock_id(db: Session, stock_id: int):
+    return (
+        db.query(
+            Stock_TM.id.label("stock_id"),
+            Stock_TM.quantity,
+            Stock_TM.reserved_quantity,
+            (Stock_TM.quantity - Stock_TM.reserved_quantity).label(
+                "available_quantity"
+            ),
+        )
+        .filter(Stock_TM.id == stock_id)
+        .first()
+    )
+
+
+def get_all_stock_availability(db: Session):
+    return (
+        db.query(
+            Stock_TM.id.label("stock_id"),
+            Stock_TM.quantity,
+            Stock_TM.reserved_quantity,
+            (Stock_TM.quantity - Stock_TM.reserved_quantity).label(
+                "available_quantity"
+            ),
+        )
+        .filter(Stock_TM.is_active == StockTMIsActive.ACTIVE)
+        .order_by(Stock_TM.id.asc())
+        .all()
+    )
+
+
 def get_all_stocks_from_view(db: Session):
     query = text(
         """
@@ -312,11 +456,84 @@ def get_all_stocks_from_view(db: Session):
 # endregion
 
 
+# region StockReservationTR
+def _apply_stock_reservation(db: Session, picklist_id: int, sign: int):
+    """Adds (sign=1) or subtracts (sign=-1) the picklist's reservations to its stocks."""
+    # Correlated subquery rather than UPDATE ... JOIN, which only MySQL supports
+    reserved = (
+        select(StockReservation_TR.quantity)
+        .where(
+            StockReservation_TR.picklist_id == picklist_id,
+            StockReservation_TR.stock_id == Stock_TM.id,
+        )
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Stock_TM)
+        .where(
+            Stock_TM.id.in_(
+                select(StockReservation_TR.stock_id).where(
+                    StockReservation_TR.picklist_id == picklist_id
+                )
+            )
+        )
+        .values(reserved_quantity=Stock_TM.reserved_quantity + sign * reserved)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reserve_stock_by_picklist_id(db: Session, picklist_id: int):
+    """
+    Reserves stock for every included and mapped item of the picklist.
+
+    One reservation row is written per stock, and `stock_tm.reserved_quantity`
+    is incremented in a single set-based UPDATE. Does not commit, so the caller
+    can apply it in the same transaction as the picklist status change.
+    """
+    db.execute(
+        text(
+            """
+            INSERT INTO stockreservation_tr (picklist_id, stock_id, quantity)
+            SELECT picklist_id, stock_id, COUNT(*)
+            FROM picklistitem_tr
+            WHERE picklist_id = :picklist_id
+              AND is_excluded = :included
+              AND stock_id IS NOT NULL
+            GROUP BY picklist_id, stock_id
+        """
+        ),
+        {"picklist_id": picklist_id, "included": PicklistItemTRIsExcluded.INCLUDED},
+    )
+    _apply_stock_reservation(db, picklist_id, sign=1)
+
+
+def release_stock_reservation_by_picklist_id(db: Session, picklist_id: int):
+    """
+    Releases whatever the picklist reserved in `reserve_stock_by_picklist_id`.
+    Safe to call for picklists without reservations. Does not commit.
+    """
+    _apply_stock_reservation(db, picklist_id, sign=-1)
+    db.query(StockReservation_TR).filter(
+        StockReservation_TR.picklist_id == picklist_id
+    ).delete(synchronize_session=False)
+
+
+# endregion
+
+
 # region StockTypeTR
 def get_stocktype_by_value(db: Session, type_value: str):
     return db.query(StockType_TR).filter(StockType_TR.type_value == type_value).first()
 
 
+def get_stocktypes_by_ids(db: Session, type_ids: list):
+    return db.query(StockType_TR).filter(StockType_TR.id.in_(type_ids)).all()
+
+
+def get_stocktypes_by_names(db: Session, type_names: list):
+    return db.query(StockType_TR).filter(StockType_TR.type_name.in_(type_names)).all()
+
+
 def create_stocktype(db: Session, type_value: str, type_name: str):
     new_stocktype = StockType_TR(
         type_value=type_value,
@@ -338,6 +555,14 @@ def get_stocksize_by_value(db: Session, size_value: str):
     return db.query(StockSize_TR).filter(StockSize_TR.size_value == size_value).first()
 
 
+def get_stocksizes_by_ids(db: Session, size_ids: list):
+    return db.query(StockSize_TR).filter(StockSize_TR.id.in_(size_ids)).all()
+
+
+def get_stocksizes_by_names(db: Session, size_names: list):
+    return db.query(StockSize_TR).filter(StockSize_TR.size_name.in_(size_names)).all()
+
+
 def create_stocksize(db: Session, size_value: str, size_name: str):
     new_stocksize = StockSize_TR(
         size_value=size_value,
@@ -361,6 +586,16 @@ def get_stockcolor_by_name(db: Session, color_name: str):
     )
 
 
+def get_stockcolors_by_ids(db: Session, color_ids: list):
+    return db.query(StockColor_TR).filter(StockColor_TR.id.in_(color_ids)).all()
+
+
+def get_stockcolors_by_names(db: Session, color_names: list):
+    return (
+        db.query(StockColor_TR).filter(StockColor_TR.color_name.in_(color_names)).all()
+    )
+
+
 def create_stockcolor(db: Session, color_name: str, color_hex: str):
     new_stockcolor = StockColor_TR(
         color_name=color_name,
@@ -441,3 +676,179 @@ def delete_product_mapping_by_id(db: Session, mapping_id: int) -> bool:
 
 
 # endregion
+
+
+# region InboundTM
+def get_inbound_detail_by_id(db: Session, inbound_id: int):
+    return (
+        db.query(
+            Inbound_TM.id,
+            Inbound_TM.status,
+            Inbound_TM.supplier_name,
+            Inbound_TM.notes,
+            format_datetime(Inbound_TM.created_at).label("created_at"),
+            format_datetime(Inbound_TM.updated_at).label("updated_at"),
+            Inbound_TM.user_id,
+            Inbound_TM.item_count,
+            Inbound_TM.total_quantity,
+        )
+        .filter(Inbound_TM.id == inbound_id)
+        .first()
+    )
+
+
+def get_inbound_items_by_inbound_id(
+    db: Session, inbound_id: int, page: int = 1, size: int = None
+):
+    """
+    Returns the inbound items with their variant names, one page if `size` is
+    given, otherwise all of them. Timestamps are formatted by the database.
+    """
+    query = (
+        db.query(
+            InboundItems_TR.id,
+            InboundItems_TR.stock_id,
+            Stock_TM.stock_type_id.label("type_id"),
+            StockType_TR.type_name,
+            Stock_TM.stock_color_id.label("color_id"),
+            StockColor_TR.color_name,
+            Stock_TM.stock_size_id.label("size_id"),
+            StockSize_TR.size_name,
+            InboundItems_TR.add_quantity,
+            format_datetime(InboundItems_TR.created_at).label("created_at"),
+            format_datetime(InboundItems_TR.updated_at).label("updated_at"),
+        )
+        .join(Stock_TM, InboundItems_TR.stock_id == Stock_TM.id)
+        .join(StockType_TR, Stock_TM.stock_type_id == StockType_TR.id)
+        .join(StockColor_TR, Stock_TM.stock_color_id == StockColor_TR.id)
+        .join(StockSize_TR, Stock_TM.stock_size_id == StockSize_TR.id)
+        .filter(InboundItems_TR.inbound_id == inbound_id)
+        .order_by(InboundItems_TR.id.asc())
+    )
+    if size:
+        query = query.offset((page - 1) * size).limit(size)
+    return query.all()
+
+
+def get_inbound_item_missing_stock_id(db: Session, inbound_id: int):
+    """Returns the stock ID of an inbound item whose stock doesn't exist, if any."""
+    row = (
+        db.query(InboundItems_TR.stock_id)
+        .outerjoin(Stock_TM, InboundItems_TR.stock_id == Stock_TM.id)
+        .filter(InboundItems_TR.inbound_id == inbound_id, Stock_TM.id.is_(None))
+        .first()
+    )
+    return row.stock_id if row else None
+
+
+def create_inbound_items_bulk(db: Session, inbound_id: int, quantities: dict):
+    """
+    Inserts one inbound item per stock in a single batched INSERT. Does not commit.
+
+    Args:
+        quantities (dict): Quantity to add per stock ID.
+    """
+    if not quantities:
+        return
+
+    db.execute(
+        insert(InboundItems_TR),
+        [
+            {"inbound_id": inbound_id, "stock_id": stock_id, "add_quantity": quantity}
+            for stock_id, quantity in quantities.items()
+        ],
+    )
+
+
+def adjust_inbound_summary(
+    db: Session, inbound_id: int, item_delta: int, quantity_delta: int
+):
+    """Shifts the precomputed item count and total quantity. Does not commit."""
+    db.execute(
+        text(
+            """
+            UPDATE inbound_tm
+            SET item_count = item_count + :item_delta,
+                total_quantity = total_quantity + :quantity_delta
+            WHERE id = :inbound_id
+        """
+        ),
+        {
+            "inbound_id": inbound_id,
+            "item_delta": item_delta,
+            "quantity_delta": quantity_delta,
+        },
+    )
+
+
+def complete_inbound_by_id(db: Session, inbound_id: int, submit_key: str = None):
+    """
+    Adds the inbound items to stock and sets the inbound to COMPLETED.
+
+    The status is flipped first, guarded by `status = PENDING`. The UPDATE locks
+    the inbound row, so of two racing submits only one matches and the other
+    waits, then finds it COMPLETED. Items are then summed per stock and applied
+    in one set-based UPDATE. Does not commit.
+
+    Returns:
+        bool: False if the inbound was not PENDING or has no items.
+    """
+    has_items = (
+        select(InboundItems_TR.id)
+        .where(InboundItems_TR.inbound_id == inbound_id)
+        .exists()
+    )
+    result = db.execute(
+        update(Inbound_TM)
+        .where(
+            Inbound_TM.id == inbound_id,
+            Inbound_TM.status == InboundTMStatus.PENDING,
+            has_items,
+        )
+        .values(status=InboundTMStatus.COMPLETED, submit_key=submit_key)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return False
+
+    added = (
+        select(func.sum(InboundItems_TR.add_quantity))
+        .where(
+            InboundItems_TR.inbound_id == inbound_id,
+            InboundItems_TR.stock_id == Stock_TM.id,
+        )
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Stock_TM)
+        .where(
+            Stock_TM.id.in_(
+                select(InboundItems_TR.stock_id).where(
+                    InboundItems_TR.inbound_id == inbound_id
+                )
+            )
+        )
+        .values(quantity=Stock_TM.quantity + added)
+        .execution_options(synchronize_session=False)
+    )
+    return True
+
+
+# endregion
+
+
+# region InboundScheduleTM
+def get_inbound_schedules_by_date_range(db: Session, date_from, date_to):
+    """Returns the schedules between both dates (inclusive), ordered by date."""
+    return (
+        db.query(InboundSchedule_TM)
+        .filter(
+            InboundSchedule_TM.schedule_date >= date_from,
+            InboundSchedule_TM.schedule_date <= date_to,
+        )
+        .order_by(InboundSchedule_TM.schedule_date.asc(), InboundSchedule_TM.id.asc())
+        .all()
+    )
+
+
+# endregion
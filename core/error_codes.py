@@ -6,8 +6,10 @@ class ErrCode(Enum):
     AUT_SUP_E02 = "Role '{}' does not exist (AUT_SUP_E02)"
     AUT_SUP_E03 = "Username must start with a letter, be at least 3 characters long, and may only contain alphanumeric characters and dots (AUT_SUP_E03)"
     AUT_SUP_E04 = "Password must be at least 4 characters long (AUT_SUP_E04)"
+    AUT_SUP_E05 = "Too many signup attempts, retry in {} seconds (AUT_SUP_E05)"
     AUT_SIN_E01 = "Username does not exist (AUT_SIN_E01)"
     AUT_SIN_E02 = "Incorrect password (AUT_SIN_E02)"
+    AUT_SIN_E03 = "Too many login attempts, retry in {} seconds (AUT_SIN_E03)"
     AUT_REF_E01 = "Username does not exist (AUT_REF_E01)"
     AUT_REF_E02 = "User has been disabled (AUT_REF_E02)"
 
@@ -41,6 +43,16 @@ class ErrCode(Enum):
     STO_NTY_E02 = "Type '{}' already exists (STO_NTY_E02)"
     STO_NCO_E01 = "Invalid color format (STO_NCO_E01)"
     STO_NCO_E02 = "Color '{}' already exists (STO_NCO_E02)"
+    STO_BLK_E01 = "Type/size/color lists must not be empty (STO_BLK_E01)"
+    STO_BLK_E02 = "{} combinations requested. Maximum is {} (STO_BLK_E02)"
+    STO_BLK_E03 = "Unknown {} ID(s): {} (STO_BLK_E03)"
+    STO_BLK_E04 = "Unknown {} name(s): {} (STO_BLK_E04)"
+    STO_BLK_E05 = "Invalid header for '{}' in bulk stock file. Expected: '{}' at index {}, Got: '{}' (STO_BLK_E05)"
+
+    INB_IMP_E01 = (
+        "Invalid inbound sheet layout: {}. Supported layouts are {} (INB_IMP_E01)"
+    )
+    INB_IMP_E02 = "Invalid header in inbound sheet layout '{}' for '{}'. Expected: '{}' at index {}, Got: '{}' (INB_IMP_E02)"
 
     @classmethod
     def format_error(cls, code, *args) -> dict:
@@ -0,0 +1,73 @@
+import threading
+from datetime import date
+from enum import StrEnum
+
+from sqlalchemy.orm import Session
+
+from core.cache_sync import cache_versions
+from core.db_enums import CacheVersionTMName
+from core.param_service import param_service
+from database import InboundSchedule_TM
+
+
+class InboundGateState(StrEnum):
+    ALLOWED = "ALLOWED"
+    NOT_CONFIGURED = "NOT_CONFIGURED"  # inbound_active parameter is missing
+    NOT_SCHEDULED = "NOT_SCHEDULED"  # inbound_active is on, no schedule today
+
+
+class InboundGate:
+    """
+    Caches whether inbounds may be created today.
+
+    The decision depends on the `inbound_active` parameter and on today's
+    schedules. It is cached per day and invalidated when either changes, in
+    this worker right away and in the others through cache version polling.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        # (day, state), swapped atomically
+        self._decision = None
+
+    def invalidate(self, db: Session = None):
+        self._generation += 1
+        self._decision = None
+
+    def get_state(self, db: Session) -> InboundGateState:
+        today = date.today()
+        decision = self._decision
+        if decision and decision[0] == today:
+            return decision[1]
+
+        with self._lock:
+            generation = self._generation
+            state = self._compute(db, today)
+            # Don't cache a decision that was invalidated while computing it
+            if generation == self._generation:
+                self._decision = (today, state)
+        return state
+
+    def _compute(self, db: Session, today: date) -> InboundGateState:
+        inbound_active = param_service.get_int("inbound_active")
+        if inbound_active is None:
+            return InboundGateState.NOT_CONFIGURED
+
+        if inbound_active != 1:
+            return InboundGateState.ALLOWED
+
+        schedule = (
+            db.query(InboundSchedule_TM.id)
+            .filter(
+                InboundSchedule_TM.schedule_date == today,
+                InboundSchedule_TM.is_active == 1,
+            )
+            .first()
+        )
+        return InboundGateState.ALLOWED if schedule else InboundGateState.NOT_SCHEDULED
+
+
+inbound_gate = InboundGate()
+param_service.add_listener(inbound_gate.invalidate)
+cache_versions.register(CacheVersionTMName.INBOUND_SCHEDULE, inbound_gate.invalidate)
@@ -0,0 +1,66 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi_jwt_auth import AuthJWT
+
+from constant import JWT_CLAIMS_CACHE_SIZE
+
+
+class _ClaimsCache:
+    """Bounded LRU of verified JWT claims, entries expire with their token."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, key: tuple, expires_at: float, claims: dict):
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+claims_cache = _ClaimsCache(JWT_CLAIMS_CACHE_SIZE)
+
+
+class CachedAuthJWT(AuthJWT):
+    """
+    AuthJWT that verifies each token's signature once per worker.
+
+    A single `jwt_required()` plus `get_raw_jwt()` decodes the same token several
+    times, and clients reuse a token for its whole lifetime. Verified claims are
+    kept in `claims_cache`, keyed by the token digest, until the token's `exp`.
+    Only successfully verified tokens are cached, and the denylist check still
+    runs on every request.
+    """
+
+    def _verified_token(self, encoded_token: str, issuer: Optional[str] = None):
+        key = (hashlib.sha256(encoded_token.encode("utf-8")).digest(), issuer)
+        claims = claims_cache.get(key)
+        if claims is None:
+            claims = super()._verified_token(encoded_token, issuer)
+            # Tokens without expiry are never cached
+            if "exp" in claims:
+                claims_cache.put(key, claims["exp"], claims)
+        return dict(claims)
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Buffers user last-login timestamps and writes them in batches.
+
+    Login only records the timestamp in memory; a background task of each worker
+    flushes the buffer every `LAST_LOGIN_FLUSH_SEC` and once more at shutdown, in
+    a single UPDATE batch. Only the latest login per user is kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def record(self, user_id: int, login_dt: datetime = None):
+        with self._lock:
+            self._pending[user_id] = login_dt or datetime.now()
+
+    def flush(self, db: Session) -> int:
+        """Writes the buffered timestamps and commits. Returns the number of users."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            db.execute(
+                text("UPDATE user_tm SET last_login_dt = :login_dt WHERE id = :id"),
+                [
+                    {"id": user_id, "login_dt": login_dt}
+                    for user_id, login_dt in pending.items()
+                ],
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put them back unless a newer login was recorded meanwhile
+            with self._lock:
+                for user_id, login_dt in pending.items():
+                    self._pending.setdefault(user_id, login_dt)
+            raise
+        return len(pending)
+
+    def flush_once(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    async def run(self, interval_sec: float):
+        """Flushes the buffer every `interval_sec` until cancelled."""
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                await run_in_threadpool(self.flush_once)
+            except Exception:
+                logger.exception("Last login flush failed")
+
+
+last_logins = LastLoginBuffer()
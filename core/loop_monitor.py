@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from constant import LOOP_MONITOR
+from core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+lag_seconds = registry.histogram(
+    "wms_event_loop_lag_seconds",
+    "Delay of the event loop in running a callback that was due.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+blocked_total = registry.counter(
+    "wms_event_loop_blocked_total",
+    "Times the event loop was blocked longer than the threshold, by endpoint.",
+    ("endpoint",),
+)
+
+
+def _endpoint_name(scope: dict) -> str:
+    # The router stores the matched endpoint in the request scope
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    return f"{endpoint.__module__}.{endpoint.__name__}"
+
+
+class EventLoopMonitor:
+    """
+    Samples event loop lag and reports what blocked the loop.
+
+    A task sleeps `interval_sec` in a loop and records how late it wakes up. A
+    watchdog thread checks that the task keeps waking up; once the loop has been
+    stuck for `block_threshold_sec`, it logs the stack of the loop thread and the
+    request whose task is running, so the blocking call can be found.
+    `RequestTaskMiddleware` keeps track of which task serves which request.
+    """
+
+    def __init__(self, interval_sec: float, block_threshold_sec: float):
+        self.interval_sec = interval_sec
+        self.block_threshold_sec = block_threshold_sec
+        self._loop = None
+        self._loop_thread_id = None
+        self._heartbeat = None
+        self._stopped = threading.Event()
+        # Request scope by task, only written on the event loop
+        self._scopes = {}
+
+    def track(self, task, scope: dict):
+        self._scopes[task] = scope
+
+    def untrack(self, task):
+        self._scopes.pop(task, None)
+
+    async def run(self):
+        """Samples the loop lag until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        threading.Thread(target=self._watch, name="loop-monitor", daemon=True).start()
+
+        try:
+            while True:
+                scheduled_at = time.monotonic()
+                await asyncio.sleep(self.interval_sec)
+                now = time.monotonic()
+                lag_seconds.observe(max(now - scheduled_at - self.interval_sec, 0))
+                self._heartbeat = now
+        finally:
+            self._stopped.set()
+
+    def _watch(self):
+        reported = None  # Heartbeat of the last stall reported, once per stall
+        check_sec = min(self.interval_sec, self.block_threshold_sec) / 2
+        while not self._stopped.wait(check_sec):
+            heartbeat = self._heartbeat
+            blocked_sec = time.monotonic() - heartbeat - self.interval_sec
+            if blocked_sec >= self.block_threshold_sec and heartbeat != reported:
+                reported = heartbeat
+                self._report(blocked_sec)
+
+    def _report(self, blocked_sec: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        # Safe from this thread, it only reads the loop's current task
+        scope = self._scopes.get(asyncio.current_task(self._loop))
+
+        if scope is None:
+            request = "outside of a request"
+            endpoint = "none"
+        else:
+            request = f'{scope["method"]} {scope["path"]}'
+            endpoint = _endpoint_name(scope)
+
+        blocked_total.inc(endpoint=endpoint)
+        logger.warning(
+            "Event loop blocked for %.3fs by %s (%s), stack:\n%s",
+            blocked_sec,
+            request,
+            endpoint,
+            stack,
+        )
+
+
+class RequestTaskMiddleware:
+    """
+    Pure ASGI middleware recording the task that serves each HTTP request.
+
+    Unlike `BaseHTTPMiddleware` it runs the app in the same task, which is the
+    one the monitor sees running when the loop is blocked.
+    """
+
+    def __init__(self, app, monitor: EventLoopMonitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        task = asyncio.current_task()
+        # The router adds the matched endpoint to this same scope dict later on
+        self.monitor.track(task, scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.untrack(task)
+
+
+loop_monitor = EventLoopMonitor(
+    LOOP_MONITOR["interval_sec"], LOOP_MONITOR["block_threshold_sec"]
+)
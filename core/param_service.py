@@ -0,0 +1,78 @@
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from core.cache_sync import cache_versions
+from core.db_enums import CacheVersionTMName
+from database import SessionLocal, MasterParameter_TM
+
+
+class ParameterService:
+    """
+    In-memory copy of master_parameter_tm.
+
+    All parameters are loaded on first use and reloaded when the
+    MASTER_PARAMETER cache version changes, so reads cost no DB round trip.
+    Writes go through `set_int`, which bumps the version for the other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._parameters = None
+        self._listeners = []
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Registers a callback run after every reload, e.g. to drop derived caches."""
+        self._listeners.append(callback)
+
+    def load(self, db: Session):
+        rows = db.query(*MasterParameter_TM.__table__.columns).all()
+        self._parameters = {row.parameter_name: dict(row._mapping) for row in rows}
+        for callback in self._listeners:
+            callback()
+
+    def _ensure_loaded(self):
+        if self._parameters is not None:
+            return
+        with self._lock:
+            if self._parameters is None:
+                db = SessionLocal()
+                try:
+                    self.load(db)
+                finally:
+                    db.close()
+
+    def get(self, name: str) -> Optional[dict]:
+        """Returns all columns of a parameter, or None if it doesn't exist."""
+        self._ensure_loaded()
+        return self._parameters.get(name)
+
+    def get_int(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        parameter = self.get(name)
+        return parameter["parameter_value_int"] if parameter else default
+
+    def set_int(self, db: Session, name: str, value: int) -> bool:
+        """
+        Updates an integer parameter, commits and notifies the other workers.
+
+        Returns:
+            bool: False if the parameter doesn't exist.
+        """
+        updated = (
+            db.query(MasterParameter_TM)
+            .filter(MasterParameter_TM.parameter_name == name)
+            .update({MasterParameter_TM.parameter_value_int: value})
+        )
+        if not updated:
+            db.rollback()
+            return False
+
+        cache_versions.bump(db, CacheVersionTMName.MASTER_PARAMETER)
+        db.commit()
+        self.load(db)
+        return True
+
+
+param_service = ParameterService()
+cache_versions.register(CacheVersionTMName.MASTER_PARAMETER, param_service.load)
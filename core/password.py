@@ -0,0 +1,92 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from constant import PASSWORD_HASH
+from core.metrics import registry
+
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+queue_seconds = registry.histogram(
+    "wms_password_hash_queue_seconds",
+    "Time a password hash waited for a free hashing thread.",
+    ("operation",),
+    HASH_BUCKETS,
+)
+hash_seconds = registry.histogram(
+    "wms_password_hash_seconds",
+    "Time spent computing a password hash.",
+    ("operation",),
+    HASH_BUCKETS,
+)
+pending_hashes = registry.gauge(
+    "wms_password_hash_pending",
+    "Password hashes queued or running.",
+)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own bounded thread pool.
+
+    bcrypt is CPU bound and slow on purpose. Running it on Starlette's shared
+    threadpool lets a burst of logins starve every other sync endpoint, so the
+    hashes queue here instead, on at most `PASSWORD_HASH["max_workers"]` threads.
+    """
+
+    def __init__(self, max_workers: int, rounds: int):
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+
+    async def _run(self, operation: str, func, *args):
+        submitted_at = time.perf_counter()
+
+        def timed():
+            started_at = time.perf_counter()
+            queue_seconds.observe(started_at - submitted_at, operation=operation)
+            try:
+                return func(*args)
+            finally:
+                hash_seconds.observe(
+                    time.perf_counter() - started_at, operation=operation
+                )
+
+        pending_hashes.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, timed)
+        finally:
+            pending_hashes.dec()
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run(
+            "hash",
+            bcrypt.hashpw,
+            password.encode("utf-8"),
+            bcrypt.gensalt(rounds=self.rounds),
+        )
+
+    async def verify(self, password: str, hashed) -> bool:
+        hashed = hashed if isinstance(hashed, bytes) else hashed.encode("utf-8")
+        return await self._run(
+            "verify", bcrypt.checkpw, password.encode("utf-8"), hashed
+        )
+
+    def needs_rehash(self, hashed) -> bool:
+        """True if the hash was made with a different cost than the configured one."""
+        hashed = hashed if isinstance(hashed, bytes) else hashed.encode("utf-8")
+        # Hashes look like b"$2b$12$<salt+hash>", the cost is the second field
+        try:
+            return int(hashed.split(b"$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH["max_workers"], PASSWORD_HASH["rounds"])
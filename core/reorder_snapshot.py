@@ -0,0 +1,35 @@
+import json
+import os
+
+from constant import REORDER_SNAPSHOT_PATH
+
+# Reading and writing the snapshot of core/analytics.py. Kept apart from it so
+# the API workers serve the snapshot without importing numpy.
+
+_snapshot_cache = {"mtime": None, "data": None}
+
+
+def write_reorder_snapshot(snapshot: dict):
+    # Write to a temp file first so readers never see a half-written snapshot
+    tmp_path = f"{REORDER_SNAPSHOT_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, REORDER_SNAPSHOT_PATH)
+
+
+def load_reorder_snapshot():
+    """
+    Returns the latest reorder snapshot, or None if it was never generated.
+    The parsed file is kept in memory until the snapshot file changes.
+    """
+    try:
+        mtime = os.stat(REORDER_SNAPSHOT_PATH).st_mtime
+    except FileNotFoundError:
+        return None
+
+    if _snapshot_cache["mtime"] != mtime:
+        with open(REORDER_SNAPSHOT_PATH) as f:
+            _snapshot_cache["data"] = json.load(f)
+        _snapshot_cache["mtime"] = mtime
+
+    return _snapshot_cache["data"]
@@ -0,0 +1,139 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from core.metrics import registry
+
+request_seconds = registry.histogram(
+    "wms_http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    ("method", "route", "status"),
+)
+request_db_queries = registry.histogram(
+    "wms_http_request_db_queries",
+    "SQL statements executed while serving a request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+request_db_seconds = registry.histogram(
+    "wms_http_request_db_seconds",
+    "Time spent executing SQL statements while serving a request.",
+    ("method", "route"),
+)
+db_queries = registry.counter(
+    "wms_db_queries_total", "SQL statements executed, by engine.", ("engine",)
+)
+db_seconds = registry.counter(
+    "wms_db_query_seconds_total",
+    "Time spent executing SQL statements, by engine.",
+    ("engine",),
+)
+
+
+class _QueryStats:
+    __slots__ = ("scope", "count", "seconds")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Stats of the request being served. The object is shared, not copied, with the
+# threadpool threads and the greenlets of the async engine serving it.
+_current_stats: ContextVar[Optional[_QueryStats]] = ContextVar(
+    "wms_request_query_stats", default=None
+)
+
+
+def instrument_queries(engine, label: str):
+    """Counts the statements of an engine and their time, per request and in total."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, params, context, executemany):
+        context._wms_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, params, context, executemany):
+        elapsed = time.perf_counter() - context._wms_started_at
+        db_queries.inc(engine=label)
+        db_seconds.inc(elapsed, engine=label)
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+
+
+# Route template by endpoint function, filled on first use
+_route_paths = {}
+
+
+def _route_template(scope: dict) -> str:
+    # Label by template, not by path, so IDs don't create a series each
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+
+    path = _route_paths.get(endpoint)
+    if path is None:
+        path = next(
+            (
+                route.path
+                for route in scope["router"].routes
+                if getattr(route, "endpoint", None) is endpoint
+            ),
+            "unmatched",
+        )
+        _route_paths[endpoint] = path
+    return path
+
+
+def current_route() -> Optional[str]:
+    """Method and route template of the request being served, if any."""
+    stats = _current_stats.get()
+    if stats is None:
+        return None
+    return f'{stats.scope["method"]} {_route_template(stats.scope)}'
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency and SQL statements per request.
+
+    Statements are counted by the engine events of `instrument_queries`, so an
+    endpoint issuing one query per item shows up as a jump in
+    `wms_http_request_db_queries` for its route.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = _QueryStats(scope)
+        token = _current_stats.set(stats)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            _current_stats.reset(token)
+
+            method = scope["method"]
+            route = _route_template(scope)
+            request_seconds.observe(elapsed, method=method, route=route, status=status)
+            request_db_queries.observe(stats.count, method=method, route=route)
+            request_db_seconds.observe(stats.seconds, method=method, route=route)
@@ -0,0 +1,197 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+from constant import SLOW_QUERY
+from core.metrics import registry
+from core.request_metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+slow_queries = registry.counter(
+    "wms_db_slow_queries_total",
+    "Statements slower than the slow query threshold, by engine.",
+    ("engine",),
+)
+
+# Parameters named like these are never written to the log
+_SENSITIVE_PARAM = re.compile(r"pass|secret|token|jti|hash", re.IGNORECASE)
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE|INSERT|REPLACE)\b", re.I)
+_MAX_VALUE_CHARS = 100
+
+
+def _redact_value(value):
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > _MAX_VALUE_CHARS:
+        return value[:_MAX_VALUE_CHARS] + "..."
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def redact_params(params):
+    """Copy of DBAPI parameters that is safe to log."""
+    if isinstance(params, dict):
+        return {
+            key: "***" if _SENSITIVE_PARAM.search(str(key)) else _redact_value(value)
+            for key, value in params.items()
+        }
+    if isinstance(params, (list, tuple)):
+        # Unnamed, any string could be a secret
+        return [
+            f"<{len(value)} chars>" if isinstance(value, str) else _redact_value(value)
+            for value in params
+        ]
+    return _redact_value(params)
+
+
+class SlowQueryRecorder:
+    """
+    Logs statements slower than a threshold, with their EXPLAIN plan.
+
+    Each slow statement is kept with probability `sample_rate`. The EXPLAIN and
+    the write to the rotating log file run on a single background thread, on a
+    connection of the sync engine, so the request that ran the statement does
+    not wait for them. Records arriving while `max_pending` are queued are
+    dropped rather than piling up behind a slow database.
+    """
+
+    def __init__(
+        self,
+        threshold_sec: float,
+        sample_rate: float,
+        explain: bool,
+        max_pending: int,
+        path: str,
+        max_bytes: int,
+        backup_count: int,
+    ):
+        self.threshold_sec = threshold_sec
+        self.sample_rate = sample_rate
+        self.explain = explain
+        self.max_pending = max_pending
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._executor = None
+        self._file_logger = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        # Only once attached, a disabled recorder creates no file or thread
+        if self._file_logger is not None:
+            return
+        handler = RotatingFileHandler(
+            self.path,
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._file_logger = logging.getLogger("wms.slow_query")
+        self._file_logger.setLevel(logging.INFO)
+        self._file_logger.propagate = False
+        self._file_logger.addHandler(handler)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="slow-query"
+        )
+
+    def attach(self, engine, label: str, explain_engine):
+        """
+        Records the slow statements of an engine.
+
+        Args:
+            engine: Sync engine, or the `sync_engine` of an async engine.
+            label (str): Engine name written with each record.
+            explain_engine: Sync engine of the same database to run EXPLAIN on.
+        """
+        self._open()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(
+            conn, cursor, statement, params, context, executemany
+        ):
+            context._wms_slow_started_at = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, params, context, executemany):
+            elapsed = time.perf_counter() - context._wms_slow_started_at
+            if elapsed < self.threshold_sec:
+                return
+            # The EXPLAIN statements themselves
+            if context.execution_options.get("wms_slow_query_skip"):
+                return
+            slow_queries.inc(engine=label)
+            if random.random() >= self.sample_rate:
+                return
+
+            record = {
+                "time": datetime.now().isoformat(timespec="milliseconds"),
+                "engine": label,
+                "duration_ms": round(elapsed * 1000, 1),
+                "route": current_route(),
+                "statement": statement,
+                "executemany": executemany,
+            }
+            # Only the first row of an executemany is kept and explained
+            if executemany:
+                params = params[0] if params else None
+            self._submit(record, explain_engine, statement, params)
+
+    def _submit(self, record: dict, explain_engine, statement: str, params):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return
+            self._pending += 1
+        record["params"] = redact_params(params)
+        self._executor.submit(self._write, record, explain_engine, statement, params)
+
+    def _write(self, record: dict, explain_engine, statement: str, params):
+        try:
+            if self.explain and _EXPLAINABLE.match(statement):
+                record["explain"] = self._explain(explain_engine, statement, params)
+            self._file_logger.info(json.dumps(record, default=str))
+        except Exception:
+            logger.exception("Slow query record failed")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    @staticmethod
+    def _explain(engine, statement: str, params):
+        prefix = (
+            "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        )
+        with engine.connect() as conn:
+            # EXPLAIN does not run the statement, even for UPDATE or DELETE
+            result = conn.execution_options(wms_slow_query_skip=True).exec_driver_sql(
+                prefix + statement, params or ()
+            )
+            rows = [dict(row._mapping) for row in result]
+            conn.rollback()
+        return rows
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+slow_query_log = SlowQueryRecorder(
+    SLOW_QUERY["threshold_sec"],
+    SLOW_QUERY["sample_rate"],
+    SLOW_QUERY["explain"],
+    SLOW_QUERY["max_pending"],
+    SLOW_QUERY["path"],
+    SLOW_QUERY["max_bytes"],
+    SLOW_QUERY["backup_count"],
+)
@@ -0,0 +1,27 @@
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class format_datetime(FunctionElement):
+    """
+    Formats a DATETIME as 'YYYY-MM-DD HH:MM:SS' in the database, so rows come
+    back ready to serialize instead of being formatted with strftime per row.
+    """
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(format_datetime, "mysql")
+def _format_datetime_mysql(element, compiler, **kw):
+    return "DATE_FORMAT(%s, '%%Y-%%m-%%d %%H:%%i:%%s')" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+@compiles(format_datetime, "sqlite")
+def _format_datetime_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m-%%d %%H:%%M:%%S', %s)" % compiler.process(
+        element.clauses, **kw
+    )
@@ -0,0 +1,206 @@
+import re
+import threading
+from bisect import bisect_left
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from core.cache_sync import cache_versions
+from core.db_enums import CacheVersionTMName, StockTMIsActive
+from database import Stock_TM, StockType_TR, StockSize_TR, StockColor_TR
+
+_TOKEN_SPLIT = re.compile(r"[^A-Z0-9]+")
+
+FIELDS = ("type_name", "color_name", "size_name")
+
+
+def tokenize(value: Optional[str]) -> list:
+    """Uppercases and splits a name into alphanumeric tokens."""
+    if not value:
+        return []
+    return [token for token in _TOKEN_SPLIT.split(value.upper()) if token]
+
+
+class _PrefixIndex:
+    """Inverted index from token to stock positions, with prefix lookup."""
+
+    def __init__(self):
+        self.postings = {}
+        self.tokens = []
+
+    def add(self, value: str, position: int):
+        for token in tokenize(value):
+            self.postings.setdefault(token, set()).add(position)
+
+    def freeze(self):
+        self.tokens = sorted(self.postings)
+
+    def lookup(self, prefix: str) -> set:
+        """Returns positions of every token starting with the given prefix."""
+        result = set()
+        i = bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            result |= self.postings[self.tokens[i]]
+            i += 1
+        return result
+
+
+class StockSearchIndex:
+    """
+    In-memory search index over active stocks and their variant names.
+
+    Stocks are kept sorted by (type, color, size) and addressed by position, so
+    filtered results come out in display order. The index is rebuilt lazily
+    once invalidated, by a stock change in this worker or, through cache
+    version polling, in another one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Incremented by every invalidation, a build is only current if it
+        # started after the last one
+        self._generation = 0
+        self._built_generation = None
+        # (stocks, field indexes, combined index, variant lookup), swapped atomically
+        self._state = None
+
+    def invalidate(self, db: Session = None):
+        self._generation += 1
+
+    def notify_changed(self, db: Session):
+        """
+        Invalidates the index in every worker after a committed stock change.
+        Commits the version bump.
+        """
+        cache_versions.bump(db, CacheVersionTMName.STOCK_INDEX)
+        db.commit()
+        self.invalidate()
+
+    def _is_fresh(self) -> bool:
+        return self._built_generation == self._generation
+
+    def ensure_fresh(self, db: Session):
+        if self._is_fresh():
+            return
+        with self._lock:
+            # Another request may have rebuilt while we were waiting
+            if not self._is_fresh():
+                self._build(db)
+
+    def _build(self, db: Session):
+        generation = self._generation
+        rows = (
+            db.query(
+                Stock_TM.id.label("stock_id"),
+                Stock_TM.stock_type_id,
+                StockType_TR.type_name,
+                Stock_TM.stock_color_id,
+                StockColor_TR.color_name,
+                Stock_TM.stock_size_id,
+                StockSize_TR.size_name,
+                Stock_TM.quantity,
+                Stock_TM.reserved_quantity,
+            )
+            .join(StockType_TR, Stock_TM.stock_type_id == StockType_TR.id)
+            .join(StockSize_TR, Stock_TM.stock_size_id == StockSize_TR.id)
+            .join(StockColor_TR, Stock_TM.stock_color_id == StockColor_TR.id)
+            .filter(Stock_TM.is_active == StockTMIsActive.ACTIVE)
+            .all()
+        )
+
+        stocks = sorted(
+            (
+                {
+                    "stock_id": row.stock_id,
+                    "type_id": row.stock_type_id,
+                    "type_name": row.type_name,
+                    "color_id": row.stock_color_id,
+                    "color_name": row.color_name,
+                    "size_id": row.stock_size_id,
+                    "size_name": row.size_name,
+                    "quantity": row.quantity,
+                    "reserved_quantity": row.reserved_quantity,
+                    "available_quantity": row.quantity - row.reserved_quantity,
+                }
+                for row in rows
+            ),
+            key=lambda s: (s["type_name"], s["color_name"], s["size_name"]),
+        )
+
+        field_indexes = {field: _PrefixIndex() for field in FIELDS}
+        combined = _PrefixIndex()
+        variant_lookup = {}
+
+        for position, stock in enumerate(stocks):
+            for field in FIELDS:
+                field_indexes[field].add(stock[field], position)
+                combined.add(stock[field], position)
+            variant_lookup[
+                (stock["type_name"], stock["color_name"], stock["size_name"])
+            ] = stock["stock_id"]
+
+        for index in field_indexes.values():
+            index.freeze()
+        combined.freeze()
+
+        self._state = (stocks, field_indexes, combined, variant_lookup)
+        # An invalidation while reading means the rows may predate the change,
+        # keep the index stale so the next lookup reads again
+        self._built_generation = generation
+
+    def search(
+        self,
+        db: Session,
+        q: Optional[str] = None,
+        type_name: Optional[str] = None,
+        color_name: Optional[str] = None,
+        size_name: Optional[str] = None,
+        min_quantity: Optional[int] = None,
+        max_quantity: Optional[int] = None,
+        page: int = 1,
+        size: int = 50,
+    ):
+        """
+        Searches stocks by name prefixes and quantity range.
+
+        Every token of `q` must prefix-match a token of any variant name, every
+        token of a field filter must prefix-match a token of that field.
+
+        Returns:
+            tuple: (total number of matches, stocks on the requested page)
+        """
+        self.ensure_fresh(db)
+        stocks, field_indexes, combined, _ = self._state
+
+        candidates = None
+        filters = [(combined, q)] + [
+            (field_indexes[field], value)
+            for field, value in zip(FIELDS, (type_name, color_name, size_name))
+        ]
+        for index, value in filters:
+            for token in tokenize(value):
+                matches = index.lookup(token)
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return 0, []
+
+        positions = range(len(stocks)) if candidates is None else sorted(candidates)
+
+        if min_quantity is not None or max_quantity is not None:
+            low = min_quantity if min_quantity is not None else float("-inf")
+            high = max_quantity if max_quantity is not None else float("inf")
+            positions = [p for p in positions if low <= stocks[p]["quantity"] <= high]
+
+        start = (page - 1) * size
+        return len(positions), [stocks[p] for p in positions[start : start + size]]
+
+    def get_stock_id_by_variant_names(
+        self, db: Session, type_name: str, color_name: str, size_name: str
+    ) -> Optional[int]:
+        """Resolves exact (type, color, size) names to an active stock ID."""
+        self.ensure_fresh(db)
+        return self._state[3].get((type_name, color_name, size_name))
+
+
+stock_index = StockSearchIndex()
+cache_versions.register(CacheVersionTMName.STOCK_INDEX, stock_index.invalidate)
@@ -0,0 +1,88 @@
+import math
+import time
+from collections import OrderedDict
+
+from constant import AUTH_THROTTLE
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets with LRU eviction.
+
+    Each key may burst up to `burst` calls and refills at `rate_per_sec`. At most
+    `max_keys` buckets are kept; the least recently used goes first, which only
+    ever makes a key less throttled. Meant to be called from async endpoints
+    only, so all calls run on the event loop thread and need no lock.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: float, max_keys: int):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """
+        Takes a token for the key.
+
+        Returns:
+            float: 0 if allowed, otherwise seconds until the next token.
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.burst, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(
+                self.burst, bucket[0] + (now - bucket[1]) * self.rate_per_sec
+            )
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0
+        return (1 - bucket[0]) / self.rate_per_sec
+
+
+def _per_worker_limiter(name: str) -> TokenBucketLimiter:
+    # Buckets live in each worker, so the limits are approximate. Each worker
+    # refills at an equal share of the configured rate, so the sustained rate
+    # matches it when requests are spread over the workers. Each keeps the full
+    # burst, so a client whose requests all land on one worker is not cut off
+    # early; across N workers a key can burst up to N times before throttling.
+    workers = max(AUTH_THROTTLE["workers"], 1)
+    config = AUTH_THROTTLE[name]
+    return TokenBucketLimiter(
+        config["rate_per_min"] / 60 / workers,
+        config["burst"],
+        AUTH_THROTTLE["max_keys"],
+    )
+
+
+ip_limiter = _per_worker_limiter("ip")
+username_limiter = _per_worker_limiter("username")
+
+
+def client_ip(request) -> str:
+    """
+    Address the IP limit applies to. Requests without a client address, e.g.
+    over a Unix socket, share one bucket rather than bypassing the limit.
+    """
+    return request.client.host if request.client else "unknown"
+
+
+def check_auth_throttle(client_ip: str, username: str) -> int:
+    """
+    Checks the login/signup limits of a client IP and a username.
+
+    Returns:
+        int: 0 if allowed, otherwise seconds the client should wait.
+    """
+    wait_sec = ip_limiter.acquire(client_ip)
+    if not wait_sec:
+        wait_sec = username_limiter.acquire(username)
+    return math.ceil(wait_sec)
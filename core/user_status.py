@@ -0,0 +1,94 @@
+import threading
+from collections import namedtuple
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from core.cache_sync import cache_versions
+from core.db_enums import CacheVersionTMName, UserTMStatus
+from database import SessionLocal, User_TM, RevokedToken_TR
+
+_CachedUser = namedtuple("_CachedUser", ("id", "username", "role_id", "is_active"))
+
+
+class UserStatusCache:
+    """
+    In-memory user statuses and revoked token IDs, checked on every JWT.
+
+    Holds the ID, role and status of every user by username, plus the JTIs of
+    unexpired revoked tokens. Reloaded when the USER_STATUS cache version
+    changes, so deactivating a user or logging out takes effect on all workers
+    within `CACHE_STALENESS_SEC` without a DB query per request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (users by username, revoked JTIs), swapped atomically
+        self._state = None
+
+    def load(self, db: Session):
+        users = db.query(
+            User_TM.id, User_TM.username, User_TM.role_id, User_TM.is_active
+        ).all()
+        revoked = db.query(RevokedToken_TR.jti).filter(
+            RevokedToken_TR.expires_at > datetime.now()
+        )
+        self._state = (
+            {user.username: _CachedUser(*user) for user in users},
+            {row.jti for row in revoked},
+        )
+
+    def _ensure_loaded(self):
+        if self._state is not None:
+            return
+        with self._lock:
+            if self._state is None:
+                db = SessionLocal()
+                try:
+                    self.load(db)
+                finally:
+                    db.close()
+
+    def get_user(self, username: str) -> Optional[tuple]:
+        """Returns (id, username, role_id, is_active), or None if unknown."""
+        self._ensure_loaded()
+        return self._state[0].get(username)
+
+    def put_user(self, user):
+        """Adds or replaces one user after a committed change in this worker."""
+        self._ensure_loaded()
+        self._state[0][user.username] = _CachedUser(
+            user.id, user.username, user.role_id, user.is_active
+        )
+
+    def is_token_revoked(self, raw_token: dict) -> bool:
+        self._ensure_loaded()
+        users, revoked = self._state
+        if raw_token.get("jti") in revoked:
+            return True
+        user = users.get(raw_token.get("sub"))
+        return user is not None and user.is_active != UserTMStatus.ACTIVE
+
+    def revoke_token(self, db: Session, raw_token: dict):
+        """Stores a token as revoked until it expires. Does not commit."""
+        now = datetime.now()
+        # Revoked tokens past their expiry are rejected anyway, drop them
+        db.query(RevokedToken_TR).filter(RevokedToken_TR.expires_at <= now).delete()
+        # merge, as another worker may not have seen the revocation yet
+        db.merge(
+            RevokedToken_TR(
+                jti=raw_token["jti"],
+                username=raw_token["sub"],
+                expires_at=datetime.fromtimestamp(raw_token["exp"]),
+            )
+        )
+        cache_versions.bump(db, CacheVersionTMName.USER_STATUS)
+
+    def notify_changed(self, db: Session):
+        """Bumps the version after a user change. Does not commit."""
+        cache_versions.bump(db, CacheVersionTMName.USER_STATUS)
+
+
+user_status = UserStatusCache()
+cache_versions.register(CacheVersionTMName.USER_STATUS, user_status.load)
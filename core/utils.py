@@ -1,6 +1,8 @@
 import re
+import base64
+from datetime import datetime
 from typing import Optional, Tuple
-from constant import XLS
+from constant import XLS, STOCK_BULK_XLS, INBOUND_XLS
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from core.error_codes import ErrCode as E
@@ -264,6 +266,125 @@ def extract_picklist_item(sheet, ecom_code, picklist_id):
     return orders
 
 
+def find_header_mismatch(header_row, fields: dict):
+    """
+    Compares a sheet header row against a `fields` layout as used in `constant.py`.
+
+    Returns:
+        Optional[tuple]: (field name, expected header, expected index, actual header)
+            of the first mismatching field, or None if the header row matches.
+    """
+    for field_name, field_config in fields.items():
+        expected_header = field_config["NAME"]
+        expected_index = field_config["INDEX"]
+        actual_header = (
+            header_row[expected_index] if expected_index < len(header_row) else None
+        )
+        if actual_header != expected_header:
+            return field_name, expected_header, expected_index, actual_header
+    return None
+
+
+def extract_bulk_stock_names(workbook):
+    """
+    Reads the variant names from a bulk stock creation sheet.
+
+    The sheet layout is defined by `STOCK_BULK_XLS`. Each column lists the
+    names of one variant kind, so the columns may have different lengths.
+
+    Args:
+        workbook (openpyxl.Workbook): The workbook object loaded from the uploaded file.
+
+    Returns:
+        dict: Unique, uppercased names per field, e.g. {"TYPE": [...], "SIZE": [...]}.
+
+    Raises:
+        HTTPException: If the header row does not match `STOCK_BULK_XLS`.
+    """
+    sheet = workbook.active
+    config = STOCK_BULK_XLS
+    rows = sheet.iter_rows(min_row=config["y_offset"]["header"] + 1, values_only=True)
+
+    mismatch = find_header_mismatch(next(rows, ()), config["fields"])
+    if mismatch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=E.format_error(E.STO_BLK_E05, *mismatch),
+        )
+
+    names = {field_name: {} for field_name in config["fields"]}
+    skip_rows = config["y_offset"]["data"] - config["y_offset"]["header"] - 1
+    for row_number, row in enumerate(rows):
+        if row_number < skip_rows:
+            continue
+        for field_name, field_config in config["fields"].items():
+            index = field_config["INDEX"]
+            value = row[index] if index < len(row) else None
+            if value is not None and str(value).strip():
+                # dict keeps the sheet order while dropping duplicates
+                names[field_name][str(value).upper().strip()] = None
+
+    return {field_name: list(values) for field_name, values in names.items()}
+
+
+def iter_inbound_sheet_lines(workbook, layout: str):
+    """
+    Validates a supplier delivery sheet and returns an iterator over its lines.
+
+    The column layout is looked up in `INBOUND_XLS` by layout code. Rows are read
+    lazily, so with a read-only workbook the sheet is streamed, not loaded.
+
+    Args:
+        workbook (openpyxl.Workbook): The workbook object loaded from the uploaded file.
+        layout (str): Layout code, a key of `INBOUND_XLS`.
+
+    Returns:
+        Iterator[tuple]: (row number, type name, color name, size name, quantity)
+            for every non-empty row. Names are uppercased, the quantity is left
+            as read from the sheet.
+
+    Raises:
+        HTTPException: If the layout is unknown or the header row doesn't match it.
+    """
+    if layout not in INBOUND_XLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=E.format_error(E.INB_IMP_E01, layout, list(INBOUND_XLS.keys())),
+        )
+
+    config = INBOUND_XLS[layout]
+    header_row_number = config["y_offset"]["header"] + 1
+    rows = workbook.active.iter_rows(min_row=header_row_number, values_only=True)
+
+    mismatch = find_header_mismatch(next(rows, ()), config["fields"])
+    if mismatch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=E.format_error(E.INB_IMP_E02, layout, *mismatch),
+        )
+
+    def cell(row, field_name):
+        index = config["fields"][field_name]["INDEX"]
+        value = row[index] if index < len(row) else None
+        return str(value).upper().strip() if value is not None else None
+
+    def lines():
+        first_data_row = config["y_offset"]["data"] + 1
+        for row_number, row in enumerate(rows, start=header_row_number + 1):
+            if row_number < first_data_row or not any(row):
+                continue
+            quantity_index = config["fields"]["QUANTITY"]["INDEX"]
+            yield (
+                row_number,
+                cell(row, "TYPE"),
+                cell(row, "COLOR"),
+                cell(row, "SIZE"),
+                row[quantity_index] if quantity_index < len(row) else None,
+            )
+
+    return lines()
+
+
 def transform_size_names(
     size_start: str, size_end: Optional[str] = None
 ) -> Optional[Tuple[str, str]]:
@@ -371,3 +492,38 @@ def map_picklistfile_ids(picklist_files):
         elif file.ecom_code == "LAZ":
             file_ids["laz_file_id"] = file.id
     return file_ids
+
+
+def encode_keyset_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Encodes the (created_at, id) of the last row of a page as an opaque cursor."""
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_keyset_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """
+    Decodes a cursor from `encode_keyset_cursor`, or returns None if invalid.
+    A NULL created_at decodes to (None, id).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at) if created_at else None, int(row_id)
+    except ValueError:
+        return None
+
+
+def fetch_keyset_page(query, limit: int, created_column, id_column) -> tuple:
+    """
+    Returns a page of `query`, newest first, and the cursor of the next page
+    (None on the last page). One extra row is fetched to know whether there is
+    a next page.
+    """
+    rows = (
+        query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1).all()
+    )
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_keyset_cursor(getattr(last, created_column.key), last.id)
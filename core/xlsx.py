@@ -0,0 +1,17 @@
+# openpyxl takes a noticeable share of the app's start time and only the upload
+# and export endpoints use it, so it is imported on the first call instead of
+# at import time (see tests/test_import_budget.py).
+
+
+def load_workbook(file, read_only: bool = False):
+    """Opens an XLSX file (path or file object) with openpyxl."""
+    from openpyxl import load_workbook
+
+    return load_workbook(filename=file, read_only=read_only)
+
+
+def new_workbook(write_only: bool = False):
+    """Creates an empty openpyxl workbook."""
+    from openpyxl import Workbook
+
+    return Workbook(write_only=write_only)
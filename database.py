@@ -1,17 +1,94 @@
-from sqlalchemy import create_engine
+import os
+import pickle
+import sqlalchemy
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.automap import automap_base
 from sqlalchemy.orm import sessionmaker
 from _cred import Credentials
+from constant import DB_POOL, SCHEMA_CACHE_PATH, SLOW_QUERY
+from core.db_pool import (
+    InstrumentedQueuePool,
+    InstrumentedAsyncQueuePool,
+    observe_pool,
+)
+from core.request_metrics import instrument_queries
+from core.slow_query import slow_query_log
 
-SQLALCHEMY_DB_URL = f'mysql+pymysql://{Credentials["user"]}:{Credentials["password"]}@{Credentials["host"]}/{Credentials["database"]}?charset=utf8mb4'
+SQLALCHEMY_DB_URL = os.getenv(
+    "WMS_DATABASE_URL",
+    f'mysql+pymysql://{Credentials["user"]}:{Credentials["password"]}@{Credentials["host"]}/{Credentials["database"]}?charset=utf8mb4',
+)
 
-engine = create_engine(SQLALCHEMY_DB_URL)
+# Same database through an asyncio driver, for the async endpoints
+ASYNC_DB_URL = os.getenv(
+    "WMS_ASYNC_DATABASE_URL",
+    f'mysql+asyncmy://{Credentials["user"]}:{Credentials["password"]}@{Credentials["host"]}/{Credentials["database"]}?charset=utf8mb4',
+)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+engine = create_engine(SQLALCHEMY_DB_URL, poolclass=InstrumentedQueuePool, **DB_POOL)
+observe_pool(engine, "sync")
+instrument_queries(engine, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = automap_base()
+async_engine = create_async_engine(
+    ASYNC_DB_URL, poolclass=InstrumentedAsyncQueuePool, **DB_POOL
+)
+observe_pool(async_engine.sync_engine, "async")
+instrument_queries(async_engine.sync_engine, "async")
+
+if SLOW_QUERY["enabled"]:
+    # Async connections can't be used off their event loop, EXPLAIN on the sync one
+    slow_query_log.attach(engine, "sync", explain_engine=engine)
+    slow_query_log.attach(async_engine.sync_engine, "async", explain_engine=engine)
+
+# Objects stay usable after commit, lazy loads are not possible with asyncio
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def _schema_signature() -> tuple:
+    # A new migration or SQLAlchemy version makes the cached metadata stale
+    return sqlalchemy.__version__, tuple(sorted(os.listdir(MIGRATIONS_DIR)))
 
-Base.prepare(engine, reflect=True)
+
+def reflect_metadata() -> MetaData:
+    """Reflects the schema from the database and writes it to `SCHEMA_CACHE_PATH`."""
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+
+    # Write to a temp file first so other workers never read a partial cache
+    tmp_path = f"{SCHEMA_CACHE_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((_schema_signature(), metadata), f)
+    os.replace(tmp_path, SCHEMA_CACHE_PATH)
+
+    return metadata
+
+
+def load_metadata() -> MetaData:
+    """
+    Returns the schema from `SCHEMA_CACHE_PATH`, so importing this module doesn't
+    connect to the database. Reflects it only if the cache is missing or stale.
+    """
+    try:
+        with open(SCHEMA_CACHE_PATH, "rb") as f:
+            signature, metadata = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return reflect_metadata()
+
+    if signature != _schema_signature():
+        return reflect_metadata()
+    return metadata
+
+
+Base = automap_base(metadata=load_metadata())
+
+Base.prepare()
 
 User_TM = Base.classes.user_tm
 Role_TM = Base.classes.role_tm
@@ -27,6 +104,9 @@ MasterParameter_TM = Base.classes.master_parameter_tm
 InboundSchedule_TM = Base.classes.inboundschedule_tm
 Inbound_TM = Base.classes.inbound_tm
 InboundItems_TR = Base.classes.inbounditems_tr
+StockReservation_TR = Base.classes.stockreservation_tr
+CacheVersion_TM = Base.classes.cacheversion_tm
+RevokedToken_TR = Base.classes.revokedtoken_tr
 
 
 def get_db():
@@ -35,3 +115,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+if __name__ == "__main__":
+    # Run after applying migrations: python -m database
+    reflect_metadata()
+    print(f"Schema cache written to {SCHEMA_CACHE_PATH}")
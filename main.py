@@ -1,14 +1,27 @@
-from fastapi import FastAPI, Depends, Request
+import asyncio
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import timedelta
-from routers import auth, picklist, stock, mapping, user, inbound
-from fastapi.responses import JSONResponse
+from routers import auth, picklist, stock, mapping, user, inbound, export
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
 from fastapi_jwt_auth import AuthJWT
 from fastapi_jwt_auth.exceptions import AuthJWTException
 from pydantic import BaseModel
 
 from _cred import AuthSecret
+from constant import CACHE_STALENESS_SEC, LAST_LOGIN_FLUSH_SEC, LOOP_MONITOR
+from core.cache_sync import cache_versions
+from database import async_engine
+from core.last_login import last_logins
+from core.loop_monitor import RequestTaskMiddleware, loop_monitor
+from core.metrics import registry, scrape_allowed
+from core.password import password_hasher
+from core.request_metrics import RequestMetricsMiddleware
+from core.slow_query import slow_query_log
+from core.throttle import client_ip
+from core.user_status import user_status
 
 app = FastAPI()
 
@@ -31,6 +44,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if LOOP_MONITOR["enabled"]:
+    app.add_middleware(RequestTaskMiddleware, monitor=loop_monitor)
+
+# Outermost, so its latency includes the other middlewares
+app.add_middleware(RequestMetricsMiddleware)
+
 API_PREFIX = "/api_v1"
 
 app.include_router(auth.router, prefix=API_PREFIX)
@@ -39,6 +58,37 @@ app.include_router(stock.router, prefix=API_PREFIX)
 app.include_router(mapping.router, prefix=API_PREFIX)
 app.include_router(user.router, prefix=API_PREFIX)
 app.include_router(inbound.router, prefix=API_PREFIX)
+app.include_router(export.router, prefix=API_PREFIX)
+
+
+# region Background tasks
+@app.on_event("startup")
+async def start_background_tasks():
+    # Started in every worker, each keeps its own caches and buffers
+    app.state.cache_sync_task = asyncio.create_task(
+        cache_versions.run(CACHE_STALENESS_SEC)
+    )
+    app.state.last_login_task = asyncio.create_task(
+        last_logins.run(LAST_LOGIN_FLUSH_SEC)
+    )
+    app.state.loop_monitor_task = None
+    if LOOP_MONITOR["enabled"]:
+        app.state.loop_monitor_task = asyncio.create_task(loop_monitor.run())
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    app.state.cache_sync_task.cancel()
+    app.state.last_login_task.cancel()
+    if app.state.loop_monitor_task:
+        app.state.loop_monitor_task.cancel()
+    await run_in_threadpool(last_logins.flush_once)
+    password_hasher.shutdown()
+    slow_query_log.shutdown()
+    await async_engine.dispose()
+
+
+# endregion
 
 
 # region AuthJWT
@@ -47,6 +97,8 @@ class Settings(BaseModel):
     authjwt_access_token_expires = timedelta(
         minutes=AuthSecret["ACCESS_TOKEN_EXPIRE_MINUTES"]
     )
+    authjwt_denylist_enabled: bool = True
+    authjwt_denylist_token_checks: set = {"access", "refresh"}
 
 
 @AuthJWT.load_config
@@ -54,6 +106,11 @@ def get_config():
     return Settings()
 
 
+@AuthJWT.token_in_denylist_loader
+def check_if_token_in_denylist(raw_token):
+    return user_status.is_token_revoked(raw_token)
+
+
 @app.exception_handler(AuthJWTException)
 def authjwt_exception_handler(request: Request, exc: AuthJWTException):
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
@@ -67,3 +124,12 @@ async def root():
     return JSONResponse(
         content={"status": "OK", "message": "Service is healthy"}, status_code=200
     )
+
+
+@app.get(API_PREFIX + "/metrics")
+async def metrics(request: Request):
+    if not scrape_allowed(client_ip(request)):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
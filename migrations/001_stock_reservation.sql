@@ -0,0 +1,36 @@
+-- Stock reservation for open picklists (CREATED / ON_PICKING).
+-- stock_tm.reserved_quantity is maintained incrementally by the picklist
+-- status endpoints, stockreservation_tr remembers what each picklist holds
+-- so the exact amount can be released on completion or cancellation.
+
+ALTER TABLE stock_tm
+    ADD COLUMN reserved_quantity INT NOT NULL DEFAULT 0;
+
+CREATE TABLE stockreservation_tr (
+    id INT NOT NULL AUTO_INCREMENT,
+    picklist_id INT NOT NULL,
+    stock_id INT NOT NULL,
+    quantity INT NOT NULL,
+    created_dt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id),
+    UNIQUE KEY uq_stockreservation_picklist_stock (picklist_id, stock_id),
+    KEY ix_stockreservation_stock (stock_id)
+);
+
+-- Backfill reservations for picklists that are already open
+INSERT INTO stockreservation_tr (picklist_id, stock_id, quantity)
+SELECT pi.picklist_id, pi.stock_id, COUNT(*)
+FROM picklistitem_tr pi
+JOIN picklist_tm p ON p.id = pi.picklist_id
+WHERE p.picklist_status IN ('CREATED', 'ON_PICKING')
+  AND pi.is_excluded = 0
+  AND pi.stock_id IS NOT NULL
+GROUP BY pi.picklist_id, pi.stock_id;
+
+UPDATE stock_tm s
+JOIN (
+    SELECT stock_id, SUM(quantity) AS quantity
+    FROM stockreservation_tr
+    GROUP BY stock_id
+) r ON r.stock_id = s.id
+SET s.reserved_quantity = r.quantity;
@@ -0,0 +1,6 @@
+-- Idempotency key of the request that submitted (completed) the inbound.
+-- A retried submit carrying the same key is answered as a success instead
+-- of failing on the PENDING check.
+
+ALTER TABLE inbound_tm
+    ADD COLUMN submit_key VARCHAR(64) NULL;
@@ -0,0 +1,19 @@
+-- Keyset pagination and filters for the inbound listing, plus per-inbound
+-- summary columns maintained by the item endpoints.
+
+ALTER TABLE inbound_tm
+    ADD COLUMN item_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN total_quantity INT NOT NULL DEFAULT 0,
+    ADD KEY ix_inbound_created_at_id (created_at, id),
+    ADD KEY ix_inbound_status_created_at_id (status, created_at, id),
+    ADD KEY ix_inbound_supplier_created_at_id (supplier_name, created_at, id);
+
+-- Backfill summaries of existing inbounds
+UPDATE inbound_tm i
+JOIN (
+    SELECT inbound_id, COUNT(*) AS item_count, SUM(add_quantity) AS total_quantity
+    FROM inbounditems_tr
+    GROUP BY inbound_id
+) agg ON agg.inbound_id = i.id
+SET i.item_count = agg.item_count,
+    i.total_quantity = agg.total_quantity;
@@ -0,0 +1,13 @@
+-- Store inbound schedules as real dates (previously 'YYYYMMDD' strings) and
+-- index them for date range lookups.
+
+ALTER TABLE inboundschedule_tm
+    ADD COLUMN schedule_day DATE NULL;
+
+UPDATE inboundschedule_tm
+SET schedule_day = STR_TO_DATE(schedule_date, '%Y%m%d');
+
+ALTER TABLE inboundschedule_tm
+    DROP COLUMN schedule_date,
+    CHANGE COLUMN schedule_day schedule_date DATE NOT NULL,
+    ADD KEY ix_inboundschedule_date_active (schedule_date, is_active);
@@ -0,0 +1,10 @@
+-- Version counters of in-memory caches. A mutating endpoint bumps the
+-- counter of the cache it affects, every worker polls the counters and
+-- reloads the caches whose version changed (see core/cache_sync.py).
+
+CREATE TABLE cacheversion_tm (
+    cache_name VARCHAR(50) NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_dt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (cache_name)
+);
@@ -0,0 +1,10 @@
+-- Tokens revoked before their expiry (logout). Every worker keeps the
+-- unexpired JTIs in memory and rejects them (see core/user_status.py).
+
+CREATE TABLE revokedtoken_tr (
+    jti VARCHAR(64) NOT NULL,
+    username VARCHAR(50) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    PRIMARY KEY (jti),
+    INDEX idx_revokedtoken_expires_at (expires_at)
+);
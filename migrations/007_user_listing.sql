@@ -0,0 +1,4 @@
+-- Keyset pagination of the active user listing, newest first.
+
+ALTER TABLE user_tm
+    ADD KEY ix_user_is_active_created_dt_id (is_active, created_dt, id);
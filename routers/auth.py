@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from fastapi_jwt_auth import AuthJWT
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Body
+from core.jwt_cache import CachedAuthJWT
 
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-import bcrypt
+from starlette.concurrency import run_in_threadpool
+from datetime import timedelta
 
-from database import get_db, User_TM, Role_TM
-from schemas import LoginForm, RegisterForm
+from database import get_db
+from schemas import LoginForm, RegisterForm, LogoutForm
 from core.error_codes import ErrCode as E
 from core.utils import validate_username, validate_password
 from core.db_enums import UserTMStatus
+from core.db_utils import get_user_by_username, get_role_by_name, create_user
+from core.password import password_hasher
+from core.last_login import last_logins
+from core.user_status import user_status
+from core.throttle import check_auth_throttle, client_ip
 
 router = APIRouter(tags=["Auth"], prefix="/auth")
 
@@ -40,12 +45,21 @@ REFRESH_TOKEN_EXP = timedelta(hours=9)
                     }
                 }
             },
-        }
+        },
+        429: {
+            "description": "Too Many Requests",
+            "content": {
+                "application/json": {
+                    "example": {"detail": E.format_error(E.AUT_SUP_E05, "()")}
+                }
+            },
+        },
     },
 )
-def signup(
+async def signup(
+    request: Request,
     payload: RegisterForm = Body(default=None),
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     # Authorize.jwt_required()
@@ -54,8 +68,17 @@ def signup(
     new_password = payload.password
     new_rolename = payload.rolename.lower()
 
+    # Throttle before any DB or bcrypt work
+    retry_after = check_auth_throttle(client_ip(request), new_username)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=E.format_error(E.AUT_SUP_E05, retry_after),
+            headers={"Retry-After": str(retry_after)},
+        )
+
     # Check if username exists
-    user = db.query(User_TM).filter(User_TM.username == new_username).first()
+    user = await run_in_threadpool(get_user_by_username, db, new_username)
 
     if user:
         raise HTTPException(
@@ -64,7 +87,7 @@ def signup(
         )
 
     # Check if rolename exists
-    role = db.query(Role_TM).filter(Role_TM.role_name == new_rolename).first()
+    role = await run_in_threadpool(get_role_by_name, db, new_rolename)
 
     if not role:
         raise HTTPException(
@@ -85,17 +108,8 @@ def signup(
         )
 
     # Add user to DB
-    new_user = User_TM(
-        username=new_username,
-        password=bcrypt.hashpw(new_password.encode("UTF-8"), bcrypt.gensalt()),
-        role_id=role.id,
-        created_dt=datetime.now(),
-        is_active=True,
-    )
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    hashed_password = await password_hasher.hash(new_password)
+    await run_in_threadpool(create_user, db, new_username, hashed_password, role.id)
 
     return {"msg": f"Created user '{new_username}'"}
 
@@ -117,15 +131,34 @@ def signup(
                     }
                 }
             },
-        }
+        },
+        429: {
+            "description": "Too Many Requests",
+            "content": {
+                "application/json": {
+                    "example": {"detail": E.format_error(E.AUT_SIN_E03, "()")}
+                }
+            },
+        },
     },
 )
-def login(
-    payload: LoginForm, Authorize: AuthJWT = Depends(), db: Session = Depends(get_db)
+async def login(
+    request: Request,
+    payload: LoginForm,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
 ):
     input_username = payload.username.lower()
 
-    user = db.query(User_TM).filter(User_TM.username == input_username).first()
+    retry_after = check_auth_throttle(client_ip(request), input_username)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=E.format_error(E.AUT_SIN_E03, retry_after),
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    user = await run_in_threadpool(get_user_by_username, db, input_username)
 
     if not user or user.is_active != UserTMStatus.ACTIVE:
         raise HTTPException(
@@ -133,29 +166,28 @@ def login(
             detail=E.format_error(E.AUT_SIN_E01),
         )
 
-    db_pw = (
-        user.password
-        if isinstance(user.password, bytes)
-        else user.password.encode("utf-8")
-    )
-
-    if not bcrypt.checkpw(payload.password.encode("utf-8"), db_pw):
+    if not await password_hasher.verify(payload.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=E.format_error(E.AUT_SIN_E02),
         )
 
+    username = user.username
     token_payload = {"role_id": user.role_id, "user_id": user.id}
 
-    user.last_login_dt = datetime.now()
-    db.commit()
-    db.refresh(user)
+    # Upgrade hashes made with a different cost while we have the plain password
+    if password_hasher.needs_rehash(user.password):
+        user.password = await password_hasher.hash(payload.password)
+        await run_in_threadpool(db.commit)
+
+    # Written in batches by a background task, keeps login to a single read
+    last_logins.record(token_payload["user_id"])
 
     access_token = Authorize.create_access_token(
-        subject=user.username, user_claims=token_payload, expires_time=ACCESS_TOKEN_EXP
+        subject=username, user_claims=token_payload, expires_time=ACCESS_TOKEN_EXP
     )
     refresh_token = Authorize.create_refresh_token(
-        subject=user.username, expires_time=REFRESH_TOKEN_EXP
+        subject=username, expires_time=REFRESH_TOKEN_EXP
     )
 
     return {"access_token": access_token, "refresh_token": refresh_token}
@@ -181,12 +213,18 @@ def login(
         }
     },
 )
-def refresh(Authorize: AuthJWT = Depends(), db: Session = Depends(get_db)):
+def refresh(Authorize: CachedAuthJWT = Depends(), db: Session = Depends(get_db)):
+    # Revoked tokens and disabled users are rejected by the denylist check
     Authorize.jwt_refresh_token_required()
 
     current_user = Authorize.get_jwt_subject()
 
-    user = db.query(User_TM).filter(User_TM.username == current_user).first()
+    user = user_status.get_user(current_user)
+    if not user:
+        # Created on another worker since the last cache version poll
+        user = get_user_by_username(db, current_user)
+        if user:
+            user_status.put_user(user)
 
     if not user:
         raise HTTPException(
@@ -206,3 +244,26 @@ def refresh(Authorize: AuthJWT = Depends(), db: Session = Depends(get_db)):
         subject=current_user, user_claims=token_payload, expires_time=ACCESS_TOKEN_EXP
     )
     return {"access_token": new_access_token}
+
+
+@router.post("/logout")
+def logout(
+    payload: LogoutForm = Body(default=None),
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    """Revokes the access token, and the refresh token if given, until they expire."""
+    Authorize.jwt_required()
+
+    raw_tokens = [Authorize.get_raw_jwt()]
+    if payload and payload.refresh_token:
+        raw_refresh = Authorize.get_raw_jwt(payload.refresh_token)
+        if raw_refresh["sub"] == raw_tokens[0]["sub"]:
+            raw_tokens.append(raw_refresh)
+
+    for raw_token in raw_tokens:
+        user_status.revoke_token(db, raw_token)
+    db.commit()
+    user_status.load(db)
+
+    return {"msg": "Logged out"}
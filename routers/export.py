@@ -0,0 +1,150 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from core.jwt_cache import CachedAuthJWT
+from database import (
+    get_db,
+    Inbound_TM,
+    InboundItems_TR,
+    Picklist_TM,
+    PicklistItem_TR,
+    Stock_TM,
+    StockType_TR,
+    StockColor_TR,
+    StockSize_TR,
+)
+from core.db_enums import StockTMIsActive
+from core.export import stream_export
+
+router = APIRouter(tags=["Export"], prefix="/export")
+
+EXPORT_FORMAT = Query("csv", regex="^(csv|xlsx)$")
+
+
+@router.get("/stock")
+def export_stock(
+    fmt: str = EXPORT_FORMAT,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    query = (
+        db.query(
+            Stock_TM.id,
+            StockType_TR.type_name,
+            StockColor_TR.color_name,
+            StockSize_TR.size_name,
+            Stock_TM.quantity,
+            Stock_TM.reserved_quantity,
+            Stock_TM.quantity - Stock_TM.reserved_quantity,
+        )
+        .join(StockType_TR, Stock_TM.stock_type_id == StockType_TR.id)
+        .join(StockColor_TR, Stock_TM.stock_color_id == StockColor_TR.id)
+        .join(StockSize_TR, Stock_TM.stock_size_id == StockSize_TR.id)
+        .filter(Stock_TM.is_active == StockTMIsActive.ACTIVE)
+        .order_by(
+            StockType_TR.type_name, StockColor_TR.color_name, StockSize_TR.size_name
+        )
+    )
+    headers = [
+        "Stock ID",
+        "Type",
+        "Color",
+        "Size",
+        "Quantity",
+        "Reserved",
+        "Available",
+    ]
+    return stream_export(query, headers, "stock", fmt)
+
+
+@router.get("/inbound")
+def export_inbound(
+    fmt: str = EXPORT_FORMAT,
+    inbound_id: Optional[int] = None,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    query = (
+        db.query(
+            Inbound_TM.id,
+            Inbound_TM.status,
+            Inbound_TM.supplier_name,
+            Inbound_TM.created_at,
+            InboundItems_TR.stock_id,
+            StockType_TR.type_name,
+            StockColor_TR.color_name,
+            StockSize_TR.size_name,
+            InboundItems_TR.add_quantity,
+        )
+        .join(InboundItems_TR, InboundItems_TR.inbound_id == Inbound_TM.id)
+        .join(Stock_TM, InboundItems_TR.stock_id == Stock_TM.id)
+        .join(StockType_TR, Stock_TM.stock_type_id == StockType_TR.id)
+        .join(StockColor_TR, Stock_TM.stock_color_id == StockColor_TR.id)
+        .join(StockSize_TR, Stock_TM.stock_size_id == StockSize_TR.id)
+        .order_by(Inbound_TM.created_at.desc(), InboundItems_TR.id.asc())
+    )
+    if inbound_id:
+        query = query.filter(Inbound_TM.id == inbound_id)
+
+    headers = [
+        "Inbound ID",
+        "Status",
+        "Supplier",
+        "Created At",
+        "Stock ID",
+        "Type",
+        "Color",
+        "Size",
+        "Quantity",
+    ]
+    return stream_export(query, headers, "inbound", fmt)
+
+
+@router.get("/picklist")
+def export_picklist(
+    fmt: str = EXPORT_FORMAT,
+    picklist_id: Optional[int] = None,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    query = (
+        db.query(
+            Picklist_TM.id,
+            Picklist_TM.picklist_status,
+            PicklistItem_TR.id,
+            PicklistItem_TR.ecom_code,
+            PicklistItem_TR.ecom_order_id,
+            PicklistItem_TR.product_name,
+            PicklistItem_TR.stock_id,
+            StockType_TR.type_name,
+            StockColor_TR.color_name,
+            StockSize_TR.size_name,
+            PicklistItem_TR.is_excluded,
+        )
+        .join(PicklistItem_TR, PicklistItem_TR.picklist_id == Picklist_TM.id)
+        .outerjoin(Stock_TM, PicklistItem_TR.stock_id == Stock_TM.id)
+        .outerjoin(StockType_TR, Stock_TM.stock_type_id == StockType_TR.id)
+        .outerjoin(StockColor_TR, Stock_TM.stock_color_id == StockColor_TR.id)
+        .outerjoin(StockSize_TR, Stock_TM.stock_size_id == StockSize_TR.id)
+        .order_by(Picklist_TM.id.desc(), PicklistItem_TR.id.asc())
+    )
+    if picklist_id:
+        query = query.filter(Picklist_TM.id == picklist_id)
+
+    headers = [
+        "Picklist ID",
+        "Picklist Status",
+        "Item ID",
+        "Ecom Code",
+        "Order ID",
+        "Product Name",
+        "Stock ID",
+        "Type",
+        "Color",
+        "Size",
+        "Is Excluded",
+    ]
+    return stream_export(query, headers, "picklist", fmt)
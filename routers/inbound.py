@@ -1,27 +1,55 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from typing import List, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from fastapi_jwt_auth import AuthJWT
-from sqlalchemy.exc import NoResultFound
+from core.jwt_cache import CachedAuthJWT
 from database import (
     get_db,
-    MasterParameter_TM,
     InboundSchedule_TM,
     Inbound_TM,
     InboundItems_TR,
     Stock_TM,
-    StockType_TR,
-    StockColor_TR,
-    StockSize_TR,
 )
 from schemas import (
     InboundSchedule,
     CreateScheduleRequest,
     CreateInboundRequest,
     AddInboundItemRequest,
+    AddInboundItemsBulkRequest,
+)
+from datetime import datetime, date, timedelta
+from sqlalchemy import or_, and_
+from core.db_utils import (
+    get_inbound_item_missing_stock_id,
+    complete_inbound_by_id,
+    get_stock_ids_by_variant_keys,
+    create_inbound_items_bulk,
+    adjust_inbound_summary,
+    get_inbound_schedules_by_date_range,
+    get_inbound_detail_by_id,
+    get_inbound_items_by_inbound_id,
 )
-from datetime import datetime
-from core.db_utils import get_stock_by_stock_id
+from core.db_enums import InboundTMStatus, CacheVersionTMName
+from core.stock_index import stock_index
+from core.xlsx import load_workbook
+from core.inbound_gate import inbound_gate, InboundGateState
+from core.param_service import param_service
+from core.cache_sync import cache_versions
+from core.utils import (
+    iter_inbound_sheet_lines,
+    decode_keyset_cursor,
+    fetch_keyset_page,
+)
+from constant import XLS_FILE_FORMAT, INBOUND_IMPORT_CHUNK_SIZE
 
 router = APIRouter(tags=["Inbound"], prefix="/inbound")
 
@@ -31,52 +59,95 @@ def list_inbound_schedules(
     year: int = Query(
         ..., ge=1000, le=9999, description="Year must be a 4-digit number"
     ),
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
-    schedules = (
-        db.query(InboundSchedule_TM)
-        .filter(InboundSchedule_TM.schedule_date.like(f"{year}%"))
-        .all()
+    schedules = get_inbound_schedules_by_date_range(
+        db, date(year, 1, 1), date(year, 12, 31)
     )
-    return [
-        {
-            "id": schedule.id,
-            "schedule_date": schedule.schedule_date,
-            "created_dt": schedule.created_dt.strftime("%Y-%m-%d %H:%M:%S"),
-            "creator_id": schedule.creator_id,
-            "notes": schedule.notes if schedule.notes else "Scheduled Inbound",
-            "is_active": schedule.is_active,
-        }
-        for schedule in schedules
-    ]
+    return [format_inbound_schedule(schedule) for schedule in schedules]
+
+
+@router.get("/schedules/calendar")
+def get_inbound_schedule_calendar(
+    month: Optional[str] = Query(None, regex=r"^\d{6}$", description="YYYYMM"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    if month:
+        try:
+            date_from = datetime.strptime(month, "%Y%m").date()
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid month. Expected format: YYYYMM.",
+            )
+        next_month = (date_from.replace(day=28) + timedelta(days=4)).replace(day=1)
+        date_to = next_month - timedelta(days=1)
+
+    if not (date_from and date_to) or date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either month or a valid date_from/date_to range.",
+        )
+
+    if (date_to - date_from).days > 366:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range must not exceed 366 days.",
+        )
+
+    calendar = {}
+    for schedule in get_inbound_schedules_by_date_range(db, date_from, date_to):
+        calendar.setdefault(schedule.schedule_date.strftime("%Y%m%d"), []).append(
+            format_inbound_schedule(schedule)
+        )
+
+    return {
+        "date_from": date_from.strftime("%Y%m%d"),
+        "date_to": date_to.strftime("%Y%m%d"),
+        "data": calendar,
+    }
 
 
 @router.post("/schedules")
 def create_inbound_schedule(
     schedule: CreateScheduleRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
+    try:
+        schedule_date = datetime.strptime(schedule.schedule_date, "%Y%m%d").date()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid schedule_date. Expected format: YYYYMMDD.",
+        )
+
     new_schedule = InboundSchedule_TM(
-        schedule_date=schedule.schedule_date,
+        schedule_date=schedule_date,
         created_dt=datetime.now(),
         creator_id=Authorize.get_raw_jwt()["user_id"],
         notes=schedule.notes,
         is_active=1,
     )
     db.add(new_schedule)
+    cache_versions.bump(db, CacheVersionTMName.INBOUND_SCHEDULE)
     db.commit()
     db.refresh(new_schedule)
+    inbound_gate.invalidate()
     return {"message": "Schedule created successfully", "schedule_id": new_schedule.id}
 
 
 @router.delete("/schedules/{schedule_id}")
 def delete_inbound_schedule(
     schedule_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -84,61 +155,98 @@ def delete_inbound_schedule(
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     db.delete(schedule)
+    cache_versions.bump(db, CacheVersionTMName.INBOUND_SCHEDULE)
     db.commit()
+    inbound_gate.invalidate()
     return {"message": "Schedule deleted successfully"}
 
 
 @router.get("/inbound-status")
 def get_inbound_status(
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
 ):
     Authorize.jwt_required()
-    try:
-        parameter = (
-            db.query(MasterParameter_TM)
-            .filter_by(parameter_name="inbound_active")
-            .one()
-        )
-        return {"inbound_active": parameter.parameter_value_int}
-    except NoResultFound:
+    inbound_active = param_service.get_int("inbound_active")
+    if inbound_active is None:
         raise HTTPException(
             status_code=404, detail="Inbound status parameter not found"
         )
+    return {"inbound_active": inbound_active}
 
 
 @router.put("/inbound-status/toggle/{on_off}")
 def toggle_inbound_status(
     on_off: str = Path(..., regex="^(on|off)$"),
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
-    try:
-        parameter = (
-            db.query(MasterParameter_TM)
-            .filter_by(parameter_name="inbound_active")
-            .one()
-        )
-        parameter.parameter_value_int = 1 if on_off == "on" else 0
-        db.commit()
-        return {
-            "message": f"Inbound status updated to {'on' if on_off == 'on' else 'off'}"
-        }
-    except NoResultFound:
+    if not param_service.set_int(db, "inbound_active", 1 if on_off == "on" else 0):
         raise HTTPException(
             status_code=404, detail="Inbound status parameter not found"
         )
+    return {"message": f"Inbound status updated to {'on' if on_off == 'on' else 'off'}"}
 
 
 # prefix="/inbound"
 @router.get("/")
 def list_inbounds(
-    Authorize: AuthJWT = Depends(),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    inbound_status: Optional[InboundTMStatus] = Query(None, alias="status"),
+    supplier_name: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
-    inbounds = db.query(Inbound_TM).order_by(Inbound_TM.created_at.desc()).all()
+    query = db.query(
+        Inbound_TM.id,
+        Inbound_TM.status,
+        Inbound_TM.supplier_name,
+        Inbound_TM.notes,
+        Inbound_TM.created_at,
+        Inbound_TM.updated_at,
+        Inbound_TM.user_id,
+        Inbound_TM.item_count,
+        Inbound_TM.total_quantity,
+    )
+
+    if inbound_status:
+        query = query.filter(Inbound_TM.status == inbound_status)
+    if supplier_name:
+        query = query.filter(
+            Inbound_TM.supplier_name.startswith(supplier_name, autoescape=True)
+        )
+    if date_from:
+        query = query.filter(Inbound_TM.created_at >= date_from)
+    if date_to:
+        query = query.filter(Inbound_TM.created_at < date_to + timedelta(days=1))
+
+    # Keyset pagination: continue after the last (created_at, id) of the previous page
+    if cursor:
+        position = decode_keyset_cursor(cursor)
+        if not position:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor.",
+            )
+        last_created_at, last_id = position
+        query = query.filter(
+            or_(
+                Inbound_TM.created_at < last_created_at,
+                and_(
+                    Inbound_TM.created_at == last_created_at,
+                    Inbound_TM.id < last_id,
+                ),
+            )
+        )
+
+    inbounds, next_cursor = fetch_keyset_page(
+        query, limit, Inbound_TM.created_at, Inbound_TM.id
+    )
+
     return {
         "data": [
             {
@@ -149,52 +257,40 @@ def list_inbounds(
                 "created_at": inbound.created_at.strftime("%Y-%m-%d %H:%M:%S"),
                 "updated_at": inbound.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
                 "user_id": inbound.user_id,
+                "item_count": inbound.item_count,
+                "total_quantity": inbound.total_quantity,
             }
             for inbound in inbounds
-        ]
+        ],
+        "next_cursor": next_cursor,
     }
 
 
 @router.post("/")
 def create_inbound(
     data: CreateInboundRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
 
-    # Check if inbound is active
-    parameter = (
-        db.query(MasterParameter_TM)
-        .filter_by(parameter_name="inbound_active")
-        .one_or_none()
-    )
-    if not parameter:
+    # Check if inbound creation is allowed today (cached)
+    gate_state = inbound_gate.get_state(db)
+    if gate_state == InboundGateState.NOT_CONFIGURED:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="System configuration for inbound_active is missing.",
         )
 
-    if parameter.parameter_value_int == 1:
-        # Check if today's date matches any active schedule in InboundSchedule_TM
-        today_date = datetime.now().strftime("%Y%m%d")
-        schedule = (
-            db.query(InboundSchedule_TM)
-            .filter(
-                InboundSchedule_TM.schedule_date == today_date,
-                InboundSchedule_TM.is_active == 1,
-            )
-            .first()
+    if gate_state == InboundGateState.NOT_SCHEDULED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inbound creation is not allowed. No active schedule matches today's date.",
         )
-        if not schedule:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Inbound creation is not allowed. No active schedule matches today's date.",
-            )
 
     # Proceed with inbound creation
     new_inbound = Inbound_TM(
-        status="PENDING",
+        status=InboundTMStatus.PENDING,
         supplier_name=data.supplier_name,
         notes=data.notes,
         user_id=Authorize.get_raw_jwt()["user_id"],
@@ -212,12 +308,12 @@ def create_inbound(
 def add_inbound_item(
     inbound_id: int,
     data: AddInboundItemRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
     inbound = db.query(Inbound_TM).filter_by(id=inbound_id).first()
-    if not inbound or inbound.status != "PENDING":
+    if not inbound or inbound.status != InboundTMStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inbound not found or not in PENDING status.",
@@ -245,49 +341,187 @@ def add_inbound_item(
         add_quantity=data.add_quantity,
     )
     db.add(new_item)
+    adjust_inbound_summary(db, inbound_id, 1, data.add_quantity)
     db.commit()
     return {"msg": "Inbound item added successfully"}
 
 
-@router.post("/{inbound_id}/submit")
-def submit_inbound(
+@router.post("/{inbound_id}/items/bulk")
+def add_inbound_items_bulk(
     inbound_id: int,
-    Authorize: AuthJWT = Depends(),
+    data: AddInboundItemsBulkRequest,
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
     inbound = db.query(Inbound_TM).filter_by(id=inbound_id).first()
-    if not inbound or inbound.status != "PENDING":
+    if not inbound or inbound.status != InboundTMStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inbound not found or not in PENDING status.",
         )
 
-    items = db.query(InboundItems_TR).filter_by(inbound_id=inbound_id).all()
-    if not items:
+    # Resolve every (type, color, size) triple with one query
+    stock_ids = get_stock_ids_by_variant_keys(
+        db,
+        list({(item.type_id, item.color_id, item.size_id) for item in data.items}),
+    )
+
+    # Merge lines of the same stock, collect per-line errors
+    quantities = {}
+    errors = []
+    for line, item in enumerate(data.items, start=1):
+        if item.add_quantity <= 0:
+            errors.append({"line": line, "error": "Quantity must be positive."})
+            continue
+
+        stock_id = stock_ids.get((item.type_id, item.color_id, item.size_id))
+        if not stock_id:
+            errors.append(
+                {
+                    "line": line,
+                    "error": "Stock with the given type, color, and size combination not found.",
+                }
+            )
+            continue
+
+        quantities[stock_id] = quantities.get(stock_id, 0) + item.add_quantity
+
+    create_inbound_items_bulk(db, inbound_id, quantities)
+    adjust_inbound_summary(db, inbound_id, len(quantities), sum(quantities.values()))
+    db.commit()
+
+    return {
+        "msg": f"Added {len(quantities)} inbound item(s), {len(errors)} line(s) failed",
+        "data": {"added_count": len(quantities), "errors": errors},
+    }
+
+
+@router.post("/{inbound_id}/import")
+def import_inbound_items(
+    inbound_id: int,
+    file: UploadFile,
+    layout: str = "DEFAULT",
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    if file.content_type != XLS_FILE_FORMAT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only XLSX files are allowed.",
+        )
+
+    inbound = db.query(Inbound_TM).filter_by(id=inbound_id).first()
+    if not inbound or inbound.status != InboundTMStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No items found for this inbound.",
+            detail="Inbound not found or not in PENDING status.",
+        )
+
+    # Read-only mode streams the rows instead of loading the whole sheet
+    workbook = load_workbook(file.file, read_only=True)
+    try:
+        quantities = {}
+        errors = []
+        for line in iter_inbound_sheet_lines(workbook, layout):
+            row_number, type_name, color_name, size_name, quantity = line
+            # openpyxl returns floats for numeric cells, don't truncate 2.5 to 2
+            try:
+                quantity = float(quantity)
+            except (TypeError, ValueError):
+                quantity = 0.0
+            if not quantity.is_integer():
+                errors.append(
+                    {"line": row_number, "error": "Quantity must be a whole number."}
+                )
+                continue
+            quantity = int(quantity)
+            if quantity <= 0:
+                errors.append(
+                    {"line": row_number, "error": "Quantity must be positive."}
+                )
+                continue
+
+            stock_id = stock_index.get_stock_id_by_variant_names(
+                db, type_name, color_name, size_name
+            )
+            if not stock_id:
+                errors.append(
+                    {
+                        "line": row_number,
+                        "error": f"Stock '{type_name} / {color_name} / {size_name}' not found.",
+                    }
+                )
+                continue
+
+            quantities[stock_id] = quantities.get(stock_id, 0) + quantity
+    finally:
+        workbook.close()
+
+    # Insert in chunks to keep each statement small, commit once
+    stock_quantities = list(quantities.items())
+    for start in range(0, len(stock_quantities), INBOUND_IMPORT_CHUNK_SIZE):
+        chunk = stock_quantities[start : start + INBOUND_IMPORT_CHUNK_SIZE]
+        create_inbound_items_bulk(db, inbound_id, dict(chunk))
+    adjust_inbound_summary(db, inbound_id, len(quantities), sum(quantities.values()))
+    db.commit()
+
+    return {
+        "msg": f"Imported {len(quantities)} inbound item(s), {len(errors)} line(s) failed",
+        "data": {"added_count": len(quantities), "errors": errors},
+    }
+
+
+@router.post("/{inbound_id}/submit")
+def submit_inbound(
+    inbound_id: int,
+    idempotency_key: Optional[str] = Header(None, max_length=64),
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+
+    missing_stock_id = get_inbound_item_missing_stock_id(db, inbound_id)
+    if missing_stock_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Stock with ID {missing_stock_id} not found.",
         )
 
-    for item in items:
-        stock = get_stock_by_stock_id(db, item.stock_id)
-        if not stock:
+    if not complete_inbound_by_id(db, inbound_id, idempotency_key):
+        db.rollback()
+        inbound = db.query(Inbound_TM).filter_by(id=inbound_id).first()
+
+        # Retry of a submit that already went through
+        if (
+            inbound
+            and idempotency_key
+            and inbound.status == InboundTMStatus.COMPLETED
+            and inbound.submit_key == idempotency_key
+        ):
+            return {"msg": "Inbound submitted successfully"}
+
+        if not inbound or inbound.status != InboundTMStatus.PENDING:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Stock with ID {item.stock_id} not found.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Inbound not found or not in PENDING status.",
             )
-        stock.quantity += item.add_quantity
 
-    inbound.status = "COMPLETED"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No items found for this inbound.",
+        )
+
     db.commit()
+    stock_index.notify_changed(db)
     return {"msg": "Inbound submitted successfully"}
 
 
 @router.delete("/{inbound_id}")
 def cancel_inbound(
     inbound_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -307,72 +541,37 @@ def cancel_inbound(
 @router.get("/{inbound_id}")
 def get_inbound_details(
     inbound_id: int,
-    Authorize: AuthJWT = Depends(),
+    include_items: bool = True,
+    item_page: int = Query(1, ge=1),
+    item_size: Optional[int] = Query(None, ge=1, le=1000),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
-    inbound = db.query(Inbound_TM).filter_by(id=inbound_id).first()
+    inbound = get_inbound_detail_by_id(db, inbound_id)
     if not inbound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Inbound not found.",
         )
 
-    items = (
-        db.query(
-            InboundItems_TR.id,
-            InboundItems_TR.stock_id,
-            Stock_TM.stock_type_id,
-            StockType_TR.type_name,
-            Stock_TM.stock_color_id,
-            StockColor_TR.color_name,
-            Stock_TM.stock_size_id,
-            StockSize_TR.size_name,
-            InboundItems_TR.add_quantity,
-            InboundItems_TR.created_at,
-            InboundItems_TR.updated_at,
-        )
-        .join(Stock_TM, InboundItems_TR.stock_id == Stock_TM.id)
-        .join(StockType_TR, Stock_TM.stock_type_id == StockType_TR.id)
-        .join(StockColor_TR, Stock_TM.stock_color_id == StockColor_TR.id)
-        .join(StockSize_TR, Stock_TM.stock_size_id == StockSize_TR.id)
-        .filter(InboundItems_TR.inbound_id == inbound_id)
-        .all()
-    )
+    content = {"inbound": dict(inbound._mapping)}
 
-    return {
-        "inbound": {
-            "id": inbound.id,
-            "status": inbound.status,
-            "supplier_name": inbound.supplier_name,
-            "notes": inbound.notes,
-            "created_at": inbound.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_at": inbound.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "user_id": inbound.user_id,
-        },
-        "items": [
-            {
-                "id": item.id,
-                "stock_id": item.stock_id,
-                "type_id": item.stock_type_id,
-                "type_name": item.type_name,
-                "color_id": item.stock_color_id,
-                "color_name": item.color_name,
-                "size_id": item.stock_size_id,
-                "size_name": item.size_name,
-                "add_quantity": item.add_quantity,
-                "created_at": item.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "updated_at": item.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-            }
-            for item in items
-        ],
-    }
+    if include_items:
+        items = get_inbound_items_by_inbound_id(db, inbound_id, item_page, item_size)
+        content["items"] = [dict(item._mapping) for item in items]
+        content["item_page"] = item_page
+        content["item_size"] = item_size
+        content["item_total"] = inbound.item_count
+
+    # Rows are already JSON-ready, orjson skips FastAPI's per-field encoding
+    return ORJSONResponse(content=content)
 
 
 @router.delete("/items/{inbound_item_id}")
 def delete_inbound_item(
     inbound_item_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -384,5 +583,17 @@ def delete_inbound_item(
         )
 
     db.delete(inbound_item)
+    adjust_inbound_summary(db, inbound_item.inbound_id, -1, -inbound_item.add_quantity)
     db.commit()
     return {"msg": "Inbound item deleted successfully"}
+
+
+def format_inbound_schedule(schedule):
+    return {
+        "id": schedule.id,
+        "schedule_date": schedule.schedule_date.strftime("%Y%m%d"),
+        "created_dt": schedule.created_dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "creator_id": schedule.creator_id,
+        "notes": schedule.notes if schedule.notes else "Scheduled Inbound",
+        "is_active": schedule.is_active,
+    }
@@ -1,14 +1,13 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, Query
 from datetime import datetime
-from openpyxl import load_workbook
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi_jwt_auth import AuthJWT
+from starlette.concurrency import run_in_threadpool
+from core.jwt_cache import CachedAuthJWT
 from database import (
     get_db,
-    PicklistFile_TR,
-    PicklistItem_TR,
-    ProductMapping_TR,
+    get_async_db,
     Picklist_TM,
 )
 from schemas import (
@@ -21,13 +20,8 @@ from core.error_codes import ErrCode as E
 from core.db_enums import PicklistTMStatus, PicklistItemTRIsExcluded
 from core.db_utils import (
     get_picklist_by_id,
-    set_picklist_status,
     get_picklistitems_by_picklist_id,
-    update_stock_quantity_by_stock_id,
     get_picklistitem_by_id,
-    copy_stock_id_by_picklistitem_object,
-    get_all_product_mapping,
-    get_stock_by_variant_ids,
     get_stock_by_stock_id,
     get_picklistfile_by_picklist_id,
     get_stock_size_name_by_id,
@@ -35,11 +29,6 @@ from core.db_utils import (
     get_stock_color_name_by_id,
     get_picklistfile_by_id,
     get_picklistfile_by_picklist_id_and_ecom_code,
-    get_stocktype_by_value,
-    get_stocksize_by_value,
-    get_stockcolor_by_name,
-    create_stock,
-    create_product_mapping,
     delete_picklistfile_by_picklist_id_and_ecom_code,
     delete_picklistfile_by_picklist_id,
     delete_picklistitems_by_picklistfile_id,
@@ -47,11 +36,14 @@ from core.db_utils import (
     delete_picklistitems_by_picklist_id,
     set_is_excluded_picklistitem_by_id,
 )
+from core import async_db_utils as adb
 from core.utils import (
     validate_picklist_file,
     extract_picklist_item,
     map_picklistfile_ids,
 )
+from core.stock_index import stock_index
+from core.xlsx import load_workbook
 from io import BytesIO
 
 router = APIRouter(tags=["Picklist"], prefix="/picklist")
@@ -62,7 +54,7 @@ def list_picklists(
     page: int = 1,
     size: int = 100,
     picklist_status: Optional[PicklistTMStatus] = Query(None),
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -88,7 +80,7 @@ def list_picklists(
 
 @router.post("/")
 def create_picklist(
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -125,7 +117,7 @@ def create_picklist(
 @router.get("/{picklist_id}/dashboard", response_model=PicklistDashboardResponse)
 def get_picklist_dashboard(
     picklist_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -209,7 +201,7 @@ def get_picklist_dashboard(
 def exclude_picklistitem(
     picklist_id: int,
     item_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -222,7 +214,7 @@ def exclude_picklistitem(
 def include_picklistitem(
     picklist_id: int,
     item_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -235,7 +227,7 @@ def include_picklistitem(
 def delete_file_by_id(
     picklist_id: int,
     file_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -272,7 +264,7 @@ def delete_file_by_id(
 @router.delete("/{picklist_id}/file")
 def delete_file_by_picklist_id(
     picklist_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -306,7 +298,7 @@ def delete_file_by_picklist_id(
 def delete_file_by_ecom_code(
     picklist_id: int,
     ecom_code: str,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -337,13 +329,13 @@ def delete_file_by_ecom_code(
 @router.post("/{picklist_id}/update/cancelled")
 async def cancel_draft(
     picklist_id: int,
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     Authorize.jwt_required()
     user_id = Authorize.get_raw_jwt()["user_id"]
 
-    db_picklist = get_picklist_by_id(db, picklist_id)
+    db_picklist = await adb.get_picklist_by_id(db, picklist_id)
 
     if not db_picklist:
         raise HTTPException(
@@ -360,8 +352,10 @@ async def cancel_draft(
             ),
         )
 
-    # Set Status
-    set_picklist_status(db, db_picklist, PicklistTMStatus.CANCELLED)
+    # Release reserved stock (if any) and set status in one transaction
+    await adb.release_stock_reservation_by_picklist_id(db, db_picklist.id)
+    await adb.set_picklist_status(db, db_picklist, PicklistTMStatus.CANCELLED)
+    await db.run_sync(stock_index.notify_changed)
 
     # TODO Logging
 
@@ -371,13 +365,13 @@ async def cancel_draft(
 @router.post("/{picklist_id}/update/created")
 async def finish_draft(
     picklist_id: int,
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     Authorize.jwt_required()
     user_id = Authorize.get_raw_jwt()["user_id"]
 
-    db_picklist = get_picklist_by_id(db, picklist_id)
+    db_picklist = await adb.get_picklist_by_id(db, picklist_id)
 
     if not db_picklist:
         raise HTTPException(
@@ -394,7 +388,7 @@ async def finish_draft(
             ),
         )
 
-    items_arr = get_picklistitems_by_picklist_id(db, db_picklist.id)
+    items_arr = await adb.get_picklistitems_by_picklist_id(db, db_picklist.id)
 
     if not items_arr:
         raise HTTPException(
@@ -413,8 +407,10 @@ async def finish_draft(
                 detail=E.format_error(E.PIC_FIN_E04),
             )
 
-    # Set Status
-    set_picklist_status(db, db_picklist, PicklistTMStatus.CREATED)
+    # Reserve stock and set status in one transaction
+    await adb.reserve_stock_by_picklist_id(db, db_picklist.id)
+    await adb.set_picklist_status(db, db_picklist, PicklistTMStatus.CREATED)
+    await db.run_sync(stock_index.notify_changed)
 
     # TODO Use Returned Items Flow
     # TODO Logging
@@ -426,12 +422,12 @@ async def finish_draft(
 async def repeat_item_mapping(
     picklist_id: int,
     data: RepeatItemMappingRequest,
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     Authorize.jwt_required()
 
-    db_picklist = get_picklist_by_id(db, picklist_id)
+    db_picklist = await adb.get_picklist_by_id(db, picklist_id)
 
     if not db_picklist:
         raise HTTPException(
@@ -441,7 +437,7 @@ async def repeat_item_mapping(
 
     # If mapped item id given, copy from that
     if data.mapped_picklistitem_id:
-        item = get_picklistitem_by_id(db, data.mapped_picklistitem_id)
+        item = await adb.get_picklistitem_by_id(db, data.mapped_picklistitem_id)
 
         if item.picklist_id != picklist_id:
             raise HTTPException(
@@ -454,23 +450,17 @@ async def repeat_item_mapping(
                 ),
             )
 
-        copy_stock_id_by_picklistitem_object(db, item)
+        await adb.copy_stock_id_by_picklistitem_object(db, item)
 
         return {
             "msg": f"Successfully applied stock mapping from picklistitem id ({data.mapped_picklistitem_id}) to other similar picklistitem under the same picklist id!",
         }
     else:  # check item against all mapping
         # Get All Items which belong to this PicklistID
-        items = get_picklistitems_by_picklist_id(db, picklist_id)
-
-        # Get all mappings
-        mappings = get_all_product_mapping(db)
+        items = await adb.get_picklistitems_by_picklist_id(db, picklist_id)
 
         # Create a lookup dictionary for stock_id
-        mapping_lookup = {
-            (row.field1, row.field2, row.field3, row.field4, row.field5): row.stock_id
-            for row in mappings
-        }
+        mapping_lookup = await adb.get_product_mapping_lookup(db)
 
         for item in items:
             stock_key = (
@@ -482,7 +472,7 @@ async def repeat_item_mapping(
             )
             item.stock_id = mapping_lookup.get(stock_key)
 
-        db.commit()
+        await db.commit()
 
         return {"msg": "Successfully processed Picklist File!"}
 
@@ -490,13 +480,13 @@ async def repeat_item_mapping(
 @router.post("/{picklist_id}/update/on-picking")
 async def set_on_picking(
     picklist_id: int,
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     Authorize.jwt_required()
     user_id = Authorize.get_raw_jwt()["user_id"]
 
-    db_picklist = get_picklist_by_id(db, picklist_id)
+    db_picklist = await adb.get_picklist_by_id(db, picklist_id)
 
     if not db_picklist:
         raise HTTPException(
@@ -514,7 +504,7 @@ async def set_on_picking(
         )
 
     # Set Status
-    set_picklist_status(db, db_picklist, PicklistTMStatus.ON_PICKING)
+    await adb.set_picklist_status(db, db_picklist, PicklistTMStatus.ON_PICKING)
 
     # TODO Use Returned Items Flow
     # TODO Logging
@@ -525,13 +515,13 @@ async def set_on_picking(
 @router.post("/{picklist_id}/update/complete-draft")
 async def complete_draft(
     picklist_id: int,
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     Authorize.jwt_required()
     user_id = Authorize.get_raw_jwt()["user_id"]
 
-    db_picklist = get_picklist_by_id(db, picklist_id)
+    db_picklist = await adb.get_picklist_by_id(db, picklist_id)
 
     if not db_picklist:
         raise HTTPException(
@@ -549,7 +539,7 @@ async def complete_draft(
         )
 
     # Reduce Stock Quantity based on Picklist Item
-    items_arr = get_picklistitems_by_picklist_id(db, db_picklist.id)
+    items_arr = await adb.get_picklistitems_by_picklist_id(db, db_picklist.id)
     stock_updates = {}
 
     # Group items by stock_id and count how many times each stock_id appears
@@ -557,25 +547,38 @@ async def complete_draft(
         if item.is_excluded == PicklistItemTRIsExcluded.INCLUDED:
             stock_updates[item.stock_id] = stock_updates.get(item.stock_id, 0) + 1
 
-    # Update stock quantities in bulk
-    for stock_id, count in stock_updates.items():
-        update_stock_quantity_by_stock_id(db, stock_id, count)
+    # Stock is consumed now, so release what the picklist reserved
+    await adb.release_stock_reservation_by_picklist_id(db, db_picklist.id)
+
+    # Update stock quantities, committed together with the status
+    await adb.update_stock_quantities(db, stock_updates)
 
     # Set Status
-    set_picklist_status(db, db_picklist, PicklistTMStatus.COMPLETED)
+    await adb.set_picklist_status(db, db_picklist, PicklistTMStatus.COMPLETED)
+    await db.run_sync(stock_index.notify_changed)
 
     # TODO Logging
 
     return {"msg": "Picklist completed successfully"}
 
 
+def parse_picklist_file(file_content: bytes, ecom_code: str, picklist_id: int):
+    """Validates an uploaded order export and returns its picklist item dicts."""
+    workbook = load_workbook(BytesIO(file_content))
+    try:
+        sheet = validate_picklist_file(workbook, ecom_code)
+        return extract_picklist_item(sheet, ecom_code, picklist_id)
+    finally:
+        workbook.close()
+
+
 @router.post("/{picklist_id}/upload/{ecom_code}")
 async def upload(
     picklist_id: int,
     ecom_code: str,
     file: UploadFile,
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     Authorize.jwt_required()
     if file.content_type != XLS_FILE_FORMAT:
@@ -585,44 +588,19 @@ async def upload(
         )
 
     file_content = await file.read()
-    workbook = load_workbook(filename=BytesIO(file_content))
-
-    sheet = validate_picklist_file(workbook, ecom_code)
-    items = extract_picklist_item(sheet, ecom_code, picklist_id)
+    # CPU bound, parsed off the event loop so other requests keep being served
+    items = await run_in_threadpool(
+        parse_picklist_file, file_content, ecom_code, picklist_id
+    )
 
     # region Save File
-    new_picklistfile = PicklistFile_TR(
-        ecom_code=ecom_code,
-        file_data=file_content,
-        file_name=file.filename,
-        picklist_id=picklist_id,
-        upload_dt=datetime.now(),
+    new_picklistfile = await adb.create_picklistfile(
+        db, picklist_id, ecom_code, file.filename, file_content
     )
-
-    db.add(new_picklistfile)
-    db.commit()
-    db.refresh(new_picklistfile)
     # endregion
 
     # Fetch all relevant product mappings for the ecom_code
-    product_mappings = (
-        db.query(
-            ProductMapping_TR.field1,
-            ProductMapping_TR.field2,
-            ProductMapping_TR.field3,
-            ProductMapping_TR.field4,
-            ProductMapping_TR.field5,
-            ProductMapping_TR.stock_id,
-        )
-        .filter(ProductMapping_TR.ecom_code == ecom_code)
-        .all()
-    )
-
-    # Create a lookup dictionary for stock_id
-    stock_lookup = {
-        (row.field1, row.field2, row.field3, row.field4, row.field5): row.stock_id
-        for row in product_mappings
-    }
+    stock_lookup = await adb.get_product_mapping_lookup(db, ecom_code)
 
     # Assign stock_id and picklistfile_id to each item
     picklistfile_id = new_picklistfile.id
@@ -639,10 +617,7 @@ async def upload(
         item["picklistfile_id"] = picklistfile_id
 
     # Bulk insert the items into the PicklistItem_TR table
-    db.bulk_insert_mappings(PicklistItem_TR, items)
-    db.commit()
-
-    workbook.close()
+    await adb.create_picklistitems_bulk(db, items)
 
     return {"msg": "Successfully processed Picklist File!", "data": items}
 
@@ -651,13 +626,13 @@ async def upload(
 async def set_item_mapping(
     picklistitem_id: int,
     data: SetItemMappingRequest,
-    Authorize: AuthJWT = Depends(),
-    db: Session = Depends(get_db),
+    Authorize: CachedAuthJWT = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     Authorize.jwt_required()
     user_id = Authorize.get_raw_jwt()["user_id"]
 
-    item = get_picklistitem_by_id(db, picklistitem_id)
+    item = await adb.get_picklistitem_by_id(db, picklistitem_id)
 
     if not item:
         raise HTTPException(
@@ -666,9 +641,9 @@ async def set_item_mapping(
         )
 
     # Get Variants from DB
-    type_db = get_stocktype_by_value(db, data.stock_type_value)
-    size_db = get_stocksize_by_value(db, data.stock_size_value)
-    color_db = get_stockcolor_by_name(db, data.stock_color_name)
+    type_db = await adb.get_stocktype_by_value(db, data.stock_type_value)
+    size_db = await adb.get_stocksize_by_value(db, data.stock_size_value)
+    color_db = await adb.get_stockcolor_by_name(db, data.stock_color_name)
 
     if not (type_db and size_db and color_db):
         raise HTTPException(
@@ -677,16 +652,19 @@ async def set_item_mapping(
         )
 
     # Get Stock
-    stock_db = get_stock_by_variant_ids(db, type_db.id, size_db.id, color_db.id)
+    stock_db = await adb.get_stock_by_variant_ids(
+        db, type_db.id, size_db.id, color_db.id
+    )
 
     if not stock_db:
-        stock_db = create_stock(db, type_db.id, size_db.id, color_db.id)
+        stock_db = await adb.create_stock(db, type_db.id, size_db.id, color_db.id)
+        await db.run_sync(stock_index.notify_changed)
 
     # Insert New ProductMapping
-    mapping_db = create_product_mapping(db, item, stock_db.id)
+    mapping_db = await adb.create_product_mapping(db, item, stock_db.id)
 
     item.stock_id = stock_db.id
-    db.commit()
+    await db.commit()
 
     # TODO Logging
 
@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from itertools import product
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, status
 from sqlalchemy.orm import Session
-from fastapi_jwt_auth import AuthJWT
+from core.jwt_cache import CachedAuthJWT
 from database import get_db, Stock_TM, StockType_TR, StockColor_TR, StockSize_TR
-from core.utils import transform_size_names, transform_type_name, transform_color_name
+from core.utils import (
+    transform_size_names,
+    transform_type_name,
+    transform_color_name,
+    extract_bulk_stock_names,
+)
 from core.error_codes import ErrCode as E
+from core.reorder_snapshot import load_reorder_snapshot
+from core.stock_index import stock_index
+from core.xlsx import load_workbook
 from schemas import (
     CreateNewVariantTypeRequest,
     CreateNewVariantSizeRequest,
     CreateNewVariantColorRequest,
     CreateNewStockRequest,
+    CreateBulkStockRequest,
     UpdateStockQuantityRequest,
 )
+from constant import XLS_FILE_FORMAT, STOCK_BULK_MAX_COMBINATIONS
 from core.db_utils import (
     get_all_stock_size,
     get_all_stock_type,
@@ -25,6 +37,16 @@ from core.db_utils import (
     get_stock_by_variant_ids,
     create_stock,
     get_stock_by_stock_id,
+    get_stock_availability_by_stock_id,
+    get_all_stock_availability,
+    get_existing_stock_variant_keys,
+    create_stocks_bulk,
+    get_stocktypes_by_ids,
+    get_stocksizes_by_ids,
+    get_stockcolors_by_ids,
+    get_stocktypes_by_names,
+    get_stocksizes_by_names,
+    get_stockcolors_by_names,
 )
 from sqlalchemy import distinct
 
@@ -33,7 +55,7 @@ router = APIRouter(tags=["Stock"], prefix="/stock")
 
 @router.get("/")
 def get_all_stock(
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -41,9 +63,88 @@ def get_all_stock(
     return {"data": [dict(stock._mapping) for stock in stocks]}
 
 
+@router.get("/search")
+def search_stock(
+    q: Optional[str] = None,
+    type_name: Optional[str] = None,
+    color_name: Optional[str] = None,
+    size_name: Optional[str] = None,
+    min_quantity: Optional[int] = None,
+    max_quantity: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=500),
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    total, stocks = stock_index.search(
+        db,
+        q=q,
+        type_name=type_name,
+        color_name=color_name,
+        size_name=size_name,
+        min_quantity=min_quantity,
+        max_quantity=max_quantity,
+        page=page,
+        size=size,
+    )
+    return {"data": stocks, "page": page, "size": size, "total": total}
+
+
+@router.get("/availability")
+def get_all_availability(
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    stocks = get_all_stock_availability(db)
+    return {"data": [dict(stock._mapping) for stock in stocks]}
+
+
+@router.get("/reorder-suggestions")
+def get_reorder_suggestions(
+    only_suggested: bool = True,
+    Authorize: CachedAuthJWT = Depends(),
+):
+    Authorize.jwt_required()
+    snapshot = load_reorder_snapshot()
+    if not snapshot:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Reorder suggestions have not been generated yet.",
+        )
+
+    items = snapshot["items"]
+    if only_suggested:
+        items = [item for item in items if item["suggested_quantity"] > 0]
+
+    return {
+        "generated_at": snapshot["generated_at"],
+        "history_end_date": snapshot["history_end_date"],
+        "parameters": snapshot["parameters"],
+        "data": items,
+    }
+
+
+@router.get("/{stock_id}/availability")
+def get_availability(
+    stock_id: int,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    stock = get_stock_availability_by_stock_id(db, stock_id)
+    if not stock:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Stock with ID {stock_id} not found.",
+        )
+    return {"data": dict(stock._mapping)}
+
+
 @router.get("/variant-options")
 def get_variants(
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -58,7 +159,7 @@ def get_variants(
 
 @router.get("/variant/size")
 def get_variant_size(
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -67,7 +168,7 @@ def get_variant_size(
 
 @router.get("/variant/type")
 def get_variant_type(
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -76,7 +177,7 @@ def get_variant_type(
 
 @router.get("/variant/color")
 def get_variant_color(
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -86,7 +187,7 @@ def get_variant_color(
 @router.post("/")
 def post_new_stock(
     data: CreateNewStockRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -103,13 +204,83 @@ def post_new_stock(
 
     # Create the new stock
     new_stock = create_stock(db, data.type_id, data.size_id, data.color_id)
+    stock_index.notify_changed(db)
     return {"msg": "Stock created successfully", "data": {"stock_id": new_stock.id}}
 
 
+@router.post("/bulk")
+def post_new_stock_bulk(
+    data: CreateBulkStockRequest,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+
+    type_ids = list(dict.fromkeys(data.type_ids))
+    size_ids = list(dict.fromkeys(data.size_ids))
+    color_ids = list(dict.fromkeys(data.color_ids))
+
+    # Validate that every given variant ID exists
+    for kind, ids, rows in (
+        ("type", type_ids, get_stocktypes_by_ids(db, type_ids)),
+        ("size", size_ids, get_stocksizes_by_ids(db, size_ids)),
+        ("color", color_ids, get_stockcolors_by_ids(db, color_ids)),
+    ):
+        unknown = set(ids) - {row.id for row in rows}
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=E.format_error(E.STO_BLK_E03, kind, sorted(unknown)),
+            )
+
+    return create_stock_matrix(db, type_ids, size_ids, color_ids)
+
+
+# Sync, so the sheet parsing and queries run in the threadpool, off the event loop
+@router.post("/bulk/upload")
+def post_new_stock_bulk_upload(
+    file: UploadFile,
+    Authorize: CachedAuthJWT = Depends(),
+    db: Session = Depends(get_db),
+):
+    Authorize.jwt_required()
+    if file.content_type != XLS_FILE_FORMAT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only XLSX files are allowed.",
+        )
+
+    workbook = load_workbook(file.file, read_only=True)
+    try:
+        names = extract_bulk_stock_names(workbook)
+    finally:
+        workbook.close()
+
+    # Resolve names to variant IDs, keeping the sheet order
+    variant_ids = {}
+    for field_name, kind, rows, name_attr in (
+        ("TYPE", "type", get_stocktypes_by_names(db, names["TYPE"]), "type_name"),
+        ("SIZE", "size", get_stocksizes_by_names(db, names["SIZE"]), "size_name"),
+        ("COLOR", "color", get_stockcolors_by_names(db, names["COLOR"]), "color_name"),
+    ):
+        id_by_name = {getattr(row, name_attr): row.id for row in rows}
+        unknown = [name for name in names[field_name] if name not in id_by_name]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=E.format_error(E.STO_BLK_E04, kind, unknown),
+            )
+        variant_ids[field_name] = [id_by_name[name] for name in names[field_name]]
+
+    return create_stock_matrix(
+        db, variant_ids["TYPE"], variant_ids["SIZE"], variant_ids["COLOR"]
+    )
+
+
 @router.post("/variant/size")
 def create_variant_size(
     data: CreateNewVariantSizeRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -142,7 +313,7 @@ def create_variant_size(
 @router.post("/variant/type")
 def create_variant_type(
     data: CreateNewVariantTypeRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -174,7 +345,7 @@ def create_variant_type(
 @router.post("/variant/color")
 def create_variant_color(
     data: CreateNewVariantColorRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -206,7 +377,7 @@ def create_variant_color(
 @router.post("/update-quantity")
 def update_stock_quantity(
     data: UpdateStockQuantityRequest,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     Authorize.jwt_required()
@@ -221,12 +392,14 @@ def update_stock_quantity(
         stock.quantity += stock_update.add_quantity
         db.commit()
 
+    stock_index.notify_changed(db)
+
     return {"msg": "Stock quantities updated successfully"}
 
 
 @router.get("/type-from-stock")
 def get_types_from_stock(
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     # Authorize.jwt_required()
@@ -242,7 +415,7 @@ def get_types_from_stock(
 @router.get("/color-from-stock")
 def get_colors_from_stock(
     type_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     # Authorize.jwt_required()
@@ -260,7 +433,7 @@ def get_colors_from_stock(
 def get_sizes_from_stock(
     type_id: int,
     color_id: int,
-    Authorize: AuthJWT = Depends(),
+    Authorize: CachedAuthJWT = Depends(),
     db: Session = Depends(get_db),
 ):
     # Authorize.jwt_required()
@@ -272,3 +445,37 @@ def get_sizes_from_stock(
         .all()
     )
     return {"data": [{"size_id": s[0], "size_name": s[1]} for s in sizes]}
+
+
+def create_stock_matrix(db: Session, type_ids: list, size_ids: list, color_ids: list):
+    if not (type_ids and size_ids and color_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=E.format_error(E.STO_BLK_E01),
+        )
+
+    total = len(type_ids) * len(size_ids) * len(color_ids)
+    if total > STOCK_BULK_MAX_COMBINATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=E.format_error(E.STO_BLK_E02, total, STOCK_BULK_MAX_COMBINATIONS),
+        )
+
+    # One query for the combinations that already exist, one batch for the rest
+    existing = get_existing_stock_variant_keys(db, type_ids, size_ids, color_ids)
+    new_keys = [
+        key for key in product(type_ids, size_ids, color_ids) if key not in existing
+    ]
+    create_stocks_bulk(db, new_keys)
+    stock_index.notify_changed(db)
+
+    return {
+        "msg": f"Created {len(new_keys)} stock(s), skipped {total - len(new_keys)} existing",
+        "data": {
+            "created": [
+                {"type_id": type_id, "size_id": size_id, "color_id": color_id}
+                for type_id, size_id, color_id in new_keys
+            ],
+            "skipped_count": total - len(new_keys),
+        },
+    }
@@ -1,27 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from database import get_db, User_TM, Role_TM
 from schemas import RegisterForm, ChangePasswordRequest
 from core.db_enums import UserTMStatus
-from datetime import datetime
-import bcrypt
-from core.utils import validate_password, validate_username
+from core.db_utils import (
+    get_user_by_id,
+    get_user_by_username,
+    get_role_by_name,
+    create_user as create_user_record,
+)
+from core.password import password_hasher
+from core.user_status import user_status
+from core.utils import (
+    validate_password,
+    validate_username,
+    decode_keyset_cursor,
+    fetch_keyset_page,
+)
 
 router = APIRouter(tags=["User"], prefix="/user")
 
 
 @router.get("/")
-def get_all_users(db: Session = Depends(get_db)):
-    users = (
-        db.query(User_TM)
+def get_all_users(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    role: Optional[str] = None,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    # Project the display columns only, the password hash never leaves the DB
+    query = (
+        db.query(
+            User_TM.id,
+            User_TM.username,
+            User_TM.role_id,
+            Role_TM.role_name,
+            User_TM.created_dt,
+            User_TM.last_login_dt,
+            User_TM.is_active,
+        )
+        .join(Role_TM, User_TM.role_id == Role_TM.id)
         .filter(
             User_TM.is_active == UserTMStatus.ACTIVE,
             User_TM.username != "System",  # Exclude "System" user
         )
-        .order_by(User_TM.created_dt.desc())
-        .all()
     )
-    return {"msg": "Successfully retrieved active users", "data": users}
+
+    if role:
+        query = query.filter(Role_TM.role_name == role.lower())
+    if search:
+        query = query.filter(
+            User_TM.username.startswith(search.lower(), autoescape=True)
+        )
+
+    # Keyset pagination: continue after the last (created_dt, id) of the previous page.
+    # created_dt is nullable, NULLs sort after every date in DESC order.
+    if cursor:
+        position = decode_keyset_cursor(cursor)
+        if not position:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor.",
+            )
+        last_created_dt, last_id = position
+        if last_created_dt is None:
+            query = query.filter(User_TM.created_dt.is_(None), User_TM.id < last_id)
+        else:
+            query = query.filter(
+                or_(
+                    User_TM.created_dt < last_created_dt,
+                    and_(User_TM.created_dt == last_created_dt, User_TM.id < last_id),
+                    User_TM.created_dt.is_(None),
+                )
+            )
+
+    users, next_cursor = fetch_keyset_page(query, limit, User_TM.created_dt, User_TM.id)
+
+    return {
+        "msg": "Successfully retrieved active users",
+        "data": [dict(user._mapping) for user in users],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.delete("/{user_id}")
@@ -55,13 +118,16 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
             )
 
     user.is_active = UserTMStatus.INACTIVE
+    # Other workers reject the user's tokens once they see the new version
+    user_status.notify_changed(db)
     db.commit()
+    user_status.put_user(user)
 
     return {"msg": f"User with ID {user_id} successfully deactivated."}
 
 
 @router.post("/")
-def create_user(payload: RegisterForm, db: Session = Depends(get_db)):
+async def create_user(payload: RegisterForm, db: Session = Depends(get_db)):
     username = payload.username.lower()
     password = payload.password
     rolename = payload.rolename.lower()
@@ -81,7 +147,7 @@ def create_user(payload: RegisterForm, db: Session = Depends(get_db)):
         )
 
     # Check if username exists (active or inactive)
-    existing_user = db.query(User_TM).filter(User_TM.username == username).first()
+    existing_user = await run_in_threadpool(get_user_by_username, db, username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -89,7 +155,7 @@ def create_user(payload: RegisterForm, db: Session = Depends(get_db)):
         )
 
     # Check if role exists
-    role = db.query(Role_TM).filter(Role_TM.role_name == rolename).first()
+    role = await run_in_threadpool(get_role_by_name, db, rolename)
     if not role:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,26 +163,19 @@ def create_user(payload: RegisterForm, db: Session = Depends(get_db)):
         )
 
     # Create new user
-    new_user = User_TM(
-        username=username,
-        password=bcrypt.hashpw(password.encode("UTF-8"), bcrypt.gensalt()),
-        role_id=role.id,
-        created_dt=datetime.now(),
-        is_active=UserTMStatus.ACTIVE,
+    hashed_password = await password_hasher.hash(password)
+    new_user = await run_in_threadpool(
+        create_user_record, db, username, hashed_password, role.id
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
     return {"msg": f"User '{username}' successfully created.", "data": new_user}
 
 
 @router.put("/{user_id}/change-password")
-def change_password(
+async def change_password(
     user_id: int, payload: ChangePasswordRequest, db: Session = Depends(get_db)
 ):
-    user = db.query(User_TM).filter(User_TM.id == user_id).first()
+    user = await run_in_threadpool(get_user_by_id, db, user_id)
 
     if not user:
         raise HTTPException(
@@ -138,10 +197,7 @@ def change_password(
         )
 
     # Hash the new password
-    hashed_password = bcrypt.hashpw(
-        payload.new_password.encode("UTF-8"), bcrypt.gensalt()
-    )
-    user.password = hashed_password
-    db.commit()
+    user.password = await password_hasher.hash(payload.new_password)
+    await run_in_threadpool(db.commit)
 
     return {"msg": f"Password for user with ID {user_id} successfully updated."}
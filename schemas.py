@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict
-from pydantic import BaseModel
+from pydantic import BaseModel, conint
 
 
 # Picklist
@@ -55,6 +55,10 @@ class LoginForm(BaseModel):
     password: str
 
 
+class LogoutForm(BaseModel):
+    refresh_token: Optional[str]
+
+
 class RegisterForm(BaseModel):
     username: str
     password: str
@@ -147,6 +151,12 @@ class CreateNewStockRequest(BaseModel):
     color_id: int
 
 
+class CreateBulkStockRequest(BaseModel):
+    type_ids: List[int]
+    size_ids: List[int]
+    color_ids: List[int]
+
+
 class StockQuantityUpdate(BaseModel):
     stock_id: int
     add_quantity: int
@@ -161,8 +171,17 @@ class CreateInboundRequest(BaseModel):
     notes: Optional[str]
 
 
-class AddInboundItemRequest(BaseModel):
+class InboundItemLine(BaseModel):
     color_id: int
     size_id: int
     type_id: int
     add_quantity: int
+
+
+class AddInboundItemRequest(InboundItemLine):
+    add_quantity: conint(gt=0)
+
+
+class AddInboundItemsBulkRequest(BaseModel):
+    # Quantities are checked per line, so the valid lines are still added
+    items: List[InboundItemLine]
@@ -0,0 +1,248 @@
+"""
+Points the app at a temporary SQLite database before anything imports it.
+
+The schema below has the tables and columns the app maps; `database.py`
+reflects it into a schema cache of its own, as it does with MySQL. Run the
+tests from the project directory with `python -m pytest`.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+)
+
+_tmp_dir = tempfile.mkdtemp(prefix="wms-test-")
+DB_PATH = os.path.join(_tmp_dir, "wms.db")
+
+os.environ["WMS_DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["WMS_ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["WMS_SCHEMA_CACHE_PATH"] = os.path.join(_tmp_dir, "schema_cache.pickle")
+
+# Appended, so a _cred.py of the project takes precedence
+FALLBACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fallback")
+sys.path.append(FALLBACK_DIR)
+
+
+def _id():
+    return Column("id", Integer, primary_key=True)
+
+
+def _fields():
+    return [Column(f"field{i}", String(255)) for i in range(1, 6)]
+
+
+metadata = MetaData()
+Table(
+    "user_tm",
+    metadata,
+    _id(),
+    Column("username", String(50)),
+    Column("password", String(255)),
+    Column("role_id", Integer),
+    Column("created_dt", DateTime),
+    Column("last_login_dt", DateTime),
+    Column("is_active", Integer, server_default="1"),
+)
+Table("role_tm", metadata, _id(), Column("role_name", String(50)))
+Table(
+    "picklist_tm",
+    metadata,
+    _id(),
+    Column("picklist_status", String(20)),
+    Column("draft_create_dt", DateTime),
+    Column("draft_cancel_dt", DateTime),
+    Column("creation_dt", DateTime),
+    Column("pick_start_dt", DateTime),
+    Column("completion_dt", DateTime),
+)
+Table(
+    "picklistfile_tr",
+    metadata,
+    _id(),
+    Column("picklist_id", Integer),
+    Column("ecom_code", String(3)),
+    Column("file_name", String(255)),
+    Column("file_data", LargeBinary),
+    Column("upload_dt", DateTime),
+)
+Table(
+    "picklistitem_tr",
+    metadata,
+    _id(),
+    Column("picklist_id", Integer),
+    Column("picklistfile_id", Integer),
+    Column("ecom_code", String(3)),
+    Column("ecom_order_id", String(50)),
+    Column("product_name", String(255)),
+    *_fields(),
+    Column("stock_id", Integer),
+    Column("is_excluded", Integer, server_default="0"),
+)
+Table(
+    "productmapping_tr",
+    metadata,
+    _id(),
+    Column("ecom_code", String(3)),
+    *_fields(),
+    Column("stock_id", Integer),
+)
+Table(
+    "stock_tm",
+    metadata,
+    _id(),
+    Column("stock_type_id", Integer),
+    Column("stock_size_id", Integer),
+    Column("stock_color_id", Integer),
+    Column("quantity", Integer, server_default="0"),
+    Column("reserved_quantity", Integer, server_default="0"),
+    Column("is_active", Integer, server_default="1"),
+)
+Table(
+    "stocktype_tr",
+    metadata,
+    _id(),
+    Column("type_value", String(50)),
+    Column("type_name", String(50)),
+)
+Table(
+    "stocksize_tr",
+    metadata,
+    _id(),
+    Column("size_value", String(50)),
+    Column("size_name", String(50)),
+)
+Table(
+    "stockcolor_tr",
+    metadata,
+    _id(),
+    Column("color_name", String(50)),
+    Column("color_hex", String(6)),
+)
+Table(
+    "master_parameter_tm",
+    metadata,
+    _id(),
+    Column("parameter_name", String(50)),
+    Column("parameter_value_int", Integer),
+    Column("parameter_value_str", String(255)),
+)
+Table(
+    "inboundschedule_tm",
+    metadata,
+    _id(),
+    Column("schedule_date", Date),
+    Column("created_dt", DateTime),
+    Column("creator_id", Integer),
+    Column("notes", String(255)),
+    Column("is_active", Integer),
+)
+Table(
+    "inbound_tm",
+    metadata,
+    _id(),
+    Column("status", String(20)),
+    Column("supplier_name", String(255)),
+    Column("notes", String(255)),
+    Column("user_id", Integer),
+    Column("submit_key", String(64)),
+    Column("item_count", Integer, server_default="0"),
+    Column("total_quantity", Integer, server_default="0"),
+    Column("created_at", DateTime, server_default=func.now()),
+    Column("updated_at", DateTime, server_default=func.now()),
+)
+Table(
+    "inbounditems_tr",
+    metadata,
+    _id(),
+    Column("inbound_id", Integer),
+    Column("stock_id", Integer),
+    Column("add_quantity", Integer),
+    Column("created_at", DateTime, server_default=func.now()),
+    Column("updated_at", DateTime, server_default=func.now()),
+)
+Table(
+    "stockreservation_tr",
+    metadata,
+    _id(),
+    Column("picklist_id", Integer),
+    Column("stock_id", Integer),
+    Column("quantity", Integer),
+)
+Table(
+    "cacheversion_tm",
+    metadata,
+    Column("cache_name", String(50), primary_key=True),
+    Column("version", Integer, server_default="0"),
+    Column("updated_dt", DateTime, server_default=func.now()),
+)
+Table(
+    "revokedtoken_tr",
+    metadata,
+    Column("jti", String(64), primary_key=True),
+    Column("username", String(50)),
+    Column("expires_at", DateTime),
+)
+
+_engine = create_engine(os.environ["WMS_DATABASE_URL"])
+metadata.create_all(_engine)
+_engine.dispose()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def auth_headers() -> dict:
+    """Authorization header of a new active owner."""
+    from datetime import timedelta
+
+    from fastapi_jwt_auth import AuthJWT
+    from sqlalchemy import insert
+
+    import main  # noqa: F401, loads the JWT settings
+    from core.db_enums import RoleTMRoleId
+    from database import engine, User_TM
+
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            insert(User_TM.__table__).values(
+                username="tester", role_id=RoleTMRoleId.OWNER, is_active=1
+            )
+        ).inserted_primary_key[0]
+    token = AuthJWT().create_access_token(
+        subject="tester",
+        user_claims={"user_id": user_id, "role_id": RoleTMRoleId.OWNER},
+        expires_time=timedelta(minutes=5),
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def insert_row():
+    """Inserts a row of a mapped class in its own transaction, returns its ID."""
+    from sqlalchemy import insert
+
+    from database import engine
+
+    def insert_row(model, **values):
+        with engine.begin() as conn:
+            return conn.execute(
+                insert(model.__table__).values(**values)
+            ).inserted_primary_key[0]
+
+    return insert_row
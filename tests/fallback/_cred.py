@@ -0,0 +1,4 @@
+# Used by the tests when the project has no _cred.py. The databases are set
+# through WMS_DATABASE_URL, only the JWT secret is read.
+Credentials = {"user": "", "password": "", "host": "", "database": ""}
+AuthSecret = {"SECRET_KEY": "test-secret", "ACCESS_TOKEN_EXPIRE_MINUTES": 60}
@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from core.db_enums import RoleTMRoleId, UserTMStatus
+from core.user_status import user_status
+from database import User_TM
+
+
+def refresh(username: str):
+    from fastapi_jwt_auth import AuthJWT
+    from main import app
+
+    token = AuthJWT().create_refresh_token(subject=username)
+    return TestClient(app).get(
+        "/api_v1/auth/refresh", headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+def test_refresh_finds_a_user_created_on_another_worker(insert_row):
+    user_status.get_user("someone")  # Loads the cache
+    # Inserted without going through this worker's cache
+    user_id = insert_row(
+        User_TM,
+        username="other-worker",
+        role_id=RoleTMRoleId.PACKER,
+        is_active=UserTMStatus.ACTIVE,
+    )
+
+    response = refresh("other-worker")
+    assert response.status_code == 200, response.text
+    assert user_status.get_user("other-worker").id == user_id
+
+
+def test_refresh_of_an_unknown_user_is_rejected():
+    assert refresh("nobody-at-all").status_code == 404
@@ -0,0 +1,76 @@
+"""
+Importing the app must stay fast, connect to no database and leave the modules
+only some endpoints need unloaded, so workers start and restart quickly.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from conftest import FALLBACK_DIR
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_MS = float(os.getenv("WMS_IMPORT_BUDGET_MS", "800"))
+RUNS = 3
+
+# Imported on demand by the endpoints that need them
+LAZY_MODULES = ("openpyxl", "numpy", "core.analytics")
+
+PROBE = """
+import json, sys, time
+import sqlalchemy.pool
+
+connects = []
+_connect = sqlalchemy.pool.Pool.connect
+sqlalchemy.pool.Pool.connect = lambda self: connects.append(1) or _connect(self)
+
+started_at = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started_at
+
+print(json.dumps({
+    "seconds": elapsed,
+    "connects": len(connects),
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def probe() -> tuple:
+    """Imports `main` in a fresh interpreter. Returns (result, slowest imports)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE % (LAZY_MODULES,)],
+        cwd=PROJECT_DIR,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([PROJECT_DIR, FALLBACK_DIR])},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # "import time: self [us] | cumulative | imported package" lines
+    timings = []
+    for line in result.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            timings.append((int(parts[1]), parts[2].strip()))
+    slowest = [name for _, name in sorted(timings, reverse=True)[:10]]
+    return json.loads(result.stdout.strip().splitlines()[-1]), slowest
+
+
+def test_import_main_within_budget():
+    # Written by the first import, the workers read it instead of reflecting
+    import database  # noqa: F401
+
+    runs = [probe() for _ in range(RUNS)]
+    results = [result for result, _ in runs]
+
+    assert not any(result["connects"] for result in results)
+    assert not {name for result in results for name in result["loaded"]}
+
+    median_ms = statistics.median(result["seconds"] for result in results) * 1000
+    assert median_ms <= BUDGET_MS, (
+        f"import main took {median_ms:.0f} ms, budget {BUDGET_MS:.0f} ms. "
+        f"Slowest imports: {', '.join(runs[0][1])}"
+    )
@@ -0,0 +1,66 @@
+from io import BytesIO
+
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+from sqlalchemy import insert, select
+
+from constant import XLS_FILE_FORMAT
+from core.db_enums import InboundTMStatus
+from database import (
+    engine,
+    Inbound_TM,
+    InboundItems_TR,
+    Stock_TM,
+    StockColor_TR,
+    StockSize_TR,
+    StockType_TR,
+)
+
+
+def test_import_rejects_fractional_quantities(auth_headers):
+    from main import app
+
+    with engine.begin() as conn:
+
+        def add(model, **values):
+            return conn.execute(
+                insert(model.__table__).values(**values)
+            ).inserted_primary_key[0]
+
+        stock_id = add(
+            Stock_TM,
+            stock_type_id=add(StockType_TR, type_value="JOGGER", type_name="JOGGER"),
+            stock_color_id=add(StockColor_TR, color_name="ARMY", color_hex="4B5320"),
+            stock_size_id=add(StockSize_TR, size_value="XL", size_name="XL"),
+        )
+        inbound_id = add(Inbound_TM, status=InboundTMStatus.PENDING)
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Type", "Color", "Size", "Quantity"])
+    for quantity in (3, 2.0, "4", 2.5, "1.5", 0, "many"):
+        sheet.append(["Jogger", "Army", "XL", quantity])
+    file = BytesIO()
+    workbook.save(file)
+
+    response = TestClient(app).post(
+        f"/api_v1/inbound/{inbound_id}/import",
+        headers=auth_headers,
+        files={"file": ("inbound.xlsx", file.getvalue(), XLS_FILE_FORMAT)},
+    )
+    assert response.status_code == 200, response.text
+
+    errors = response.json()["data"]["errors"]
+    assert [(error["line"], error["error"]) for error in errors] == [
+        (5, "Quantity must be a whole number."),
+        (6, "Quantity must be a whole number."),
+        (7, "Quantity must be positive."),
+        (8, "Quantity must be positive."),
+    ]
+    with engine.connect() as conn:
+        items = conn.execute(
+            select(InboundItems_TR.stock_id, InboundItems_TR.add_quantity).where(
+                InboundItems_TR.inbound_id == inbound_id
+            )
+        ).all()
+    assert [tuple(item) for item in items] == [(stock_id, 9)]
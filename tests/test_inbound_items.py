@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from core.db_enums import InboundTMStatus
+from database import engine, Inbound_TM, InboundItems_TR, Stock_TM
+
+
+@pytest.fixture
+def client(auth_headers):
+    from main import app
+
+    return TestClient(app, headers=auth_headers)
+
+
+@pytest.fixture
+def inbound_id(insert_row):
+    insert_row(Stock_TM, stock_type_id=7, stock_color_id=7, stock_size_id=7)
+    return insert_row(Inbound_TM, status=InboundTMStatus.PENDING)
+
+
+def item(quantity: int) -> dict:
+    return {"type_id": 7, "color_id": 7, "size_id": 7, "add_quantity": quantity}
+
+
+def added_quantities(inbound_id: int) -> list:
+    with engine.connect() as conn:
+        return list(
+            conn.scalars(
+                select(InboundItems_TR.add_quantity).where(
+                    InboundItems_TR.inbound_id == inbound_id
+                )
+            )
+        )
+
+
+def test_add_item_rejects_non_positive_quantities(client, inbound_id):
+    for quantity in (0, -3):
+        response = client.post(
+            f"/api_v1/inbound/{inbound_id}/items", json=item(quantity)
+        )
+        assert response.status_code == 422, response.text
+    assert added_quantities(inbound_id) == []
+
+    response = client.post(f"/api_v1/inbound/{inbound_id}/items", json=item(2))
+    assert response.status_code == 200, response.text
+    assert added_quantities(inbound_id) == [2]
+
+
+def test_bulk_add_reports_non_positive_lines(client, inbound_id):
+    response = client.post(
+        f"/api_v1/inbound/{inbound_id}/items/bulk",
+        json={"items": [item(3), item(0), item(-1)]},
+    )
+    assert response.status_code == 200, response.text
+    assert [error["line"] for error in response.json()["data"]["errors"]] == [2, 3]
+    assert added_quantities(inbound_id) == [3]
@@ -0,0 +1,103 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from core.db_enums import InboundTMStatus
+from database import engine, Inbound_TM, InboundItems_TR, Stock_TM
+
+
+@pytest.fixture
+def client(auth_headers):
+    from main import app
+
+    return TestClient(app, headers=auth_headers)
+
+
+@pytest.fixture
+def inbound(insert_row):
+    """A PENDING inbound adding 3 + 2 to one stock and 4 to another."""
+    stock_ids = [
+        insert_row(Stock_TM, stock_type_id=1, stock_size_id=1, stock_color_id=i)
+        for i in range(2)
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            Stock_TM.__table__.update()
+            .where(Stock_TM.id.in_(stock_ids))
+            .values(quantity=10)
+        )
+    inbound_id = insert_row(Inbound_TM, status=InboundTMStatus.PENDING)
+    for stock_index, quantity in ((0, 3), (0, 2), (1, 4)):
+        insert_row(
+            InboundItems_TR,
+            inbound_id=inbound_id,
+            stock_id=stock_ids[stock_index],
+            add_quantity=quantity,
+        )
+    return inbound_id, stock_ids
+
+
+def quantities(stock_ids: list) -> list:
+    with engine.connect() as conn:
+        rows = dict(
+            conn.execute(
+                select(Stock_TM.id, Stock_TM.quantity).where(Stock_TM.id.in_(stock_ids))
+            ).all()
+        )
+    return [rows[stock_id] for stock_id in stock_ids]
+
+
+def inbound_state(inbound_id: int) -> tuple:
+    with engine.connect() as conn:
+        return tuple(
+            conn.execute(
+                select(Inbound_TM.status, Inbound_TM.submit_key).where(
+                    Inbound_TM.id == inbound_id
+                )
+            ).one()
+        )
+
+
+def test_submit_adds_items_to_stock(client, inbound):
+    inbound_id, stock_ids = inbound
+
+    response = client.post(f"/api_v1/inbound/{inbound_id}/submit")
+    assert response.status_code == 200, response.text
+    assert quantities(stock_ids) == [15, 14]
+    assert inbound_state(inbound_id) == (InboundTMStatus.COMPLETED, None)
+
+
+def test_retry_with_the_same_idempotency_key_is_applied_once(client, inbound):
+    inbound_id, stock_ids = inbound
+    headers = {"Idempotency-Key": "submit-1"}
+
+    for _ in range(2):
+        response = client.post(f"/api_v1/inbound/{inbound_id}/submit", headers=headers)
+        assert response.status_code == 200, response.text
+    assert quantities(stock_ids) == [15, 14]
+    assert inbound_state(inbound_id) == (InboundTMStatus.COMPLETED, "submit-1")
+
+    # Another key is another submit, of an inbound that is no longer pending
+    response = client.post(
+        f"/api_v1/inbound/{inbound_id}/submit", headers={"Idempotency-Key": "submit-2"}
+    )
+    assert response.status_code == 400
+    assert quantities(stock_ids) == [15, 14]
+
+
+def test_submit_of_a_completed_inbound_is_rejected(client, inbound):
+    inbound_id, stock_ids = inbound
+
+    assert client.post(f"/api_v1/inbound/{inbound_id}/submit").status_code == 200
+    response = client.post(f"/api_v1/inbound/{inbound_id}/submit")
+    assert response.status_code == 400
+    assert "PENDING" in response.json()["detail"]
+    assert quantities(stock_ids) == [15, 14]
+
+
+def test_submit_without_items_is_rejected(client, insert_row):
+    inbound_id = insert_row(Inbound_TM, status=InboundTMStatus.PENDING)
+
+    response = client.post(f"/api_v1/inbound/{inbound_id}/submit")
+    assert response.status_code == 400
+    assert inbound_state(inbound_id) == (InboundTMStatus.PENDING, None)
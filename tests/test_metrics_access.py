@@ -0,0 +1,24 @@
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def get_metrics(client_host: str) -> httpx.Response:
+    from main import app
+
+    transport = httpx.ASGITransport(app=app, client=(client_host, 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get("/api_v1/metrics")
+
+
+async def test_metrics_served_to_loopback_only():
+    for host in ("127.0.0.1", "::1"):
+        response = await get_metrics(host)
+        assert response.status_code == 200, response.text
+        assert "wms_http_request_duration_seconds" in response.text
+
+    for host in ("10.0.0.5", "2001:db8::1", "unknown"):
+        response = await get_metrics(host)
+        assert response.status_code == 403
+        assert "wms_" not in response.text
@@ -0,0 +1,147 @@
+import httpx
+import pytest
+from sqlalchemy import insert, select
+
+from core.db_enums import PicklistItemTRIsExcluded, PicklistTMStatus
+from database import (
+    engine,
+    Picklist_TM,
+    PicklistItem_TR,
+    Stock_TM,
+    StockReservation_TR,
+)
+
+API = "/api_v1/picklist"
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(auth_headers):
+    from main import app
+
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(
+            app=app,
+            base_url="http://test",
+            headers=auth_headers,
+        ) as client:
+            yield client
+    finally:
+        await app.router.shutdown()
+
+
+def create_draft(items: list) -> tuple:
+    """
+    Creates two stocks of 10 and a draft picklist with an item per entry.
+
+    Args:
+        items (list): (stock index, is_excluded) of each item.
+
+    Returns:
+        tuple: (picklist ID, [stock IDs])
+    """
+    with engine.begin() as conn:
+        stock_ids = [
+            conn.execute(
+                insert(Stock_TM.__table__).values(
+                    stock_type_id=1, stock_size_id=1, stock_color_id=i, quantity=10
+                )
+            ).inserted_primary_key[0]
+            for i in range(2)
+        ]
+        picklist_id = conn.execute(
+            insert(Picklist_TM.__table__).values(
+                picklist_status=PicklistTMStatus.ON_DRAFT
+            )
+        ).inserted_primary_key[0]
+        for stock, is_excluded in items:
+            conn.execute(
+                insert(PicklistItem_TR.__table__).values(
+                    picklist_id=picklist_id,
+                    ecom_code="TIK",
+                    field1=f"Product {stock}",
+                    stock_id=stock_ids[stock],
+                    is_excluded=is_excluded,
+                )
+            )
+    return picklist_id, stock_ids
+
+
+def stock_state(stock_ids: list) -> list:
+    """Returns (quantity, reserved_quantity) of each stock."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(Stock_TM.id, Stock_TM.quantity, Stock_TM.reserved_quantity).where(
+                Stock_TM.id.in_(stock_ids)
+            )
+        )
+        by_id = {row.id: (row.quantity, row.reserved_quantity) for row in rows}
+    return [by_id[stock_id] for stock_id in stock_ids]
+
+
+def reservations(picklist_id: int) -> dict:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(StockReservation_TR.stock_id, StockReservation_TR.quantity).where(
+                StockReservation_TR.picklist_id == picklist_id
+            )
+        )
+        return {row.stock_id: row.quantity for row in rows}
+
+
+INCLUDED = PicklistItemTRIsExcluded.INCLUDED
+EXCLUDED = PicklistItemTRIsExcluded.EXCLUDED
+
+
+async def test_finish_reserves_and_cancel_only_applies_to_drafts(client):
+    picklist_id, stock_ids = create_draft(
+        [(0, INCLUDED), (0, INCLUDED), (0, EXCLUDED), (1, INCLUDED)]
+    )
+
+    response = await client.post(f"{API}/{picklist_id}/update/created")
+    assert response.status_code == 200, response.text
+    assert stock_state(stock_ids) == [(10, 2), (10, 1)]
+    assert reservations(picklist_id) == {stock_ids[0]: 2, stock_ids[1]: 1}
+
+    # A finished picklist is no longer a draft, its reservation stays
+    response = await client.post(f"{API}/{picklist_id}/update/cancelled")
+    assert response.status_code == 400
+    assert stock_state(stock_ids) == [(10, 2), (10, 1)]
+
+    # Cancelling a draft releases nothing and leaves other reservations alone
+    draft_id, _ = create_draft([(0, INCLUDED)])
+    response = await client.post(f"{API}/{draft_id}/update/cancelled")
+    assert response.status_code == 200, response.text
+    assert stock_state(stock_ids) == [(10, 2), (10, 1)]
+    assert reservations(picklist_id) == {stock_ids[0]: 2, stock_ids[1]: 1}
+
+
+async def test_finish_then_complete_consumes_the_reservation(client):
+    picklist_id, stock_ids = create_draft(
+        [(0, INCLUDED), (0, INCLUDED), (0, EXCLUDED), (1, INCLUDED)]
+    )
+    # Reserved by another picklist, must survive this one's release
+    other_id, _ = create_draft([])
+    with engine.begin() as conn:
+        conn.execute(
+            insert(StockReservation_TR.__table__).values(
+                picklist_id=other_id, stock_id=stock_ids[0], quantity=4
+            )
+        )
+        conn.execute(
+            Stock_TM.__table__.update()
+            .where(Stock_TM.id == stock_ids[0])
+            .values(reserved_quantity=4)
+        )
+
+    for step in ("created", "on-picking", "complete-draft"):
+        response = await client.post(f"{API}/{picklist_id}/update/{step}")
+        assert response.status_code == 200, response.text
+        if step == "created":
+            assert stock_state(stock_ids) == [(10, 6), (10, 1)]
+
+    assert stock_state(stock_ids) == [(8, 4), (9, 0)]
+    assert reservations(picklist_id) == {}
+    assert reservations(other_id) == {stock_ids[0]: 4}
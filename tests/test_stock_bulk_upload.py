@@ -0,0 +1,98 @@
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+from sqlalchemy import func, select
+
+from constant import XLS_FILE_FORMAT
+from database import engine, Stock_TM, StockColor_TR, StockSize_TR, StockType_TR
+
+
+@pytest.fixture
+def client(auth_headers):
+    from main import app
+
+    return TestClient(app, headers=auth_headers)
+
+
+@pytest.fixture
+def variants(insert_row):
+    """IDs of a type, two sizes and a color with names unique to this module."""
+    return {
+        "type": insert_row(StockType_TR, type_value="BLK", type_name="BULK TEE"),
+        "sizes": [
+            insert_row(StockSize_TR, size_value=name, size_name=name)
+            for name in ("BULK-S", "BULK-M")
+        ],
+        "color": insert_row(StockColor_TR, color_name="BULK RED", color_hex="FF0000"),
+    }
+
+
+def upload(client, rows: list, header=("Type", "Size", "Color")):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(list(header))
+    for row in rows:
+        sheet.append(list(row))
+    file = BytesIO()
+    workbook.save(file)
+    return client.post(
+        "/api_v1/stock/bulk/upload",
+        files={"file": ("stocks.xlsx", file.getvalue(), XLS_FILE_FORMAT)},
+    )
+
+
+def stock_count(type_id: int) -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).where(Stock_TM.stock_type_id == type_id)
+        ).scalar()
+
+
+def test_duplicate_and_existing_variants_are_created_once(client, variants, insert_row):
+    insert_row(
+        Stock_TM,
+        stock_type_id=variants["type"],
+        stock_size_id=variants["sizes"][0],
+        stock_color_id=variants["color"],
+    )
+
+    response = upload(
+        client,
+        [
+            ("bulk tee", "BULK-S", "Bulk Red"),
+            ("BULK TEE ", "bulk-m", "BULK RED"),
+            (None, "BULK-S", None),
+        ],
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert data["created"] == [
+        {
+            "type_id": variants["type"],
+            "size_id": variants["sizes"][1],
+            "color_id": variants["color"],
+        }
+    ]
+    assert data["skipped_count"] == 1
+    assert stock_count(variants["type"]) == 2
+
+
+def test_unknown_names_reject_the_whole_file(client, variants):
+    response = upload(
+        client,
+        [("BULK TEE", "BULK-S", "BULK RED"), ("NO SUCH TYPE", "BULK-XXL", None)],
+    )
+    assert response.status_code == 400
+    assert "NO SUCH TYPE" in response.json()["detail"]["errorMsg"]
+    assert stock_count(variants["type"]) == 0
+
+
+def test_wrong_header_is_rejected(client, variants):
+    response = upload(
+        client, [("BULK TEE", "BULK-S", "BULK RED")], header=("Type", "Color", "Size")
+    )
+    assert response.status_code == 400
+    assert "STO_BLK_E05" in response.json()["detail"]["errorMsg"]
+    assert stock_count(variants["type"]) == 0
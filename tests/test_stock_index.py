@@ -0,0 +1,68 @@
+from sqlalchemy import event, insert
+
+from core.stock_index import stock_index
+from database import (
+    engine,
+    SessionLocal,
+    Stock_TM,
+    StockColor_TR,
+    StockSize_TR,
+    StockType_TR,
+)
+
+
+def create_stock(type_name: str) -> int:
+    with engine.begin() as conn:
+
+        def add(model, **values):
+            return conn.execute(
+                insert(model.__table__).values(**values)
+            ).inserted_primary_key[0]
+
+        return add(
+            Stock_TM,
+            stock_type_id=add(StockType_TR, type_value=type_name, type_name=type_name),
+            stock_color_id=add(StockColor_TR, color_name="HITAM", color_hex="000000"),
+            stock_size_id=add(StockSize_TR, size_value="L", size_name="L"),
+            quantity=5,
+        )
+
+
+def test_invalidation_during_a_rebuild_is_not_lost():
+    create_stock("KAOS POLOS")
+    stock_index.invalidate()
+
+    calls = []
+
+    def invalidate_once(conn, cursor, statement, params, context, executemany):
+        # As if another request committed a stock while the index was read
+        if not calls:
+            calls.append(statement)
+            stock_index.invalidate()
+
+    event.listen(engine, "after_cursor_execute", invalidate_once)
+    db = SessionLocal()
+    try:
+        assert stock_index.get_stock_id_by_variant_names(db, "KAOS POLOS", "HITAM", "L")
+        stock_id = create_stock("KEMEJA FLANEL")
+        assert (
+            stock_index.get_stock_id_by_variant_names(db, "KEMEJA FLANEL", "HITAM", "L")
+            == stock_id
+        )
+    finally:
+        event.remove(engine, "after_cursor_execute", invalidate_once)
+        db.close()
+
+
+def test_notify_changed_bumps_the_cache_version():
+    db = SessionLocal()
+    try:
+        stock_index.get_stock_id_by_variant_names(db, "-", "-", "-")
+        stock_id = create_stock("HOODIE ZIPPER")
+        stock_index.notify_changed(db)
+        assert (
+            stock_index.get_stock_id_by_variant_names(db, "HOODIE ZIPPER", "HITAM", "L")
+            == stock_id
+        )
+    finally:
+        db.close()
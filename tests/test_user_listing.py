@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from database import engine, Role_TM, User_TM
+
+
+def test_listing_pages_through_users_without_created_dt():
+    from main import app
+
+    with engine.begin() as conn:
+        role_id = conn.execute(
+            insert(Role_TM.__table__).values(role_name="listing")
+        ).inserted_primary_key[0]
+        for username, created_dt in [
+            ("pg_null1", None),
+            ("pg_old", datetime(2024, 1, 1)),
+            ("pg_null2", None),
+            ("pg_new", datetime(2024, 6, 1)),
+            ("pgxdecoy", datetime(2024, 3, 1)),  # "_" must not match any character
+        ]:
+            conn.execute(
+                insert(User_TM.__table__).values(
+                    username=username,
+                    role_id=role_id,
+                    created_dt=created_dt,
+                    is_active=1,
+                )
+            )
+
+    client = TestClient(app)
+    usernames = []
+    cursor = None
+    while True:
+        params = {"search": "PG_", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api_v1/user/", params=params)
+        assert response.status_code == 200, response.text
+        usernames += [user["username"] for user in response.json()["data"]]
+        cursor = response.json()["next_cursor"]
+        if not cursor:
+            break
+
+    assert usernames == ["pg_new", "pg_old", "pg_null2", "pg_null1"]